@@ -1,5 +1,7 @@
 import cv2
-from pyzbar import pyzbar
+from qr_gate import QRScanGate
+from ses_identity_cache import IdentityStatusCache
+from notification_dispatcher import NotificationDispatcher
 from pymongo import MongoClient
 import boto3
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
@@ -17,6 +19,25 @@ except Exception as e:
 # AWS SES setup
 ses_client = boto3.client('ses', region_name='ap-south-1')  # Specify your AWS region
 
+# Verification status per email, so scans never wait on an SES round trip
+identity_cache = IdentityStatusCache(ses_client)
+
+# Attendance email, registered once as an SES template and sent in bulk
+SENDER_EMAIL = "meganth.mail@gmail.com"
+ATTENDANCE_TEMPLATE = {
+    'TemplateName': 'AuroraAttendanceMarked',
+    'SubjectPart': 'Attendance Marked as Present',
+    'HtmlPart': """
+    <html>
+    <body>
+      <h1>Attendance Marked</h1>
+      <p>You have been marked as present.</p>
+    </body>
+    </html>
+    """,
+}
+attendance_notifier = None
+
 # Dictionary to store QR code data and their "present" status
 qr_code_status = {}
 
@@ -32,55 +53,40 @@ def verify_email_identity(recipient_email):
     except Exception as e:
         print(f"Error sending email verification: {e}")
 
+def load_roster():
+    """Warm the SES identity cache with every email on the attendee roster."""
+    try:
+        emails = collection.distinct('email')
+    except Exception as e:
+        print(f"Error loading roster from MongoDB: {e}")
+        return
+    identity_cache.prefetch(emails)
+
 def send_email(recipient_email):
-    # Construct the email
-    sender_email = "meganth.mail@gmail.com"
-    subject = "Attendance Marked as Present"
-    body_html = """
-    <html>
-    <body>
-      <h1>Attendance Marked</h1>
-      <p>You have been marked as present.</p>
-    </body>
-    </html>
-    """
+    """Queue the attendance email; the dispatcher sends it in bulk in the background."""
+    # An address missing from the roster prefetch is looked up before deciding
+    identity_cache.lookup(recipient_email, lambda status: send_or_verify(recipient_email, status))
 
+def send_or_verify(recipient_email, status):
     try:
         # Check if email is verified before sending
-        response = ses_client.list_verified_email_addresses()
-        verified_emails = response['VerifiedEmailAddresses']
-
-        if recipient_email not in verified_emails:
+        if status is None:
+            print(f"Could not get the verification status of {recipient_email}; email not sent.")
+        elif status != 'Success':
             print(f"Email {recipient_email} is not verified. Sending verification request.")
-            verify_email_identity(recipient_email)
+            identity_cache.request_verification(recipient_email, verify_email_identity)
         else:
-            response = ses_client.send_email(
-                Source=sender_email,
-                Destination={
-                    'ToAddresses': [recipient_email],
-                },
-                Message={
-                    'Subject': {
-                        'Data': subject,
-                        'Charset': 'UTF-8'
-                    },
-                    'Body': {
-                        'Html': {
-                            'Data': body_html,
-                            'Charset': 'UTF-8'
-                        }
-                    }
-                }
-            )
-            print(f"Email sent to {recipient_email}")
-    except (NoCredentialsError, PartialCredentialsError) as e:
-        print(f"Credentials error: {e}")
+            attendance_notifier.submit(recipient_email)
+            print(f"Email queued for {recipient_email}")
     except Exception as e:
         print(f"Error sending email: {e}")
 
+# Skips pyzbar on frames where nothing changed in front of the camera
+qr_gate = QRScanGate()
+
 def decode_qr(frame):
     # Find QR codes in the frame
-    qr_codes = pyzbar.decode(frame)
+    qr_codes = qr_gate.decode(frame)
     
     # List to store decoded QR code data
     qr_data_list = []
@@ -128,6 +134,18 @@ def decode_qr(frame):
     return frame, qr_data_list
 
 def main():
+    global attendance_notifier
+    load_roster()
+    attendance_notifier = NotificationDispatcher(ATTENDANCE_TEMPLATE, SENDER_EMAIL, ses_client=ses_client)
+
+    try:
+        scan_attendance()
+    finally:
+        # Flush any emails still waiting for a batch
+        attendance_notifier.close()
+        attendance_notifier.report()
+
+def scan_attendance():
     # Initialize the video stream
     cap = cv2.VideoCapture(0)
 
@@ -0,0 +1,86 @@
+"""
+Content-addressed cache of resume analysis results.
+
+The same resume is often uploaded more than once (retries, refreshes, a group
+of students sharing a template). Results are stored in SQLite under a key made
+of the SHA-256 of the PDF bytes, the keyword-set version and the model id, so
+a repeat upload skips PDF parsing, keyword matching and the Bedrock call.
+The cache is bounded by total size and evicts least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.path.join(os.environ.get("AURORA_DATA_DIR", os.path.dirname(os.path.abspath(__file__))),
+                          "analysis_cache.db")
+
+# Total size of cached values before least recently used entries are evicted
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(pdf_sha256, keyword_version, model_id):
+    """Key for one resume analysed with one keyword set and model."""
+    return hashlib.sha256(f"{pdf_sha256}:{keyword_version}:{model_id}".encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_last_access ON analyses (last_access)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value for `key`, or None, and mark it recently used."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE analyses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Store a JSON-serialisable value and evict old entries beyond the size budget."""
+        data = json.dumps(value, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data.encode('utf-8')), time.time()))
+            self.evict()
+            self.conn.commit()
+
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute(
+                "SELECT key, size FROM analyses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+        return {'entries': entries, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
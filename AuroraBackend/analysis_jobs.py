@@ -0,0 +1,210 @@
+"""
+Background jobs for interview analysis.
+
+The analysis routes used to run every LLM call inside the HTTP request, so a
+worker was tied up for the whole analysis and the browser saw nothing until
+it finished. `AnalysisJobQueue` accepts a job, returns its id immediately and
+runs it on a small pool of worker threads. Each job keeps an ordered list of
+progress events (one per analysed question, then the overall assessment and
+the final result) that clients can follow as Server-Sent Events, including
+resuming from the last event id they saw. Finished jobs stay in a bounded
+result store. `stats` reports queue depth and latency percentiles.
+"""
+
+import json
+import math
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+# Seconds between SSE keep-alive comments while a job has no new events
+KEEPALIVE_INTERVAL = 15
+
+# Finished jobs whose latencies are kept for the percentiles
+LATENCY_WINDOW = 500
+
+
+class AnalysisJob:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = 'queued'
+        self.events = []
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.condition = threading.Condition()
+
+    @property
+    def done(self):
+        return self.status in ('done', 'failed')
+
+    def emit(self, event, data):
+        """Append a progress event and wake everyone following this job."""
+        with self.condition:
+            self.events.append((event, data))
+            self.condition.notify_all()
+
+    def finish(self, result, error):
+        """Record the outcome and publish it as the final event."""
+        with self.condition:
+            self.finished = time.time()
+            self.result = result
+            self.error = error
+            if error is None:
+                self.events.append(('result', result))
+                self.status = 'done'
+            else:
+                self.events.append(('failed', {'error': error}))
+                self.status = 'failed'
+            self.condition.notify_all()
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'events': len(self.events),
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class AnalysisJobQueue:
+    def __init__(self, run_job, workers=2, max_queue=32, max_results=200):
+        """
+        :param run_job: Callable(params, progress) returning the job's result;
+                        progress(event, data) publishes an intermediate event
+        :param workers: Jobs analysed at once
+        :param max_queue: Jobs waiting to start before `submit` rejects new ones
+        :param max_results: Finished jobs kept for status and result queries
+        """
+        self.run_job = run_job
+        self.pending = queue.Queue(maxsize=max_queue)
+        self.max_results = max_results
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_times = deque(maxlen=LATENCY_WINDOW)
+        self.run_times = deque(maxlen=LATENCY_WINDOW)
+        self.threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self.worker, name=f"analysis-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, **params):
+        """
+        Queue a job and return it immediately.
+
+        :raises queue.Full: if `max_queue` jobs are already waiting
+        """
+        job = AnalysisJob(params)
+        job.emit('queued', {'job_id': job.id, 'position': self.pending.qsize() + 1})
+        with self.lock:
+            self.jobs[job.id] = job
+        try:
+            self.pending.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+            raise
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def worker(self):
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            with self.lock:
+                self.running += 1
+            job.started = time.time()
+            job.status = 'running'
+            job.emit('started', {'job_id': job.id})
+            try:
+                result, error = self.run_job(job.params, job.emit), None
+            except Exception as e:
+                print(f"Analysis job {job.id} failed: {e}")
+                result, error = None, str(e)
+            job.finish(result, error)
+
+            with self.lock:
+                self.running -= 1
+                if job.status == 'done':
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self.wait_times.append(job.started - job.created)
+                self.run_times.append(job.finished - job.started)
+                self.evict()
+
+    def evict(self):
+        """Drop the oldest finished jobs beyond `max_results`; called with the lock held."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_results)]:
+            del self.jobs[job_id]
+
+    def events(self, job, last_event_id=None):
+        """
+        Yield the job's events as SSE messages, starting after `last_event_id`,
+        until the final 'result' or 'failed' event.
+
+        :param last_event_id: Integer id of the last event the client received, or None
+        """
+        index = 0 if last_event_id is None else max(0, last_event_id + 1)
+        while True:
+            with job.condition:
+                if index >= len(job.events) and not job.done:
+                    job.condition.wait(KEEPALIVE_INTERVAL)
+                new_events = job.events[index:]
+                finished = job.done and index + len(new_events) >= len(job.events)
+            if not new_events:
+                if finished:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for offset, (event, data) in enumerate(new_events):
+                yield f"id: {index + offset}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                if event in ('result', 'failed'):
+                    return
+            index += len(new_events)
+
+    def stats(self):
+        with self.lock:
+            wait_times = sorted(self.wait_times)
+            run_times = sorted(self.run_times)
+            stats = {
+                'queue_depth': self.pending.qsize(),
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'stored_jobs': len(self.jobs)
+            }
+        for name, values in (('wait', wait_times), ('run', run_times)):
+            for p in (50, 95, 99):
+                stats[f'{name}_p{p}_ms'] = percentile(values, p) * 1000 if values else None
+        return stats
+
+    def shutdown(self):
+        """Finish queued jobs and stop the workers."""
+        for _ in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
@@ -0,0 +1,318 @@
+"""
+Concurrent evaluation of interview answers with the OpenAI API.
+
+`InterviewAnalyzer.analyze_interview` used to analyse each answer with its
+own blocking request and then request the overall assessment, so a
+five-question interview took six model round trips in a row. `AnswerEvaluator`
+sends all per-answer requests at once through an async client, with at most
+`max_concurrency` in flight. It retries rate-limited and transient failures,
+honouring the server's Retry-After header, and then requests the overall
+assessment. With `batched=True` all answers are instead scored by a single
+JSON-mode request, falling back to per-answer requests if the reply cannot
+be parsed.
+
+One evaluator is meant to be shared by the whole app: it runs its own event
+loop on a background thread, so a single pooled async client and one
+concurrency limit serve every request.
+
+Run this file to measure wall time per interview against a local mock LLM:
+    python answer_evaluator.py --questions 5 --latency 0.5
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime
+
+import openai
+
+SYSTEM_PROMPT = ("You are a friendly technical interviewer giving brief, human feedback. "
+                 "Keep responses under 200 words and conversational.")
+
+# Errors worth retrying; anything else is reported as the analysis text
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError,
+                    openai.InternalServerError)
+
+
+def answer_prompt(question, answer, question_num):
+    """Prompt for the analysis of a single question-answer pair"""
+    return f"""
+You are a friendly technical interviewer giving quick, human feedback.
+
+Question {question_num}: {question}
+Answer: {answer}
+
+Give a brief, conversational analysis (max 200 words) covering:
+- Technical accuracy (1-10)
+- Key strengths (1-2 points)
+- Areas to improve (1-2 points)
+- Overall impression
+
+Keep it friendly and constructive, like you're talking to a colleague.
+"""
+
+
+def batched_prompt(pairs):
+    """Prompt that asks for the analyses of all question-answer pairs as one JSON object"""
+    interview = "\n".join(f"Question {i}: {question}\nAnswer: {answer}\n"
+                          for i, (question, answer) in enumerate(pairs, 1))
+    return f"""
+You are a friendly technical interviewer giving quick, human feedback.
+
+{interview}
+For every question give a brief, conversational analysis (max 200 words) covering:
+- Technical accuracy (1-10)
+- Key strengths (1-2 points)
+- Areas to improve (1-2 points)
+- Overall impression
+
+Reply with JSON only, in the form
+{{"analyses": [{{"question_num": 1, "analysis": "..."}}, ...]}}
+with one entry per question.
+"""
+
+
+def overall_prompt(individual_analyses):
+    """Prompt for the overall assessment and hiring recommendation"""
+    # Prepare summary of all responses for overall evaluation
+    summary = "Interview Summary:\n\n"
+    for i, analysis in enumerate(individual_analyses, 1):
+        summary += f"Q{i}: {analysis['question'][:80]}...\n"
+        answer = analysis['answer']
+        if answer is None:
+            answer = "No answer"
+        else:
+            answer = str(answer)
+        summary += f"Answer: {answer[:100]}...\n\n"
+
+    return f"""
+You are a senior hiring manager giving final feedback to a candidate.
+
+{summary}
+
+Give a brief, human assessment (max 200 words) including:
+- Overall technical competency (1-10)
+- Hiring recommendation (HIRE/CONDITIONAL HIRE/DO NOT HIRE)
+- 2-3 main strengths
+- 2-3 areas to work on
+- Final thoughts
+
+Write like you're having a friendly conversation with the candidate.
+"""
+
+
+def overall_assessment(response):
+    """Overall assessment dict, with the hiring decision extracted from the model's response"""
+    hiring_decision = "CONDITIONAL HIRE"  # Default
+    if "DO NOT HIRE" in response.upper():
+        hiring_decision = "DO NOT HIRE"
+    elif "HIRE" in response.upper() and "CONDITIONAL" not in response.upper():
+        hiring_decision = "HIRE"
+
+    return {
+        'overall_analysis': response,
+        'hiring_decision': hiring_decision,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+class AnswerEvaluator:
+    def __init__(self, api_key, model="gpt-4o-mini", base_url=None, max_concurrency=4, max_retries=5,
+                 timeout=60.0):
+        """
+        :param api_key: OpenAI API key
+        :param model: Chat model used for every request
+        :param base_url: API endpoint, e.g. a local mock server; defaults to OpenAI
+        :param max_concurrency: Requests in flight at once
+        :param max_retries: Retries for rate-limited or transient failures
+        """
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.retries = 0
+        self.loop = None
+        self.async_client = None
+        self.semaphore = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the event loop thread that owns the pooled client, once."""
+        with self.lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-evaluator", daemon=True).start()
+                self.loop = loop
+        return self.loop
+
+    async def complete(self, client, semaphore, prompt, max_tokens=300, json_mode=False):
+        """One chat completion with bounded concurrency and retry; errors are returned as text."""
+        extra = {'response_format': {'type': 'json_object'}} if json_mode else {}
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=0.7,
+                        **extra
+                    )
+                return response.choices[0].message.content.strip()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    return f"Error: {str(e)}"
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(self.retry_delay(e, attempt))
+            except Exception as e:
+                return f"Error: {str(e)}"
+
+    def retry_delay(self, error, attempt, base=0.5, cap=20.0):
+        """Seconds to wait: the server's Retry-After if it sent one, else full-jitter backoff."""
+        response = getattr(error, 'response', None)
+        if response is not None:
+            for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+                value = response.headers.get(header)
+                if value:
+                    try:
+                        return min(cap, float(value) * scale) + random.uniform(0, base)
+                    except ValueError:
+                        pass
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+    def client(self):
+        """The shared async client; created on the evaluator's event loop on first use."""
+        if self.async_client is None:
+            # Retries are handled here so they share the concurrency limit
+            self.async_client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                                   max_retries=0, timeout=self.timeout)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.async_client
+
+    async def evaluate_async(self, questions, answers, batched=False, on_answer=None):
+        """
+        Analyse every answer, then produce the overall assessment.
+
+        :param on_answer: Called with each answer's analysis dict as soon as it is ready
+
+        :return: (individual_analyses, overall_assessment) in the layout used by
+                 InterviewAnalyzer reports
+        """
+        pairs = list(zip(questions, answers))
+        client = self.client()
+        semaphore = self.semaphore
+        texts = None
+        if batched and pairs:
+            texts = self.parse_batched(
+                await self.complete(client, semaphore, batched_prompt(pairs),
+                                    max_tokens=300 * len(pairs), json_mode=True),
+                len(pairs))
+            if texts is None:
+                print("Batched analysis could not be parsed, analysing answers individually")
+
+        async def analyse(i, question, answer):
+            if texts is None:
+                text = await self.complete(client, semaphore, answer_prompt(question, answer, i))
+            else:
+                text = texts[i - 1]
+            analysis = {
+                'question_num': i,
+                'question': question,
+                'answer': answer,
+                'analysis': text
+            }
+            if on_answer is not None:
+                on_answer(analysis)
+            return analysis
+
+        individual_analyses = await asyncio.gather(*[
+            analyse(i, question, answer) for i, (question, answer) in enumerate(pairs, 1)])
+
+        response = await self.complete(client, semaphore, overall_prompt(individual_analyses))
+        return individual_analyses, overall_assessment(response)
+
+    def evaluate(self, questions, answers, batched=False, on_answer=None):
+        """Blocking wrapper around `evaluate_async`, callable from any thread."""
+        return asyncio.run_coroutine_threadsafe(
+            self.evaluate_async(questions, answers, batched, on_answer), self.start()).result()
+
+    def close(self):
+        """Close the pooled client and stop the event loop."""
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self.async_client is not None:
+            asyncio.run_coroutine_threadsafe(self.async_client.close(), loop).result()
+            self.async_client = None
+        loop.call_soon_threadsafe(loop.stop)
+
+    @staticmethod
+    def parse_batched(text, count):
+        """Analysis texts in question order from a batched JSON reply, or None if it is unusable."""
+        try:
+            entries = json.loads(text)['analyses']
+            by_number = {int(entry['question_num']): str(entry['analysis']) for entry in entries}
+            return [by_number[i] for i in range(1, count + 1)]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from mock_llm import MockLLMServer
+
+    parser = argparse.ArgumentParser(description="Measure interview analysis wall time against a mock LLM")
+    parser.add_argument('--questions', type=int, default=5, help="Questions per interview")
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per mock completion")
+    parser.add_argument('--concurrency', type=int, default=4, help="Requests in flight at once")
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="Mock rejects every n-th request with 429")
+    args = parser.parse_args()
+
+    server = MockLLMServer(latency=args.latency, rate_limit_every=args.rate_limit_every).start()
+    questions = [f"{i}. Explain topic {i}." for i in range(1, args.questions + 1)]
+    answers = [{'text': f"Answer about topic {i}.", 'status': 'success'} for i in range(1, args.questions + 1)]
+    try:
+        # The previous approach: one blocking request per answer, then the overall assessment
+        client = openai.OpenAI(api_key="mock", base_url=server.url)
+        start = time.perf_counter()
+        analyses = []
+        for i, (question, answer) in enumerate(zip(questions, answers), 1):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini", max_tokens=300,
+                messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                          {"role": "user", "content": answer_prompt(question, answer, i)}])
+            analyses.append({'question': question, 'answer': answer,
+                             'analysis': response.choices[0].message.content})
+        client.chat.completions.create(
+            model="gpt-4o-mini", max_tokens=300,
+            messages=[{"role": "user", "content": overall_prompt(analyses)}])
+        serial = time.perf_counter() - start
+
+        evaluator = AnswerEvaluator("mock", base_url=server.url, max_concurrency=args.concurrency)
+        start = time.perf_counter()
+        evaluator.evaluate(questions, answers)
+        concurrent = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluator.evaluate(questions, answers, batched=True)
+        batched = time.perf_counter() - start
+        evaluator.close()
+    finally:
+        server.stop()
+
+    print(f"{args.questions} questions, {args.latency:.2f} s per completion, "
+          f"{server.requests} requests ({server.rate_limited} rate limited)")
+    print(f"  serial:                  {serial:.2f} s per interview")
+    print(f"  concurrent (limit {args.concurrency}):  {concurrent:.2f} s per interview, {evaluator.retries} retries")
+    print(f"  batched prompt:          {batched:.2f} s per interview")
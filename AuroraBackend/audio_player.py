@@ -0,0 +1,95 @@
+"""
+In-memory audio playback for talking_app.
+
+`TalkingChatbot.speak_text` used to poll `pygame.mixer.music.get_busy()` every
+100 ms, sleep another second so pygame would let go of the MP3 file, and then
+retry deleting it. `AudioPlayer` decodes clips straight from bytes into
+`pygame.mixer.Sound` objects and plays them on a reserved channel. Each `play`
+returns a `threading.Event` that is set when the clip ends: a timer armed for
+the clip's exact length fires it, so nothing polls, sleeps or touches the
+filesystem. Clips queued with `queue=True` start the moment the previous one
+ends.
+"""
+
+import threading
+from io import BytesIO
+
+import pygame
+
+# Extra time allowed past a clip's length before its end event is re-checked
+END_SLACK = 0.05
+
+
+class AudioPlayer:
+    def __init__(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        # Keep channel 0 for speech so other sounds never steal it
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+        self.lock = threading.Lock()
+        # (sound, finished event) pairs, currently playing first
+        self.playing = []
+        self.timer = None
+
+    def play(self, audio, queue=False):
+        """
+        Play encoded audio (MP3, OGG or WAV bytes).
+
+        :param queue: Start after the clips already playing instead of interrupting them
+        :return: threading.Event set when this clip has finished or was interrupted
+        """
+        sound = pygame.mixer.Sound(file=BytesIO(audio))
+        finished = threading.Event()
+        with self.lock:
+            if not queue:
+                self.interrupt()
+            self.playing.append((sound, finished))
+            if len(self.playing) == 1:
+                self.start_next()
+        return finished
+
+    def play_and_wait(self, audio, timeout=None):
+        """Play a clip and block until it ends; returns False on timeout."""
+        return self.play(audio).wait(timeout)
+
+    def stop(self):
+        with self.lock:
+            self.interrupt()
+
+    def interrupt(self):
+        """Stop playback and release everyone waiting; called with the lock held."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.channel.stop()
+        for _, finished in self.playing:
+            finished.set()
+        self.playing = []
+
+    def start_next(self):
+        """Play the head of the queue and arm its end timer; called with the lock held."""
+        sound, _ = self.playing[0]
+        self.channel.play(sound)
+        self.arm(sound.get_length())
+
+    def arm(self, seconds):
+        timer = threading.Timer(seconds + END_SLACK, lambda: self.on_end(timer))
+        timer.daemon = True
+        self.timer = timer
+        timer.start()
+
+    def on_end(self, timer):
+        with self.lock:
+            # A timer that fired while its clip was being interrupted is stale
+            if timer is not self.timer or not self.playing:
+                return
+            # Device latency can keep the tail playing slightly past its nominal length
+            if self.channel.get_busy():
+                self.arm(END_SLACK)
+                return
+            _, finished = self.playing.pop(0)
+            finished.set()
+            self.timer = None
+            if self.playing:
+                self.start_next()
@@ -1,8 +1,16 @@
 import cv2
 import os
+import tempfile
+import threading
 
 cameo_path = "nephele_cartoon.jpg"
 
+# JPEG quality used for in-memory captures
+DEFAULT_JPEG_QUALITY = 90
+
+# Default location of the bounded on-disk image spool
+SPOOL_DIR = os.path.join(tempfile.gettempdir(), "aurora_spool")
+
 def overlay_cameo_next_to_person(frame, cameo_path):
     """
     Overlay a cameo image next to the detected face in the captured frame.
@@ -74,18 +82,13 @@ def overlay_cameo_next_to_person(frame, cameo_path):
 
     return frame
 
-def captureImage(name: str, cameo_path: str) -> str:
+def capture_frame(cameo_path):
     """
-    Capture an image with the cameo overlay, save it, and return the image path.
+    Capture a single frame from the camera with the cameo overlay.
 
-    :param name: Name to use for saving the image
     :param cameo_path: Path to the cameo image
-    :return: Path of the saved image or None if error
+    :return: The frame, or None if the camera could not be read
     """
-    # Ensure the images directory exists
-    if not os.path.exists("images"):
-        os.makedirs("images")
-
     # Initialize video capture
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
@@ -100,19 +103,7 @@ def captureImage(name: str, cameo_path: str) -> str:
             return None
 
         # Overlay cameo next to detected face
-        frame_with_cameo = overlay_cameo_next_to_person(frame, cameo_path)
-
-        # Define the image path
-        path = f"images/{name}.jpg"
-
-        # Save the image
-        success = cv2.imwrite(path, frame_with_cameo)
-        if success:
-            print(f"Image with cameo saved at {path}")
-            return path
-        else:
-            print("Error: Unable to save the image.")
-            return None
+        return overlay_cameo_next_to_person(frame, cameo_path)
 
     except Exception as e:
         print(f"Exception occurred: {e}")
@@ -121,3 +112,135 @@ def captureImage(name: str, cameo_path: str) -> str:
     finally:
         cap.release()
         cv2.destroyAllWindows()
+
+def encode_jpeg(frame, quality=DEFAULT_JPEG_QUALITY):
+    """
+    Encode a frame as JPEG in memory.
+
+    :param frame: BGR frame to encode
+    :param quality: JPEG quality from 0 to 100
+    :return: A zero-copy memoryview over the encoded buffer, or None on failure
+    """
+    success, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    if not success:
+        print("Error: Unable to encode the image.")
+        return None
+    return memoryview(buffer).cast("B")
+
+def captureImageBytes(cameo_path: str, quality: int = DEFAULT_JPEG_QUALITY, frame=None):
+    """
+    Capture an image with the cameo overlay and return it as JPEG bytes in memory.
+
+    :param cameo_path: Path to the cameo image
+    :param quality: JPEG quality from 0 to 100
+    :param frame: Already captured frame to use instead of opening the camera
+    :return: memoryview over the encoded JPEG, or None if error
+    """
+    if frame is None:
+        frame = capture_frame(cameo_path)
+    else:
+        frame = overlay_cameo_next_to_person(frame, cameo_path)
+    if frame is None:
+        return None
+    return encode_jpeg(frame, quality)
+
+class ImageSpool:
+    """
+    Bounded on-disk spool for encoded images.
+
+    Keeps at most `max_files` images and `max_bytes` bytes in `directory`,
+    deleting the oldest files first, so a long event cannot fill the disk.
+    Files are kept across restarts so that pending uploads can be resumed.
+    Files returned by `pinned` (set by SelfiePipeline to the images its journal
+    still needs) are never deleted, even if that leaves the spool over its limits.
+    """
+
+    def __init__(self, directory=SPOOL_DIR, max_files=200, max_bytes=200 * 1024 * 1024, pinned=None):
+        """
+        :param pinned: Function returning the paths that must not be evicted
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.pinned = pinned
+        self.lock = threading.Lock()
+        # Limits are first enforced on write, once the owner of any pending images has set `pinned`
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, filename, buffer):
+        """Write an encoded image to the spool and return its path."""
+        path = os.path.join(self.directory, os.path.basename(filename))
+        tmp_path = path + ".part"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.enforce_limits(keep=path)
+        return path
+
+    def remove(self, path):
+        """Delete a spooled image once it is no longer needed."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def enforce_limits(self, keep=None):
+        entries = []
+        for entry in os.scandir(self.directory):
+            # .part files are writes still in progress
+            if entry.is_file() and not entry.name.endswith(".part"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        protected = {os.path.abspath(path) for path in self.pinned()} if self.pinned else set()
+        if keep is not None:
+            protected.add(os.path.abspath(keep))
+
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_files and total <= self.max_bytes:
+                break
+            if os.path.abspath(path) in protected:
+                continue
+            self.remove(path)
+            total -= size
+            count -= 1
+
+    def cleanup(self):
+        """Delete every spooled image."""
+        with self.lock:
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    self.remove(entry.path)
+
+def captureImage(name: str, cameo_path: str) -> str:
+    """
+    Capture an image with the cameo overlay, save it, and return the image path.
+
+    :param name: Name to use for saving the image
+    :param cameo_path: Path to the cameo image
+    :return: Path of the saved image or None if error
+    """
+    # Ensure the images directory exists
+    if not os.path.exists("images"):
+        os.makedirs("images")
+
+    # Capture a frame with the cameo next to the detected face
+    frame_with_cameo = capture_frame(cameo_path)
+    if frame_with_cameo is None:
+        return None
+
+    # Define the image path
+    path = f"images/{name}.jpg"
+
+    # Save the image
+    success = cv2.imwrite(path, frame_with_cameo)
+    if success:
+        print(f"Image with cameo saved at {path}")
+        return path
+    else:
+        print("Error: Unable to save the image.")
+        return None
@@ -0,0 +1,219 @@
+"""
+Multi-camera QR check-in station.
+
+Runs one decode worker process per camera (or video file) and a single
+attendance writer process that owns the MongoDB connection. Workers decode
+on a grayscale, optionally downscaled frame and push scans onto a shared
+queue; the writer marks attendees present and reports scan-to-recorded
+latency. Per-camera decode FPS is reported by each worker.
+
+Usage:
+    python checkin_station.py 0 1 2
+    python checkin_station.py entrance.mp4 side_door.mp4 --scale 0.5
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import time
+
+import cv2
+from pyzbar import pyzbar
+
+MONGO_URI = 'mongodb://localhost:27017/'  # replace with your MongoDB connection string if different
+DB_NAME = 'AttendanceDB'
+COLLECTION_NAME = 'Nephele'
+
+# Seconds a camera ignores a code it has just reported, so a badge held in
+# front of the lens is not pushed onto the queue on every frame
+RESCAN_COOLDOWN = 3.0
+
+# How often (seconds) workers and the writer print their statistics
+REPORT_INTERVAL = 5.0
+
+
+def parse_source(source):
+    """Camera indices are given as integers, anything else is a video file."""
+    return int(source) if source.isdigit() else source
+
+
+def prepare_frame(frame, scale=1.0):
+    """Convert a BGR frame to grayscale and optionally downscale it for decoding."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if scale != 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def camera_worker(camera_id, source, scan_queue, stop_event, scale=1.0, realtime=False):
+    """
+    Read frames from a camera or video file, decode QR codes and push scans.
+
+    :param camera_id: Label used in reports for this pipeline
+    :param source: Camera index or path to a video file
+    :param scan_queue: Queue shared with the attendance writer
+    :param stop_event: Event that stops the worker when set
+    :param scale: Downscale factor applied to the grayscale frame before decoding
+    :param realtime: Throttle video files to their native frame rate
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        print(f"[{camera_id}] Error: Could not open video source {source}.")
+        return
+
+    frame_delay = 0.0
+    if realtime and isinstance(source, str):
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_delay = 1.0 / fps if fps > 0 else 0.0
+
+    last_sent = {}
+    frames = 0
+    decode_time = 0.0
+    report_start = time.perf_counter()
+
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                # End of a video file, or the camera stopped delivering frames
+                break
+
+            t_scan = time.time()
+            t0 = time.perf_counter()
+            qr_codes = pyzbar.decode(prepare_frame(frame, scale))
+            decode_time += time.perf_counter() - t0
+            frames += 1
+
+            for qr_code in qr_codes:
+                qr_data = qr_code.data.decode('utf-8')
+                if t_scan - last_sent.get(qr_data, 0.0) < RESCAN_COOLDOWN:
+                    continue
+                last_sent[qr_data] = t_scan
+                scan_queue.put((camera_id, qr_data, t_scan))
+
+            now = time.perf_counter()
+            if now - report_start >= REPORT_INTERVAL:
+                print(f"[{camera_id}] decode FPS: {frames / decode_time:.1f} "
+                      f"(loop FPS: {frames / (now - report_start):.1f})")
+                frames = 0
+                decode_time = 0.0
+                report_start = now
+
+            if frame_delay:
+                time.sleep(frame_delay)
+    finally:
+        cap.release()
+        if frames and decode_time:
+            print(f"[{camera_id}] decode FPS: {frames / decode_time:.1f}")
+
+
+def attendance_writer(scan_queue, stop_event, mongo_uri=MONGO_URI, db_name=DB_NAME,
+                      collection_name=COLLECTION_NAME):
+    """
+    Consume scans from all cameras and mark the matching attendees present.
+
+    The writer is the only process that talks to MongoDB. Each attendee is
+    recorded once; repeat scans from other cameras are dropped.
+    """
+    from pymongo import MongoClient
+
+    try:
+        client = MongoClient(mongo_uri)
+        collection = client[db_name][collection_name]
+        print("Connected to MongoDB successfully.")
+    except Exception as e:
+        print(f"Error connecting to MongoDB: {e}")
+        stop_event.set()
+        return
+
+    recorded = set()
+    latencies = []
+    report_start = time.perf_counter()
+
+    while True:
+        try:
+            camera_id, qr_data, t_scan = scan_queue.get(timeout=0.5)
+        except queue.Empty:
+            if stop_event.is_set():
+                break
+            continue
+
+        if qr_data is None:
+            # Sentinel sent by the station once every worker has exited
+            break
+        if qr_data in recorded:
+            continue
+
+        result = collection.update_one({'qr_data': qr_data}, {'$set': {'status': 'present'}})
+        if result.matched_count:
+            recorded.add(qr_data)
+            latency = time.time() - t_scan
+            latencies.append(latency)
+            print(f"[{camera_id}] QR Code {qr_data} marked as present ({latency * 1000:.0f} ms).")
+        else:
+            print(f"[{camera_id}] QR Code {qr_data} is not recognized.")
+
+        now = time.perf_counter()
+        if latencies and now - report_start >= REPORT_INTERVAL:
+            print_latency_report(latencies)
+            report_start = now
+
+    if latencies:
+        print_latency_report(latencies)
+    client.close()
+
+
+def print_latency_report(latencies):
+    """Print scan-to-recorded latency percentiles in milliseconds."""
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"[writer] recorded: {len(ordered)}, scan-to-recorded latency "
+          f"p50: {p50 * 1000:.0f} ms, p95: {p95 * 1000:.0f} ms, max: {ordered[-1] * 1000:.0f} ms")
+
+
+def run_station(sources, scale=1.0, realtime=False):
+    """Start one worker per source plus the attendance writer and wait for them."""
+    scan_queue = mp.Queue()
+    stop_event = mp.Event()
+
+    writer = mp.Process(target=attendance_writer, args=(scan_queue, stop_event), name='writer')
+    writer.start()
+
+    workers = []
+    for i, source in enumerate(sources):
+        camera_id = f"cam{i}"
+        worker = mp.Process(target=camera_worker,
+                            args=(camera_id, parse_source(source), scan_queue, stop_event, scale, realtime),
+                            name=camera_id)
+        worker.start()
+        workers.append(worker)
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        print("Stopping check-in station...")
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+    finally:
+        scan_queue.put((None, None, None))
+        writer.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-camera QR check-in station")
+    parser.add_argument('sources', nargs='+',
+                        help="Camera indices (e.g. 0 1) or video files to use in place of cameras")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Downscale factor for the grayscale decode frame (e.g. 0.5)")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Play video files at their native frame rate instead of as fast as possible")
+    args = parser.parse_args()
+
+    run_station(args.sources, scale=args.scale, realtime=args.realtime)
+
+
+if __name__ == '__main__':
+    main()
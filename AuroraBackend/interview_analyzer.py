@@ -1,52 +1,67 @@
 import json
 import os
 import requests
-import pyttsx3
 import subprocess
 import webbrowser
 import time
+import threading
+import tracemalloc
+import uuid
 import openai
 from datetime import datetime
 from typing import Dict, List, Tuple
-from flask import Flask, render_template_string, request, redirect, url_for, jsonify, render_template
+import queue
+from flask import Flask, Blueprint, render_template_string, request, redirect, url_for, jsonify, render_template, Response
+from session_store import get_store, QUESTIONS_FOLDER
+from interview_events import events
+from answer_evaluator import AnswerEvaluator, answer_prompt, overall_prompt, overall_assessment
+from speech_worker import SpeechWorker
+from analysis_jobs import AnalysisJobQueue
+from report_store import ReportStore
 
 class InterviewAnalyzer:
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, max_concurrency: int = 4, batch_answers: bool = False,
+                 base_url: str = None, speech: SpeechWorker = None, reports: ReportStore = None):
         """
         Initialize the Interview Analyzer
         
+        One instance is shared by all requests: it holds the pooled LLM clients and
+        the speech thread, while everything specific to one interview stays local
+        to analyze_interview.
+        
         Args:
             openai_api_key: OpenAI API key (if not provided, will use default key)
+            max_concurrency: Answers analysed in parallel
+            batch_answers: Score all answers with a single request instead of one per answer
+            base_url: OpenAI-compatible endpoint, e.g. a local mock server
+            speech: Speech worker to use; one is created (lazily initialised) if omitted
+            reports: Report store detailed reports are saved to; the default reports.db if omitted
         """
         self.openai_api_key = openai_api_key or "sk-None-UqWvfA6oQMNrlK2CIl05T3BlbkFJHzWdeLqRSnRE780XkgHi"  # Direct API key
         self.openai_model = "gpt-4o-mini"  # Updated to use gpt-4o-mini
-        self.tts_engine = pyttsx3.init()
-        self.setup_tts()
-        
-    def setup_tts(self):
-        """Configure text-to-speech settings"""
-        try:
-            # Set speech rate (words per minute)
-            self.tts_engine.setProperty('rate', 180)
-            
-            # Set volume (0.0 to 1.0)
-            self.tts_engine.setProperty('volume', 0.9)
-            
-            # Try to set a clearer voice if available
-            voices = self.tts_engine.getProperty('voices')
-            if voices:
-                # Prefer female voice if available, otherwise use first voice
-                for voice in voices:
-                    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                        self.tts_engine.setProperty('voice', voice.id)
-                        break
-                else:
-                    self.tts_engine.setProperty('voice', voices[0].id)
-        except Exception as e:
-            print(f"Warning: TTS setup encountered an issue: {e}")
+        self.batch_answers = batch_answers
+        self.base_url = base_url
+        self.evaluator = AnswerEvaluator(self.openai_api_key, model=self.openai_model, base_url=base_url,
+                                         max_concurrency=max_concurrency)
+        self.speech = speech or SpeechWorker()
+        self.reports = reports or ReportStore()
+        self._client = None
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """Synchronous OpenAI client, created once and reused for its connection pool"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = openai.OpenAI(api_key=self.openai_api_key, base_url=self.base_url)
+            return self._client
     
     def load_interview_data(self, file_path: str) -> Dict:
-        """Load interview data from JSON file"""
+        """Load interview data from the session store, or from a JSON file outside shared_questions"""
+        if os.path.dirname(os.path.abspath(file_path)) == os.path.abspath(QUESTIONS_FOLDER):
+            data = get_store().get_session(os.path.basename(file_path))
+            if data is not None:
+                return data
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 return json.load(file)
@@ -61,8 +76,7 @@ class InterviewAnalyzer:
             return "Error: OpenAI API key not found. Please set the OPENAI_API_KEY environment variable."
         
         try:
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            response = client.chat.completions.create(
+            response = self.client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a friendly technical interviewer giving brief, human feedback. Keep responses under 200 words and conversational."},
@@ -79,20 +93,7 @@ class InterviewAnalyzer:
     
     def analyze_individual_answer(self, question: str, answer: str, question_num: int) -> Dict:
         """Analyze a single question-answer pair"""
-        prompt = f"""
-You are a friendly technical interviewer giving quick, human feedback. 
-
-Question {question_num}: {question}
-Answer: {answer}
-
-Give a brief, conversational analysis (max 200 words) covering:
-- Technical accuracy (1-10)
-- Key strengths (1-2 points)
-- Areas to improve (1-2 points)
-- Overall impression
-
-Keep it friendly and constructive, like you're talking to a colleague.
-"""
+        prompt = answer_prompt(question, answer, question_num)
         
         response = self.query_openai(prompt)
         return {
@@ -104,54 +105,14 @@ Keep it friendly and constructive, like you're talking to a colleague.
     
     def get_overall_assessment(self, interview_data: Dict, individual_analyses: List[Dict]) -> Dict:
         """Get overall assessment and hiring recommendation"""
-        
-        # Prepare summary of all responses for overall evaluation
-        summary = "Interview Summary:\n\n"
-        for i, analysis in enumerate(individual_analyses, 1):
-            summary += f"Q{i}: {analysis['question'][:80]}...\n"
-            answer = analysis['answer']
-            if answer is None:
-                answer = "No answer"
-            else:
-                answer = str(answer)
-            summary += f"Answer: {answer[:100]}...\n\n"
-        
-        prompt = f"""
-You are a senior hiring manager giving final feedback to a candidate.
-
-{summary}
-
-Give a brief, human assessment (max 200 words) including:
-- Overall technical competency (1-10)
-- Hiring recommendation (HIRE/CONDITIONAL HIRE/DO NOT HIRE)
-- 2-3 main strengths
-- 2-3 areas to work on
-- Final thoughts
-
-Write like you're having a friendly conversation with the candidate.
-"""
-        
-        response = self.query_openai(prompt)
-        
-        # Extract hiring decision from response
-        hiring_decision = "CONDITIONAL HIRE"  # Default
-        if "DO NOT HIRE" in response.upper():
-            hiring_decision = "DO NOT HIRE"
-        elif "HIRE" in response.upper() and "CONDITIONAL" not in response.upper():
-            hiring_decision = "HIRE"
-        
-        return {
-            'overall_analysis': response,
-            'hiring_decision': hiring_decision,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        response = self.query_openai(overall_prompt(individual_analyses))
+        return overall_assessment(response)
     
     def speak_text(self, text: str):
         """Convert text to speech"""
         try:
             print(f"\n🔊 Speaking: {text[:100]}...")
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            self.speech.say(text).result()
         except Exception as e:
             print(f"Error in text-to-speech: {e}")
     
@@ -171,8 +132,8 @@ Analysis completed on {overall_assessment['timestamp']}.
         return speech_text
     
     def save_detailed_report(self, interview_data: Dict, individual_analyses: List[Dict], 
-                           overall_assessment: Dict, output_file: str):
-        """Save detailed analysis report to file"""
+                           overall_assessment: Dict, report_name: str) -> int:
+        """Save detailed analysis report to the report store and return its id"""
         report = {
             'session_info': {
                 'session_id': interview_data.get('session_id', 'N/A'),
@@ -188,10 +149,10 @@ Analysis completed on {overall_assessment['timestamp']}.
             }
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        report_id = self.reports.add(report, report_name)
         
-        print(f"Detailed report saved to: {output_file}")
+        print(f"Detailed report saved as #{report_id}: {report_name}")
+        return report_id
     
     def launch_talking_app(self):
         """Launch the talking app in a new process and open the browser"""
@@ -214,8 +175,14 @@ Analysis completed on {overall_assessment['timestamp']}.
             print(f"Error launching talking app: {e}")
             return False
     
-    def analyze_interview(self, file_path: str, speak_results: bool = True) -> Dict:
-        """Main method to analyze interview responses"""
+    def analyze_interview(self, file_path: str, speak_results: bool = True, progress=None) -> Dict:
+        """
+        Main method to analyze interview responses
+        
+        Args:
+            progress: Optional callable(event, data), called with ('question', analysis) as each
+                      answer is analysed and ('overall', assessment) once the assessment is ready
+        """
         print("Starting Interview Analysis...")
         print("=" * 50)
         
@@ -227,22 +194,18 @@ Analysis completed on {overall_assessment['timestamp']}.
             print(f"Error loading interview data: {e}")
             return None
         
-        # Analyze each question-answer pair
-        individual_analyses = []
+        # Analyze all question-answer pairs concurrently, then get the overall assessment
         questions = interview_data.get('questions', [])
         answers = interview_data.get('answers', [])
         
-        print(f"\nAnalyzing {len(questions)} questions...")
-        
-        for i, (question, answer) in enumerate(zip(questions, answers), 1):
-            print(f"\nAnalyzing Question {i}...")
-            analysis = self.analyze_individual_answer(question, answer, i)
-            individual_analyses.append(analysis)
-            print(f"Question {i} analysis complete")
-        
-        # Get overall assessment
-        print(f"\nGenerating overall assessment...")
-        overall_assessment = self.get_overall_assessment(interview_data, individual_analyses)
+        print(f"\nAnalyzing {len(questions)} questions{' in one batched request' if self.batch_answers else ''}...")
+        start = time.perf_counter()
+        on_answer = (lambda analysis: progress('question', analysis)) if progress else None
+        individual_analyses, overall_assessment = self.evaluator.evaluate(
+            questions, answers, self.batch_answers, on_answer=on_answer)
+        print(f"Analysis complete in {time.perf_counter() - start:.1f} s")
+        if progress:
+            progress('overall', overall_assessment)
         
         # Display results
         print("\n" + "=" * 50)
@@ -253,9 +216,10 @@ Analysis completed on {overall_assessment['timestamp']}.
         print("\nDETAILED ASSESSMENT:")
         print(overall_assessment['overall_analysis'])
         
-        # Save detailed report
-        output_file = f"interview_analysis_{interview_data.get('session_id', 'unknown')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        self.save_detailed_report(interview_data, individual_analyses, overall_assessment, output_file)
+        # Save detailed report; the suffix keeps two analyses of one session in the same second apart
+        report_name = (f"interview_analysis_{interview_data.get('session_id', 'unknown')}_"
+                       f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.json")
+        report_id = self.save_detailed_report(interview_data, individual_analyses, overall_assessment, report_name)
         
         # Speak results if requested
         if speak_results:
@@ -269,10 +233,105 @@ Analysis completed on {overall_assessment['timestamp']}.
             'interview_data': interview_data,
             'individual_analyses': individual_analyses,
             'overall_assessment': overall_assessment,
-            'report_file': output_file
+            'report_file': report_name,
+            'report_id': report_id
         }
 
-app = Flask(__name__)
+# Routes, registered on the standalone app below or on interview_app's combined app
+blueprint = Blueprint('analyzer', __name__)
+
+# Analyzer shared by all requests, created on first use
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+# Detailed reports, read by the report routes and /health without building the analyzer
+report_store = ReportStore()
+
+def get_analyzer() -> InterviewAnalyzer:
+    """Return the app-wide InterviewAnalyzer"""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = InterviewAnalyzer(reports=report_store)
+        return _analyzer
+
+def startup():
+    """Run once when the app starts: import the reports saved as JSON files before the store existed"""
+    # Those files were written to the working directory
+    report_store.migrate([os.getcwd(), os.path.dirname(os.path.abspath(__file__))])
+
+def run_analysis_job(params: Dict, progress) -> Dict:
+    """Worker-side body of an analysis job"""
+    results = get_analyzer().analyze_interview(params['file_path'], speak_results=False, progress=progress)
+    if results is None:
+        raise RuntimeError('Analysis failed - no results returned')
+    return results
+
+# Analyses run here instead of inside the HTTP request
+analysis_jobs = AnalysisJobQueue(run_analysis_job, workers=2)
+
+# filename -> (answer texts, job) for the latest analysis of each session
+session_jobs = {}
+session_jobs_lock = threading.Lock()
+
+def answer_texts(session: Dict) -> List:
+    """What an analysis depends on; saving the same answer twice does not change it"""
+    return [answer.get('text') if isinstance(answer, dict) else answer for answer in session['answers']]
+
+def analysis_job(file_path: str):
+    """
+    Job analysing the session at file_path: the one already started for the same answers
+    (e.g. by the session_completed event) if there is one, else a newly queued job.
+
+    :raises queue.Full: if too many analyses are waiting
+    """
+    filename = os.path.basename(file_path)
+    session = get_store().get_session(filename)
+    if session is None:
+        return analysis_jobs.submit(file_path=file_path)
+    texts = answer_texts(session)
+    with session_jobs_lock:
+        previous = session_jobs.get(filename)
+        # The queue forgets old finished jobs, and a forgotten job id would answer 404
+        if (previous is not None and previous[0] == texts and previous[1].status != 'failed'
+                and analysis_jobs.get(previous[1].id) is not None):
+            return previous[1]
+        job = analysis_jobs.submit(file_path=file_path)
+        # Re-inserted so the newest job is last, see latest_session()
+        session_jobs.pop(filename, None)
+        session_jobs[filename] = (texts, job)
+        # Keep no more sessions than the queue keeps finished jobs
+        while len(session_jobs) > analysis_jobs.max_results:
+            session_jobs.pop(next(iter(session_jobs)))
+        return job
+
+def latest_session():
+    """Filename of the session whose analysis started most recently, or None"""
+    with session_jobs_lock:
+        return next(reversed(session_jobs), None)
+
+def prepare_analysis(filename: str):
+    """session_completed handler: start the analysis before anyone asks for it"""
+    try:
+        job = analysis_job(os.path.join(QUESTIONS_FOLDER, filename))
+        print(f"Analysis of {filename} started on completion: job {job.id}")
+    except queue.Full:
+        print(f"Analysis queue full; {filename} will be analysed on request")
+
+events.subscribe('session_completed', prepare_analysis)
+
+def submit_analysis(file_path: str):
+    """Queue an analysis and return the JSON response describing the job"""
+    try:
+        job = analysis_job(file_path)
+    except queue.Full:
+        return jsonify({'error': 'Too many analyses in progress, please try again shortly'}), 503
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('.job_status', job_id=job.id),
+        'events_url': url_for('.job_events', job_id=job.id)
+    }), 202
 
 # HTML template for displaying results
 RESULT_TEMPLATE = '''
@@ -316,7 +375,7 @@ RESULT_TEMPLATE = '''
                 <button class="btn speak-btn" onclick="speakResults()" id="speakBtn">
                     🔊 Speak Results
                 </button>
-                <form method="post" action="{{ url_for('cleanup') }}" style="display: inline;">
+                <form method="post" action="{{ url_for('.cleanup') }}" style="display: inline;">
                     <button class="btn delete-btn" type="submit">🗑️ Delete All Files in shared_questions</button>
                 </form>
             </div>
@@ -331,8 +390,8 @@ RESULT_TEMPLATE = '''
                 </li>
             {% endfor %}
             </ul>
-            <h3>Report File</h3>
-            <pre>{{ results['report_file'] }}</pre>
+            <h3>Report</h3>
+            <p><a href="{{ url_for('.get_report', report_id=results['report_id']) }}">#{{ results['report_id'] }}</a></p>
         {% else %}
             <p class="error">No results available. Please try again.</p>
         {% endif %}
@@ -408,7 +467,7 @@ SELECT_TEMPLATE = '''
         <ul>
             {% for file in files %}
             <li>
-                <form method="post" action="{{ url_for('analyze') }}">
+                <form method="post" action="{{ url_for('.analyze') }}">
                     <input type="hidden" name="filename" value="{{ file }}">
                     <button class="btn" type="submit">Analyze</button> {{ file }}
                 </form>
@@ -423,96 +482,152 @@ SELECT_TEMPLATE = '''
 </html>
 '''
 
-@app.route('/', methods=['GET'])
+@blueprint.route('/', methods=['GET'])
 def index():
     """Main route - redirect to analysis page"""
-    return redirect(url_for('analysis'))
+    return redirect(url_for('.analysis'))
 
-@app.route('/analysis')
+@blueprint.route('/analysis')
 def analysis():
     """Show the analysis page"""
-    return render_template('analysis.html')
+    # Empty when served standalone, /analyzer inside interview_app
+    return render_template('analysis.html', base_url=url_for('.index').rstrip('/'))
 
-@app.route('/health')
+@blueprint.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'interview_analyzer'})
+    return jsonify({'status': 'healthy', 'service': 'interview_analyzer', 'jobs': analysis_jobs.stats(),
+                    'reports': report_store.stats()})
+
+def only_session_file():
+    """(path, None) for the only JSON file in shared_questions, else (None, error)"""
+    questions_folder = QUESTIONS_FOLDER
+    
+    # Check if shared_questions folder exists
+    if not os.path.exists(questions_folder):
+        return None, 'shared_questions folder not found'
+    
+    # Find JSON files in the folder
+    json_files = [f for f in os.listdir(questions_folder) if f.endswith('.json')]
+    
+    if not json_files:
+        return None, 'No JSON files found in shared_questions folder'
+    
+    if len(json_files) > 1:
+        return None, f'Multiple files found ({len(json_files)}). Please ensure only one file is in shared_questions folder.'
+    
+    return os.path.join(questions_folder, json_files[0]), None
 
-@app.route('/auto_analyze', methods=['POST'])
+@blueprint.route('/auto_analyze', methods=['POST'])
 def auto_analyze():
-    """Automatically analyze the only file in shared_questions folder"""
+    """
+    Analyse the session named by ?session= (the talking and thinking pages link here with it).
+    Without one, analyse the session that finished last, or the only file in shared_questions.
+    """
     try:
-        questions_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
-        
-        # Check if shared_questions folder exists
-        if not os.path.exists(questions_folder):
-            return jsonify({'error': 'shared_questions folder not found'})
-        
-        # Find JSON files in the folder
-        json_files = [f for f in os.listdir(questions_folder) if f.endswith('.json')]
-        
-        if not json_files:
-            return jsonify({'error': 'No JSON files found in shared_questions folder'})
-        
-        if len(json_files) > 1:
-            return jsonify({'error': f'Multiple files found ({len(json_files)}). Please ensure only one file is in shared_questions folder.'})
-        
-        # Use the single JSON file found
-        filename = json_files[0]
-        file_path = os.path.join(questions_folder, filename)
-        
-        # Check if file exists and is readable
-        if not os.path.exists(file_path):
-            return jsonify({'error': f'File not found: {filename}'})
-        
-        # Run analysis
-        analyzer = InterviewAnalyzer()
-        results = analyzer.analyze_interview(file_path, speak_results=False)
-        
-        if results is None:
-            return jsonify({'error': 'Analysis failed - no results returned'})
-        
-        return jsonify(results)
-        
-    except FileNotFoundError as e:
-        return jsonify({'error': f'File not found: {str(e)}'})
-    except json.JSONDecodeError as e:
-        return jsonify({'error': f'Invalid JSON format: {str(e)}'})
+        filename = request.args.get('session') or latest_session()
+        if filename is not None:
+            if os.path.basename(filename) != filename or get_store().get_session(filename) is None:
+                return jsonify({'error': f'Session not found: {filename}'}), 404
+            file_path = os.path.join(QUESTIONS_FOLDER, filename)
+        else:
+            file_path, error = only_session_file()
+            if error:
+                return jsonify({'error': error})
+        
+        # Run analysis in the background; ?wait=1 keeps the old blocking behaviour
+        if request.args.get('wait') != '1':
+            return submit_analysis(file_path)
+        
+        job = analysis_job(file_path)
+        for _ in analysis_jobs.events(job):
+            pass
+        if job.error:
+            return jsonify({'error': f'Analysis error: {job.error}'})
+        return jsonify(job.result)
+        
+    except queue.Full:
+        return jsonify({'error': 'Too many analyses in progress, please try again shortly'}), 503
     except Exception as e:
         return jsonify({'error': f'Analysis error: {str(e)}'})
 
-@app.route('/analyze', methods=['POST'])
+@blueprint.route('/analyze', methods=['POST'])
 def analyze():
-    """Legacy analyze route - kept for compatibility"""
+    """Legacy analyze route - queues the analysis and shows the page that follows its progress"""
     filename = request.form.get('filename')
-    questions_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
+    questions_folder = QUESTIONS_FOLDER
     file_path = os.path.join(questions_folder, filename)
     
-    try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            return render_template_string(RESULT_TEMPLATE, results=None, error=f"File not found: {filename}")
-        
-        analyzer = InterviewAnalyzer()
-        results = analyzer.analyze_interview(file_path, speak_results=False)  # Don't auto-speak, let user control it
-        
-        if results is None:
-            return render_template_string(RESULT_TEMPLATE, results=None, error="Analysis failed - no results returned")
-        
-        error = None
-    except FileNotFoundError as e:
-        error = f"File not found: {str(e)}"
-        results = None
-    except json.JSONDecodeError as e:
-        error = f"Invalid JSON format in file: {str(e)}"
-        results = None
-    except Exception as e:
-        error = f"Analysis error: {str(e)}"
-        results = None
+    # Check if file exists
+    if not os.path.exists(file_path):
+        return render_template_string(RESULT_TEMPLATE, results=None, error=f"File not found: {filename}")
     
-    return render_template_string(RESULT_TEMPLATE, results=results, error=error)
+    try:
+        job = analysis_job(file_path)
+    except queue.Full:
+        return render_template_string(RESULT_TEMPLATE, results=None,
+                                      error="Too many analyses in progress, please try again shortly")
+    return redirect(url_for('.analysis', job=job.id))
+
+@blueprint.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Status of an analysis job, with its result once finished"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@blueprint.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events: queued, started, one 'question' per analysed answer, 'overall', then 'result' or 'failed'"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    # Sent back by a reconnecting EventSource; anything that is not an event id replays from the start
+    try:
+        last_event_id = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        last_event_id = None
+    return Response(analysis_jobs.events(job, last_event_id), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@blueprint.route('/jobs/stats')
+def job_stats():
+    """Queue depth and job latency percentiles"""
+    return jsonify(analysis_jobs.stats())
 
-@app.route('/speak_results', methods=['POST'])
+@blueprint.route('/reports')
+def list_reports():
+    """Report summaries, newest first; filter with ?session_id=, ?decision=, ?since= and ?until="""
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    return jsonify({
+        'reports': report_store.list_reports(limit=limit, offset=offset,
+                                             session_id=request.args.get('session_id'),
+                                             decision=request.args.get('decision'),
+                                             since=request.args.get('since'),
+                                             until=request.args.get('until')),
+        'offset': offset,
+        'limit': limit
+    })
+
+@blueprint.route('/reports/<int:report_id>')
+def get_report(report_id):
+    """One full report"""
+    report = report_store.get(report_id)
+    if report is None:
+        return jsonify({'error': 'Report not found'}), 404
+    return jsonify(report)
+
+@blueprint.route('/reports/decisions')
+def report_decisions():
+    """Hiring-decision distribution across stored reports"""
+    return jsonify(report_store.decision_counts(since=request.args.get('since'), until=request.args.get('until')))
+
+@blueprint.route('/speak_results', methods=['POST'])
 def speak_results():
     """Speak the analysis results"""
     try:
@@ -520,31 +635,34 @@ def speak_results():
         hiring_decision = request.form.get('hiring_decision', '')
         overall_analysis = request.form.get('overall_analysis', '')
         
-        # Create analyzer instance and speak the results
-        analyzer = InterviewAnalyzer()
+        # Speak the results on the shared speech thread
         speech_text = f"Interview Analysis Complete. Hiring Decision: {hiring_decision}. {overall_analysis}"
-        analyzer.speak_text(speech_text)
+        get_analyzer().speech.say(speech_text).result()
         
         return jsonify({'status': 'success', 'message': 'Results spoken successfully'})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
-@app.route('/cleanup', methods=['POST'])
+@blueprint.route('/cleanup', methods=['POST'])
 def cleanup():
-    questions_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
+    questions_folder = QUESTIONS_FOLDER
     for f in os.listdir(questions_folder):
         file_path = os.path.join(questions_folder, f)
         if os.path.isfile(file_path):
             os.remove(file_path)
-    return redirect(url_for('index'))
+    get_store().delete_all()
+    with session_jobs_lock:
+        session_jobs.clear()
+    return redirect(url_for('.index'))
+
+app = Flask(__name__)
+app.register_blueprint(blueprint)
 
 def main():
     """Main function to run the interview analyzer"""
-    # Configuration - use absolute path based on current file location
-    QUESTIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
-    
     # Initialize analyzer
-    analyzer = InterviewAnalyzer()
+    analyzer = InterviewAnalyzer(reports=report_store)
+    startup()
     
     # Auto-detect JSON files in the questions folder
     if not os.path.exists(QUESTIONS_FOLDER):
@@ -603,7 +721,7 @@ def main():
         
         if results:
             print(f"\n🎉 Analysis completed successfully!")
-            print(f"📄 Detailed report: {results['report_file']}")
+            print(f"📄 Detailed report: {results['report_file']} (#{results['report_id']} in {analyzer.reports.path})")
             
             # Quick summary
             decision = results['overall_assessment']['hiring_decision']
@@ -617,9 +735,58 @@ def main():
     except Exception as e:
         print(f"❌ Error during analysis: {e}")
 
+def measure_request_overhead(requests: int = 20):
+    """
+    Compare per-request setup cost of building a new analyzer, TTS engine and
+    OpenAI client for every request against the shared analyzer service.
+    Uses a zero-latency mock LLM so only client-side overhead is measured.
+    """
+    from mock_llm import MockLLMServer
+    
+    server = MockLLMServer(latency=0).start()
+    prompt = "Say hello."
+    
+    def per_request():
+        # What every route used to do: init a TTS engine and a new HTTP client per prompt
+        try:
+            SpeechWorker().init_engine()
+        except Exception as e:
+            print(f"TTS engine unavailable, measuring the LLM client only: {e}")
+        client = openai.OpenAI(api_key="mock", base_url=server.url)
+        client.chat.completions.create(model="gpt-4o-mini", max_tokens=300,
+                                       messages=[{"role": "user", "content": prompt}])
+    
+    shared = InterviewAnalyzer(openai_api_key="mock", base_url=server.url)
+    shared.query_openai(prompt)  # warm the shared connection pool
+    
+    def measure(run):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(requests):
+            run()
+        elapsed = (time.perf_counter() - start) / requests
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, retained, peak
+    
+    try:
+        results = [('new analyzer per request', measure(per_request)),
+                   ('shared analyzer service', measure(lambda: shared.query_openai(prompt)))]
+    finally:
+        server.stop()
+    
+    print(f"{requests} requests against a zero-latency mock LLM")
+    for name, (elapsed, retained, peak) in results:
+        print(f"  {name:<26} {elapsed * 1000:7.1f} ms/request, "
+              f"{retained / 1024:8.0f} KB retained, {peak / 1024:8.0f} KB peak")
+    return results
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == 'cli':
         main()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'overhead':
+        measure_request_overhead(int(sys.argv[2]) if len(sys.argv) > 2 else 20)
     else:
+        startup()
         app.run(debug=True, port=5002)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+The whole mock interview as one application.
+
+thinking_app (resume upload and question generation), talking_app (spoken
+answers) and interview_analyzer (scoring) used to run as three processes on
+ports 5000-5002. They shared nothing but JSON files in `shared_questions`,
+which every stage parsed again. Here their blueprints are served by one Flask
+app:
+
+    /            thinking_app
+    /talking     talking_app
+    /analyzer    interview_analyzer
+
+All three share one SessionStore (and its in-memory session cache). They hand
+off through interview_events instead of the filesystem. A new session's
+question audio is synthesised as soon as the questions exist, and a finished
+session's analysis starts the moment its last answer is saved, before anyone
+opens the analysis page. The JSON files are still written for external
+readers.
+
+    python interview_app.py
+    python serve.py interview
+"""
+
+import os
+
+from flask import Flask, jsonify
+
+import interview_analyzer
+import talking_app
+import thinking_app
+from interview_events import events
+from session_store import get_store
+
+app = Flask(__name__)
+app.secret_key = thinking_app.app.secret_key
+app.config['MAX_CONTENT_LENGTH'] = thinking_app.app.config['MAX_CONTENT_LENGTH']
+app.config['QUESTIONS_FOLDER'] = thinking_app.app.config['QUESTIONS_FOLDER']
+
+app.register_blueprint(thinking_app.blueprint)
+app.register_blueprint(talking_app.blueprint, url_prefix='/talking')
+app.register_blueprint(interview_analyzer.blueprint, url_prefix='/analyzer')
+
+
+def startup():
+    """One-off work before serving; also run by serve.py"""
+    interview_analyzer.startup()
+
+
+@app.route('/health/all')
+def health():
+    """Health of every stage in this process"""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'interview_app',
+        'thinking': thinking_app.health().get_json(),
+        'talking': talking_app.health().get_json(),
+        'analyzer': interview_analyzer.health().get_json(),
+        'events': events.stats(),
+        'cached_sessions': len(get_store().cache)
+    })
+
+
+if __name__ == '__main__':
+    print("Starting the mock interview app...")
+    os.makedirs(app.config['QUESTIONS_FOLDER'], exist_ok=True)
+    startup()
+    thinking_app.start_health_monitor()
+    app.run(port=5000, debug=False, threaded=True)
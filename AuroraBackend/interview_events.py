@@ -0,0 +1,72 @@
+"""
+In-process handoff between the interview stages.
+
+When the stages run as one application (interview_app.py), each stage
+announces what it has finished, and the next stage reacts straight away. It
+no longer waits for a file to appear in `shared_questions`:
+
+    session_created    thinking_app saved a new session's questions
+                       (filename, session_id, questions)
+    session_completed  talking_app or thinking_app stored the last answer of a
+                       session (filename)
+
+Subscribers run on a small thread pool, so publishing never delays the
+request that publishes. When the apps run as separate processes nobody
+subscribes, and publishing does nothing.
+
+`analysis_url` links a finished session to the analysis page that follows
+the job its session_completed event started.
+"""
+
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import url_for
+from werkzeug.routing import BuildError
+
+# Threads running subscriber callbacks
+HANDLER_WORKERS = 2
+
+
+class EventBus:
+    def __init__(self, workers=HANDLER_WORKERS):
+        self.subscribers = defaultdict(list)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="interview-events")
+        self.published = defaultdict(int)
+
+    def subscribe(self, topic, callback):
+        """Call callback(**data) for every event published on `topic`."""
+        with self.lock:
+            self.subscribers[topic].append(callback)
+
+    def publish(self, topic, **data):
+        with self.lock:
+            callbacks = list(self.subscribers[topic])
+            self.published[topic] += 1
+        for callback in callbacks:
+            self.executor.submit(self.deliver, topic, callback, data)
+
+    def deliver(self, topic, callback, data):
+        try:
+            callback(**data)
+        except Exception as e:
+            print(f"Error handling {topic} event: {e}")
+
+    def stats(self):
+        with self.lock:
+            return {topic: {'published': self.published[topic], 'subscribers': len(self.subscribers[topic])}
+                    for topic in set(self.published) | set(self.subscribers)}
+
+
+# Shared by every stage imported into the same process
+events = EventBus()
+
+
+def analysis_url(filename):
+    """Analysis page for a finished session if interview_analyzer is served by this app, else None"""
+    try:
+        return url_for('analyzer.analysis', session=filename)
+    except BuildError:
+        return None
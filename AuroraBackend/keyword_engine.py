@@ -0,0 +1,185 @@
+"""
+Shared keyword matcher for resume analysis.
+
+`thinking_app.find_matching_keywords` and `resume_analyzer_gui.analyze_resume`
+used to run one `re.search(r'\b...\b')` per keyword, i.e. a full pass over the
+resume for every entry in the keyword list. `KeywordMatcher` compiles all
+keywords into a single alternation regex at startup and finds every
+whole-word match, with counts and positions, in one pass over the text.
+
+Keywords are escaped, so entries such as 'C++', 'C#', 'Node.js' and 'CI/CD'
+match literally, and a keyword only matches when it is not surrounded by
+other word characters.
+
+Run this file to benchmark the matcher against the per-keyword regex loop:
+    python keyword_engine.py --resumes 2000 --size 20000
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """
+        :param keywords: Dict of category -> list of keywords, or a plain list of keywords
+        """
+        if isinstance(keywords, dict):
+            categories = keywords
+        else:
+            categories = {None: list(keywords)}
+
+        # Lower-cased keyword -> canonical spelling and the categories it belongs to,
+        # in the order the keywords were defined
+        self.canonical = OrderedDict()
+        self.categories = OrderedDict()
+        for category, words in categories.items():
+            for word in words:
+                key = word.lower()
+                self.canonical.setdefault(key, word)
+                self.categories.setdefault(key, [])
+                if category is not None and category not in self.categories[key]:
+                    self.categories[key].append(category)
+
+        # The alternation is factored into a prefix trie so the engine tests each
+        # character once per position instead of once per keyword. The lookahead
+        # makes every match zero-width, so overlapping keywords are all reported.
+        alternation = trie_regex(self.canonical)
+        self.pattern = re.compile(r'(?=(?<!\w)(' + alternation + r')(?!\w))', re.IGNORECASE)
+        # Stable across processes, so it can be part of cache keys
+        self.version = hashlib.sha256(alternation.encode('utf-8')).hexdigest()[:16]
+
+    def scan(self, text):
+        """
+        Find all keyword matches in a single pass.
+
+        :return: OrderedDict of canonical keyword -> {'count': n, 'positions': [offsets]},
+                 ordered as the keywords were defined
+        """
+        hits = {}
+        for match in self.pattern.finditer(text):
+            hits.setdefault(match.group(1).lower(), []).append(match.start())
+
+        results = OrderedDict()
+        for key, word in self.canonical.items():
+            if key in hits:
+                results[word] = {'count': len(hits[key]), 'positions': hits[key]}
+        return results
+
+    def find(self, text):
+        """Matched keywords (canonical spelling, definition order, no duplicates)."""
+        return list(self.scan(text))
+
+    def categorize(self, matched):
+        """Group matched keywords by the categories they were defined in."""
+        categorized = OrderedDict()
+        for word in matched:
+            for category in self.categories.get(word.lower(), []):
+                categorized.setdefault(category, []).append(word)
+        return categorized
+
+    def scan_many(self, texts, processes=None):
+        """
+        Scan a batch of texts.
+
+        :param processes: Use a process pool of this size; None scans in this process
+        :return: List of `scan` results, in input order
+        """
+        if not processes:
+            return [self.scan(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(self.scan, texts, chunksize=16))
+
+    def __getstate__(self):
+        # Compiled patterns are rebuilt on unpickle in process pool workers
+        state = self.__dict__.copy()
+        state['pattern'] = self.pattern.pattern
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.pattern = re.compile(self.pattern, re.IGNORECASE)
+
+
+def trie_regex(words):
+    """
+    Build a regex matching any of `words`, factored by common prefixes.
+
+    Longer continuations are tried first, and backtracking falls back to a
+    shorter keyword when the longer one is not followed by a word boundary.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+def per_keyword_scan(keywords, text):
+    """The previous approach: one regex search per keyword, kept for benchmarking."""
+    text_lower = text.lower()
+    return [k for k in keywords if re.search(r'\b' + re.escape(k.lower()) + r'\b', text_lower)]
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import random
+    import time
+
+    from resume_keywords import DOMAIN_KEYWORDS, TECHNICAL_KEYWORDS
+
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass keyword matcher")
+    parser.add_argument('--resumes', type=int, default=500, help="Number of synthetic resumes")
+    parser.add_argument('--size', type=int, default=20000, help="Characters per resume")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help="Processes for the batch run")
+    args = parser.parse_args()
+
+    for name, keywords in (('thinking_app', TECHNICAL_KEYWORDS), ('resume_analyzer_gui', DOMAIN_KEYWORDS)):
+        flat = [k for words in keywords.values() for k in words]
+        vocabulary = flat + "the of and with to in for on team built designed led using project system".split() * 20
+        random.seed(0)
+        corpus = []
+        for _ in range(args.resumes):
+            words, length = [], 0
+            while length < args.size:
+                word = random.choice(vocabulary)
+                words.append(word)
+                length += len(word) + 1
+            corpus.append(' '.join(words))
+
+        matcher = KeywordMatcher(keywords)
+        total_mb = sum(len(t) for t in corpus) / 1e6
+
+        start = time.perf_counter()
+        for text in corpus:
+            per_keyword_scan(flat, text)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher.scan_many(corpus)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher.scan_many(corpus, processes=args.processes)
+        batch = time.perf_counter() - start
+
+        print(f"{name}: {len(matcher.canonical)} keywords, {args.resumes} resumes, {total_mb:.1f} MB")
+        print(f"  per-keyword regex loop: {loop:.2f} s ({args.resumes / loop:.0f} resumes/s)")
+        print(f"  single-pass matcher:    {single:.2f} s ({args.resumes / single:.0f} resumes/s)")
+        print(f"  batch ({args.processes} processes):   {batch:.2f} s ({args.resumes / batch:.0f} resumes/s)")
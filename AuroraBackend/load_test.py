@@ -0,0 +1,170 @@
+"""
+Load test for the interview flow against local mock backends.
+
+Each simulated candidate:
+  1. uploads a resume to thinking_app and gets five generated questions
+  2. submits an answer to each question
+  3. asks interview_analyzer to analyse the session and waits for the job
+
+Bedrock is replaced by mock_bedrock.py and OpenAI by mock_llm.py, both with
+realistic latencies. All data goes to a temporary AURORA_DATA_DIR, so the real
+shared_questions folder and databases are left alone. Every resume is
+different, so the analysis cache never short-circuits generation.
+talking_app is not driven because it needs a microphone and speakers.
+
+The apps run either on Flask's development server (`--mode dev`, the old way)
+or under serve.py (`--mode serve`). The report gives flows per second and
+p50/p95 latency for each stage:
+    python load_test.py --mode dev --candidates 40 --concurrency 8
+    python load_test.py --mode serve --workers 4 --candidates 40 --concurrency 8
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from analysis_jobs import percentile
+from mock_bedrock import MockBedrockServer
+from mock_llm import MockLLMServer
+from pdf_extract import make_test_pdf
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ('upload', 'answers', 'analysis', 'flow')
+
+
+def start_app(module, name, port, mode, workers, env):
+    if mode == 'dev':
+        command = [sys.executable, '-c', f"import {module}; {module}.app.run(port={port}, debug=False)"]
+    else:
+        command = [sys.executable, os.path.join(BASE_DIR, 'serve.py'), name, '--port', str(port),
+                   '--workers', str(workers)]
+    return subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+
+
+def wait_healthy(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become healthy within {timeout} s")
+
+
+def resume(index, folder):
+    """A one-page resume PDF whose bytes (and so cache key) are unique to this candidate"""
+    path = os.path.join(folder, f"resume_{index}.pdf")
+    make_test_pdf(path, 1)
+    with open(path, 'rb') as f:
+        # Trailing comments after %%EOF are ignored by PDF readers
+        return f.read() + f"% candidate {index}\n".encode('ascii')
+
+
+def candidate(index, thinking_url, analyzer_url, folder):
+    """Run one interview end to end; returns the seconds spent in each stage."""
+    http = requests.Session()
+    times = {}
+    start = time.perf_counter()
+
+    response = http.post(f"{thinking_url}/upload",
+                         files={'resume': (f"resume_{index}.pdf", resume(index, folder), 'application/pdf')})
+    response.raise_for_status()
+    upload = response.json()
+    times['upload'] = time.perf_counter() - start
+
+    stage = time.perf_counter()
+    for question_index in range(len(upload['questions'])):
+        response = http.post(f"{thinking_url}/submit_answer", json={
+            'questions_file': upload['questions_file'],
+            'question_index': question_index,
+            'answer': f"Candidate {index} answer {question_index}: I would profile it, then fix the hot path."
+        })
+        response.raise_for_status()
+    times['answers'] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    response = http.post(f"{analyzer_url}/analyze", data={'filename': upload['questions_file']},
+                         allow_redirects=False)
+    job_id = parse_qs(urlparse(response.headers['Location']).query)['job'][0]
+    while True:
+        job = http.get(f"{analyzer_url}/jobs/{job_id}").json()
+        if job['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    if job['status'] == 'failed':
+        raise RuntimeError(f"Analysis failed: {job['error']}")
+    times['analysis'] = time.perf_counter() - stage
+    times['flow'] = time.perf_counter() - start
+    return times
+
+
+def run(args):
+    bedrock = MockBedrockServer(first_token_latency=args.bedrock_latency).start()
+    llm = MockLLMServer(latency=args.llm_latency).start()
+    data_dir = tempfile.mkdtemp(prefix="aurora_load_")
+    env = dict(os.environ,
+               AURORA_DATA_DIR=data_dir,
+               BEDROCK_ENDPOINT_URL=bedrock.url,
+               OPENAI_BASE_URL=llm.url,
+               AWS_ACCESS_KEY_ID=os.environ.get('AWS_ACCESS_KEY_ID', 'testing'),
+               AWS_SECRET_ACCESS_KEY=os.environ.get('AWS_SECRET_ACCESS_KEY', 'testing'))
+    thinking_url = f"http://127.0.0.1:{args.port}"
+    analyzer_url = f"http://127.0.0.1:{args.port + 2}"
+    processes = [start_app('thinking_app', 'thinking', args.port, args.mode, args.workers, env),
+                 start_app('interview_analyzer', 'analyzer', args.port + 2, args.mode, args.workers, env)]
+    try:
+        wait_healthy(thinking_url)
+        wait_healthy(analyzer_url)
+
+        results, errors = [], []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [executor.submit(candidate, i, thinking_url, analyzer_url, data_dir)
+                       for i in range(args.candidates)]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        elapsed = time.perf_counter() - start
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        bedrock.stop()
+        llm.stop()
+
+    print(f"{args.mode} mode: {args.candidates} candidates, {args.concurrency} at a time"
+          f"{f', {args.workers} worker(s)' if args.mode == 'serve' else ''}")
+    print(f"  {len(results)} flows in {elapsed:.1f} s = {len(results) / elapsed:.2f} flows/s, {len(errors)} errors")
+    for stage in STAGES:
+        values = sorted(times[stage] for times in results)
+        if values:
+            print(f"  {stage:<9} p50 {percentile(values, 50) * 1000:8.0f} ms   "
+                  f"p95 {percentile(values, 95) * 1000:8.0f} ms")
+    if errors:
+        print(f"  first error: {errors[0]}")
+    return results, errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test the interview flow against mock Bedrock and OpenAI")
+    parser.add_argument('--mode', choices=['dev', 'serve'], default='serve')
+    parser.add_argument('--workers', type=int, default=4, help="thinking_app worker processes in serve mode")
+    parser.add_argument('--candidates', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8, help="Candidates in flight at once")
+    parser.add_argument('--port', type=int, default=6100, help="thinking_app port; the analyzer uses port + 2")
+    parser.add_argument('--bedrock-latency', type=float, default=0.3, help="Seconds to first Bedrock token")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Seconds per OpenAI completion")
+    run(parser.parse_args())
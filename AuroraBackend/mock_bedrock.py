@@ -0,0 +1,174 @@
+"""
+Local stand-in for the Bedrock runtime Converse API, used by the load test.
+
+Serves `converse` (the health probe) and `converse-stream` (question
+generation). Streamed replies are binary AWS event-stream messages, the format
+botocore parses for the real service. The first token arrives after
+`first_token_latency` and each later chunk after `token_latency`, so wall time
+behaves like a real model. The reply is five numbered questions.
+
+Point boto3 at it with the endpoint URL and any credentials:
+    server = MockBedrockServer().start()
+    os.environ["BEDROCK_ENDPOINT_URL"] = server.url
+    ...
+    server.stop()
+"""
+
+import json
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUESTIONS = [
+    "1. How would you design a {0} service to handle a sudden tenfold increase in traffic?",
+    "2. Describe how you would debug a memory leak in a long-running {0} process.",
+    "3. What trade-offs do you weigh when choosing between {0} and {1} for a new project?",
+    "4. Walk me through how you would test and deploy a change to a critical {1} component.",
+    "5. How do you keep a {0} code base maintainable as the team grows?",
+]
+
+
+def event_message(event_type, payload):
+    """Encode one AWS event-stream message: prelude, string headers, JSON payload and CRCs"""
+    headers = b""
+    for name, value in ((':event-type', event_type), (':content-type', 'application/json'),
+                        (':message-type', 'event')):
+        name, value = name.encode('utf-8'), value.encode('utf-8')
+        # Header value type 7 is a UTF-8 string
+        headers += struct.pack('>B', len(name)) + name + struct.pack('>BH', 7, len(value)) + value
+    body = json.dumps(payload).encode('utf-8')
+    total_length = 12 + len(headers) + len(body) + 4
+    prelude = struct.pack('>II', total_length, len(headers))
+    message = prelude + struct.pack('>I', zlib.crc32(prelude)) + headers + body
+    return message + struct.pack('>I', zlib.crc32(message))
+
+
+class MockBedrockServer:
+    def __init__(self, first_token_latency=0.3, token_latency=0.01, host="127.0.0.1", port=0):
+        """
+        :param first_token_latency: Seconds before the first streamed chunk
+        :param token_latency: Seconds between later chunks (one word each)
+        """
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.requests = 0
+        self.tokens = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-bedrock", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                with mock.lock:
+                    mock.requests += 1
+                if self.path.endswith('/converse-stream'):
+                    self.stream(mock.reply_words(body))
+                elif self.path.endswith('/converse'):
+                    time.sleep(mock.first_token_latency)
+                    self.reply({
+                        'output': {'message': {'role': 'assistant', 'content': [{'text': "Hello"}]}},
+                        'stopReason': 'max_tokens',
+                        'usage': {'inputTokens': 1, 'outputTokens': 1, 'totalTokens': 2},
+                        'metrics': {'latencyMs': int(mock.first_token_latency * 1000)}
+                    })
+                else:
+                    self.send_error(404)
+
+            def reply(self, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def stream(self, words):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.amazon.eventstream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                self.chunk(event_message('messageStart', {'role': 'assistant'}))
+                time.sleep(mock.first_token_latency)
+                for i, word in enumerate(words):
+                    if i:
+                        time.sleep(mock.token_latency)
+                    self.chunk(event_message('contentBlockDelta',
+                                             {'contentBlockIndex': 0, 'delta': {'text': word}}))
+                with mock.lock:
+                    mock.tokens += len(words)
+                self.chunk(event_message('contentBlockStop', {'contentBlockIndex': 0}))
+                self.chunk(event_message('messageStop', {'stopReason': 'end_turn'}))
+                self.chunk(event_message('metadata', {
+                    'usage': {'inputTokens': 100, 'outputTokens': len(words), 'totalTokens': 100 + len(words)},
+                    'metrics': {'latencyMs': 0}
+                }))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def chunk(self, data):
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def reply_words(self, body):
+        """
+        The streamed reply split into word-sized chunks, honouring any stop sequences.
+
+        Prompts that ask for a JSON object get the questions as q1..q5, continuing
+        from the assistant prefill when there is one; others get a numbered list.
+        """
+        messages = body.get('messages', [{}])
+        prefill = ''
+        if messages[-1].get('role') == 'assistant':
+            prefill = messages[-1]['content'][0]['text']
+            messages = messages[:-1]
+        prompt = messages[-1].get('content', [{}])[0].get('text', '')
+        skills = re.search(r"resume: ([^\n]+)", prompt)
+        topics = (skills.group(1).split(', ') if skills else []) + ['Python', 'SQL']
+        questions = [q.format(*topics) for q in QUESTIONS]
+        if 'JSON object' in prompt:
+            text = json.dumps({f"q{i}": q.split('. ', 1)[1] for i, q in enumerate(questions, 1)}, indent=2)
+            text = text[len(prefill):] if text.startswith(prefill) else text
+        else:
+            text = "Here are the questions:\n" + "\n".join(questions) + "\n"
+        for stop in body.get('inferenceConfig', {}).get('stopSequences', []):
+            if stop in text:
+                text = text[:text.index(stop)]
+        return [word + ' ' for word in text.replace('\n', ' \n').split(' ') if word]
+
+
+if __name__ == '__main__':
+    server = MockBedrockServer().start()
+    print(f"Mock Bedrock listening on {server.url}; set BEDROCK_ENDPOINT_URL to use it. Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
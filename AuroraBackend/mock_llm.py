@@ -0,0 +1,110 @@
+"""
+Local stand-in for the OpenAI chat completions API, used by the benchmarks.
+
+Every request sleeps for a fixed latency before answering, so wall time
+reflects how many round trips a caller makes and how many it overlaps. Every
+`rate_limit_every`-th request is rejected with HTTP 429 and a Retry-After
+header, to exercise retry handling.
+
+Point an OpenAI client at it with base_url=server.url and any api_key:
+    server = MockLLMServer(latency=0.5).start()
+    ...
+    server.stop()
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockLLMServer:
+    def __init__(self, latency=0.5, rate_limit_every=0, retry_after=0.2, host="127.0.0.1", port=0):
+        """
+        :param latency: Seconds each completion takes
+        :param rate_limit_every: Reject every n-th request with 429; 0 never rejects
+        :param retry_after: Seconds sent in the Retry-After header of a 429
+        """
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.counter = itertools.count(1)
+        self.requests = 0
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-llm", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                number = next(mock.counter)
+                with mock.lock:
+                    mock.requests += 1
+                if mock.rate_limit_every and number % mock.rate_limit_every == 0:
+                    with mock.lock:
+                        mock.rate_limited += 1
+                    self.reply(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                               {'Retry-After': str(mock.retry_after)})
+                    return
+
+                time.sleep(mock.latency)
+                self.reply(200, mock.completion(body))
+
+            def reply(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def completion(self, body):
+        """A chat completion whose content matches what the prompt asks for."""
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        if body.get('response_format', {}).get('type') == 'json_object':
+            count = len(re.findall(r'^Question \d+:', prompt, re.MULTILINE))
+            content = json.dumps({'analyses': [
+                {'question_num': i, 'analysis': f"Technical accuracy: 7/10. Solid answer {i}."}
+                for i in range(1, count + 1)]})
+        elif 'Hiring recommendation' in prompt:
+            content = "Overall technical competency: 7/10. Hiring recommendation: CONDITIONAL HIRE."
+        else:
+            content = "Technical accuracy: 7/10. Clear explanation, could use more detail."
+        return {
+            'id': f"chatcmpl-mock-{time.monotonic_ns()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4,
+                      'total_tokens': (len(prompt) + len(content)) // 4},
+        }
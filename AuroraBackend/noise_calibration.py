@@ -0,0 +1,156 @@
+"""
+Background ambient-noise calibration for talking_app.
+
+`TalkingChatbot.__init__` used to call `adjust_for_ambient_noise` once. That
+held up startup for a second and left the energy threshold fixed as the room
+got noisier or quieter. `AmbientCalibrator` samples the microphone on a
+background thread whenever it is idle, with no capture and no question audio
+playing. It tracks the noise floor as an exponential moving average and keeps
+`recognizer.energy_threshold` a fixed ratio above it.
+
+A capture never waits for calibration. `exclusive()` asks the calibrator to
+let go of the microphone, and the calibrator checks for that between chunks
+of a few tens of milliseconds.
+"""
+
+import math
+import statistics
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# Weight of each new sample window in the noise-floor average
+EMA_ALPHA = 0.2
+
+# Seconds of audio in one sample window
+SAMPLE_WINDOW = 0.5
+
+# Seconds between sample windows
+SAMPLE_INTERVAL = 10.0
+
+# The threshold never drops below this, so a silent room does not trigger on breathing
+MIN_ENERGY_THRESHOLD = 50
+
+
+def rms(buffer):
+    """Root-mean-square energy of 16-bit PCM, on the same scale as speech_recognition's threshold"""
+    samples = array('h', buffer)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class AmbientCalibrator:
+    def __init__(self, recognizer, microphone, is_idle=None, alpha=EMA_ALPHA,
+                 window=SAMPLE_WINDOW, interval=SAMPLE_INTERVAL):
+        """
+        :param recognizer: speech_recognition.Recognizer whose energy_threshold is maintained
+        :param microphone: speech_recognition.Microphone to sample
+        :param is_idle: Optional callable; sampling is skipped while it returns False (e.g. during playback)
+        :param alpha: Weight of each new window in the moving average
+        :param window: Seconds sampled per window
+        :param interval: Seconds between windows
+        """
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.is_idle = is_idle
+        self.alpha = alpha
+        self.window = window
+        self.interval = interval
+        self.noise_floor = None
+        self.samples = 0
+        self.skipped = 0
+        self.last_sample = None
+        # Held by whoever has the microphone open
+        self.lock = threading.Lock()
+        # Set while a capture is waiting for the microphone
+        self.wanted = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="noise-calibration", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the microphone for a capture, interrupting any sample window in progress."""
+        self.wanted.set()
+        with self.lock:
+            self.wanted.clear()
+            yield
+
+    def run(self):
+        # The first window runs straight away so the threshold settles soon after startup
+        while not self.stopped.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Warning: Ambient noise calibration failed: {e}")
+            self.stopped.wait(self.interval)
+
+    def sample(self):
+        """Measure one window of idle noise and fold it into the average; returns False if skipped."""
+        if self.wanted.is_set() or (self.is_idle is not None and not self.is_idle()):
+            self.skipped += 1
+            return False
+        if not self.lock.acquire(blocking=False):
+            self.skipped += 1
+            return False
+        try:
+            energies = []
+            with self.microphone as source:
+                chunks = max(1, int(self.window * source.SAMPLE_RATE / source.CHUNK))
+                for _ in range(chunks):
+                    if self.wanted.is_set():
+                        break
+                    energies.append(rms(source.stream.read(source.CHUNK)))
+        finally:
+            self.lock.release()
+        # A window cut short by a capture may already contain the candidate's voice
+        if self.wanted.is_set() or not energies:
+            self.skipped += 1
+            return False
+        # The median ignores a door slam or a cough in the window
+        self.update(statistics.median(energies))
+        return True
+
+    def update(self, energy):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        else:
+            self.noise_floor = self.alpha * energy + (1 - self.alpha) * self.noise_floor
+        self.recognizer.energy_threshold = max(MIN_ENERGY_THRESHOLD,
+                                               self.noise_floor * self.recognizer.dynamic_energy_ratio)
+        self.samples += 1
+        self.last_sample = time.time()
+
+    def stats(self):
+        return {
+            'noise_floor': self.noise_floor,
+            'energy_threshold': self.recognizer.energy_threshold,
+            'samples': self.samples,
+            'skipped': self.skipped,
+            'last_sample_age': None if self.last_sample is None else time.time() - self.last_sample
+        }
+
+
+if __name__ == '__main__':
+    import speech_recognition as sr
+
+    calibrator = AmbientCalibrator(sr.Recognizer(), sr.Microphone(), interval=1.0).start()
+    try:
+        while True:
+            time.sleep(2)
+            stats = calibrator.stats()
+            if stats['noise_floor'] is not None:
+                print(f"noise floor {stats['noise_floor']:7.1f}  threshold {stats['energy_threshold']:7.1f}")
+    except KeyboardInterrupt:
+        calibrator.stop()
@@ -0,0 +1,261 @@
+"""
+Bulk templated email sending through AWS SES.
+
+Instead of building a new SES client and an f-string body for every recipient
+and calling `send_email` once per person, the dispatcher registers an SES
+template once and sends with `send_bulk_templated_email`, up to 50
+destinations per call. Sends are paced by a token bucket sized to the
+account's maximum send rate. Throttled calls are retried with jittered
+exponential backoff, and destinations that still fail are appended to a
+dead-letter file.
+
+Callers `submit` a recipient and return immediately; a background thread
+flushes a batch when it is full or when the oldest queued message has waited
+`max_wait` seconds. An optional `on_done(sent)` callback per recipient reports
+whether its message was accepted by SES or dead-lettered.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+import boto3
+from botocore.exceptions import ClientError
+
+# send_bulk_templated_email accepts at most 50 destinations per call
+MAX_DESTINATIONS_PER_CALL = 50
+
+DEAD_LETTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "email_dead_letter.jsonl")
+
+# Error codes worth retrying; anything else goes straight to the dead-letter file
+RETRYABLE_ERRORS = {'Throttling', 'ThrottlingException', 'TooManyRequestsException',
+                    'ServiceUnavailable', 'InternalFailure', 'RequestTimeout'}
+
+# Per-destination statuses in a send_bulk_templated_email response that are worth retrying
+RETRYABLE_STATUSES = {'TransientFailure', 'AccountThrottled'}
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Maximum tokens held; defaults to one second's worth
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Block until `tokens` tokens are available and take them.
+
+        Requests larger than the capacity wait for a full bucket and leave it in
+        debt, so the following request waits for the excess to refill.
+        """
+        needed = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class NotificationDispatcher:
+    def __init__(self, template, sender, ses_client=None, region="ap-south-1", send_rate=None,
+                 max_batch=MAX_DESTINATIONS_PER_CALL, max_wait=2.0, max_retries=5,
+                 dead_letter_path=DEAD_LETTER_PATH):
+        """
+        :param template: SES template dict with TemplateName, SubjectPart, HtmlPart and/or TextPart
+        :param sender: Source address, e.g. "Aurora <meganth.mail@gmail.com>"
+        :param ses_client: boto3 SES client; one is created for `region` if omitted
+        :param send_rate: Messages per second; read from the account's send quota if omitted
+        :param max_batch: Destinations per bulk call (at most 50)
+        :param max_wait: Seconds a queued message may wait for its batch to fill
+        :param max_retries: Retries for throttled or transient failures
+        :param dead_letter_path: File that undeliverable messages are appended to
+        """
+        self.template = template
+        self.template_name = template['TemplateName']
+        self.sender = sender
+        self.ses_client = ses_client or boto3.client("ses", region_name=region)
+        self.max_batch = min(max_batch, MAX_DESTINATIONS_PER_CALL)
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.dead_letter_path = dead_letter_path
+
+        self.bucket = TokenBucket(send_rate or self.account_send_rate())
+        self.register_template()
+
+        self.pending = []
+        self.oldest = None
+        self.condition = threading.Condition()
+        self.closed = False
+
+        self.sent = 0
+        self.failed = 0
+        self.started = None
+        self.finished = None
+
+        self.thread = threading.Thread(target=self.run, name=f"email-{self.template_name}", daemon=True)
+        self.thread.start()
+
+    def account_send_rate(self):
+        """Maximum messages per second allowed for the account (1 in the SES sandbox)."""
+        try:
+            return float(self.ses_client.get_send_quota()['MaxSendRate'])
+        except Exception as e:
+            print(f"Could not read SES send quota, assuming 1 message/s: {e}")
+            return 1.0
+
+    def register_template(self):
+        """Create the SES template, or update it if it already exists."""
+        try:
+            self.ses_client.create_template(Template=self.template)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'AlreadyExists':
+                raise
+            self.ses_client.update_template(Template=self.template)
+
+    def submit(self, recipient_email, data=None, on_done=None):
+        """
+        Queue one templated email; `data` fills the template's {{placeholders}}.
+
+        :param on_done: Called on the dispatcher thread with True once SES accepted
+                        the message, or False once it was dead-lettered
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Dispatcher is closed")
+            if not self.pending:
+                self.oldest = time.monotonic()
+            self.pending.append((recipient_email, data or {}, on_done))
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.closed and (
+                        not self.pending or
+                        (len(self.pending) < self.max_batch and
+                         time.monotonic() - self.oldest < self.max_wait)):
+                    timeout = None if not self.pending else self.max_wait - (time.monotonic() - self.oldest)
+                    self.condition.wait(timeout)
+                if not self.pending and self.closed:
+                    return
+                batch = self.pending[:self.max_batch]
+                self.pending = self.pending[self.max_batch:]
+                self.oldest = time.monotonic() if self.pending else None
+            self.send_batch(batch)
+
+    def send_batch(self, batch):
+        if self.started is None:
+            self.started = time.monotonic()
+
+        attempt = 0
+        while batch:
+            self.bucket.acquire(len(batch))
+            try:
+                response = self.ses_client.send_bulk_templated_email(
+                    Source=self.sender,
+                    Template=self.template_name,
+                    DefaultTemplateData='{}',
+                    Destinations=[{
+                        'Destination': {'ToAddresses': [email]},
+                        'ReplacementTemplateData': json.dumps(data),
+                    } for email, data, _ in batch],
+                )
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code in RETRYABLE_ERRORS and attempt < self.max_retries:
+                    attempt += 1
+                    self.backoff(attempt)
+                    continue
+                self.dead_letter(batch, code, e.response['Error'].get('Message', ''))
+                break
+            except Exception as e:
+                self.dead_letter(batch, type(e).__name__, str(e))
+                break
+
+            retry = []
+            statuses = response.get('Status', [])
+            for message, status in zip(batch, statuses):
+                if status.get('Status') == 'Success':
+                    self.sent += 1
+                    self.done(message, True)
+                elif status.get('Status') in RETRYABLE_STATUSES and attempt < self.max_retries:
+                    retry.append(message)
+                else:
+                    self.dead_letter([message], status.get('Status'), status.get('Error', ''))
+            if len(statuses) < len(batch):
+                # Their outcome is unknown; resending could deliver them twice
+                self.dead_letter(batch[len(statuses):], 'MissingStatus',
+                                 f"SES returned {len(statuses)} statuses for {len(batch)} destinations")
+
+            batch = retry
+            if batch:
+                attempt += 1
+                self.backoff(attempt)
+
+        self.finished = time.monotonic()
+
+    def backoff(self, attempt, base=0.5, cap=20.0):
+        """Sleep with full jitter: uniform(0, min(cap, base * 2**attempt))."""
+        time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+    def dead_letter(self, batch, code, message):
+        self.failed += len(batch)
+        print(f"Failed to send {len(batch)} email(s) ({code}): {message}")
+        try:
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                for email, data, _ in batch:
+                    f.write(json.dumps({
+                        'template': self.template_name,
+                        'recipient': email,
+                        'data': data,
+                        'error': code,
+                        'message': message,
+                        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+                    }) + '\n')
+        except OSError as e:
+            # The callbacks below must still run, or callers waiting on them never finish
+            print(f"Could not write the dead-letter file: {e}")
+        for failed in batch:
+            self.done(failed, False)
+
+    def done(self, message, sent):
+        on_done = message[2]
+        if on_done is not None:
+            try:
+                on_done(sent)
+            except Exception as e:
+                print(f"Error in email callback for {message[0]}: {e}")
+
+    def close(self):
+        """Send everything still queued and stop the background thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def stats(self):
+        elapsed = (self.finished or time.monotonic()) - self.started if self.started else 0.0
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'queued': len(self.pending),
+            'messages_per_second': self.sent / elapsed if elapsed else 0.0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(f"Emails sent: {stats['sent']}, failed: {stats['failed']}, queued: {stats['queued']}, "
+              f"{stats['messages_per_second']:.1f} messages/s")
@@ -0,0 +1,237 @@
+"""
+PDF text extraction that runs outside the Flask worker.
+
+Parsing a resume with PyPDF2 is CPU-bound, so `thinking_app` hands the upload
+to a process pool instead of parsing inline. Page texts are collected in a
+list and joined once. Long documents are split into page ranges that are
+extracted in parallel, and extraction stops early once enough text for
+keyword matching has been found. Uploads larger than `SPOOL_THRESHOLD` are
+streamed to a temporary file instead of being buffered in memory.
+
+This module is kept free of Flask and boto3 imports so pool workers start
+quickly.
+
+Run this file to benchmark extraction throughput in pages per second:
+    python pdf_extract.py [resume.pdf] [--pages 200]
+"""
+
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from io import BytesIO
+
+import PyPDF2
+
+PDF_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Uploads above this size are spooled to disk rather than held in memory
+SPOOL_THRESHOLD = 2 * 1024 * 1024
+
+# Documents with more pages than this are extracted in parallel page ranges
+PARALLEL_MIN_PAGES = 16
+PAGES_PER_CHUNK = 8
+
+# Characters of text that are plenty for keyword matching; None reads every page
+EARLY_STOP_CHARS = 100000
+
+_executor = None
+
+
+def get_executor():
+    """Process pool shared by all requests, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _executor
+
+
+def open_reader(source):
+    """PdfReader for a file path or the raw bytes of a PDF."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return PyPDF2.PdfReader(BytesIO(source))
+    return PyPDF2.PdfReader(source)
+
+
+def extract_page_range(source, start, stop, max_chars=None):
+    """Extract the text of pages [start, stop) and return it as a list of page texts"""
+    reader = open_reader(source)
+    texts = []
+    total = 0
+    for index in range(start, min(stop, len(reader.pages))):
+        text = reader.pages[index].extract_text() or ""
+        texts.append(text)
+        total += len(text)
+        if max_chars is not None and total >= max_chars:
+            break
+    return texts
+
+
+def extract_text_from_pdf_bytes(data, max_chars=EARLY_STOP_CHARS):
+    """Extract text from the bytes of a PDF file"""
+    try:
+        return "".join(extract_page_range(data, 0, float('inf'), max_chars))
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
+
+
+def extract_text_async(data):
+    """Submit extraction of in-memory PDF bytes to the process pool and return a Future for the text."""
+    return get_executor().submit(extract_text_from_pdf_bytes, data)
+
+
+def extract_text(source, max_chars=EARLY_STOP_CHARS):
+    """
+    Extract the text of a PDF given as a file path or bytes.
+
+    Short documents are parsed by a single pool worker. Long documents on disk
+    are split into page ranges that pool workers parse in parallel. At most
+    one range per pool worker is in flight, and a new one is submitted as each
+    is consumed in order, so nothing more is read once `max_chars` characters
+    have been collected. Ranges still in flight are then finished before this
+    returns, because the caller deletes the file straight afterwards.
+    """
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return get_executor().submit(extract_text_from_pdf_bytes, bytes(source), max_chars).result()
+
+        page_count = len(open_reader(source).pages)
+        executor = get_executor()
+        if page_count <= PARALLEL_MIN_PAGES:
+            texts = executor.submit(extract_page_range, source, 0, page_count, max_chars).result()
+            return "".join(texts)
+
+        starts = iter(range(0, page_count, PAGES_PER_CHUNK))
+        in_flight = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                in_flight.append(executor.submit(extract_page_range, source, start, start + PAGES_PER_CHUNK))
+
+        for _ in range(PDF_WORKERS):
+            submit_next()
+        texts = []
+        total = 0
+        try:
+            while in_flight:
+                chunk = in_flight.popleft().result()
+                texts.extend(chunk)
+                total += sum(len(text) for text in chunk)
+                if max_chars is not None and total >= max_chars:
+                    break
+                submit_next()
+        finally:
+            # Ranges queued behind other requests are dropped; those already reading the file finish first
+            for future in in_flight:
+                future.cancel()
+            wait(in_flight)
+        return "".join(texts)
+    except Exception as e:
+        return f"Error reading PDF: {str(e)}"
+
+
+def spool_upload(stream, threshold=SPOOL_THRESHOLD, chunk_size=64 * 1024, hasher=None):
+    """
+    Read an upload stream without holding large files in memory.
+
+    :param hasher: Optional hashlib object updated with every chunk read
+    :return: (data, path). Uploads up to `threshold` bytes are returned as
+             `data`; larger ones are written to a temporary file whose `path`
+             the caller must delete.
+    """
+    buffer = BytesIO()
+    while buffer.tell() <= threshold:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return buffer.getvalue(), None
+        if hasher is not None:
+            hasher.update(chunk)
+        buffer.write(chunk)
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(buffer.getbuffer())
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            if hasher is not None:
+                hasher.update(chunk)
+            f.write(chunk)
+        return None, f.name
+
+
+def make_test_pdf(path, pages, lines_per_page=45):
+    """Write a simple text-only PDF, used by the benchmark when no file is given."""
+    words = ("python aws docker kubernetes react sql machine learning built designed "
+             "deployed pipeline team project microservices api").split()
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        lines = []
+        for i in range(lines_per_page):
+            text = " ".join(words[(p + i + j) % len(words)] for j in range(12))
+            lines.append(f"({text}) Tj T*")
+        content = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(lines) + " ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    with open(path, "wb") as f:
+        f.write(out.getvalue())
+
+
+def concat_extract(source):
+    """The previous approach: `text += page.extract_text()` on one core, kept for benchmarking."""
+    text = ""
+    for page in open_reader(source).pages:
+        text += page.extract_text()
+    return text
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction")
+    parser.add_argument("pdf", nargs="?", help="PDF to extract; a synthetic one is generated if omitted")
+    parser.add_argument("--pages", type=int, default=200, help="Pages in the synthetic PDF")
+    args = parser.parse_args()
+
+    path = args.pdf
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), f"aurora_bench_{args.pages}.pdf")
+        make_test_pdf(path, args.pages)
+    page_count = len(open_reader(path).pages)
+
+    start = time.perf_counter()
+    concat_extract(path)
+    serial = time.perf_counter() - start
+
+    get_executor().submit(int).result()  # start the pool before timing
+    start = time.perf_counter()
+    extract_text(path, max_chars=None)
+    parallel = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extract_text(path)
+    early = time.perf_counter() - start
+
+    print(f"{page_count} pages, {PDF_WORKERS} workers")
+    print(f"  serial += extraction:   {page_count / serial:.1f} pages/s")
+    print(f"  page-parallel:          {page_count / parallel:.1f} pages/s")
+    print(f"  with early stop:        {early * 1000:.0f} ms for the first {EARLY_STOP_CHARS} characters")
@@ -0,0 +1,152 @@
+"""
+Frame-difference gate in front of pyzbar QR decoding.
+
+An idle kiosk camera keeps delivering frames of an empty or static scene, and
+running a full `pyzbar.decode` on each of them burns CPU for nothing. The gate
+looks at a strided, downsampled grayscale copy of each frame and only lets a
+full decode through when the scene changed or a new high-contrast,
+finder-pattern-like region appeared. Once a code has been decoded, only its
+region of interest is decoded on following frames until it is lost. Every
+`full_every` decodes the whole frame is decoded anyway, so a second code
+appearing elsewhere is picked up while the first is still being tracked.
+"""
+
+import numpy as np
+from pyzbar import pyzbar
+from pyzbar.locations import Point, Rect
+
+
+class QRScanGate:
+    def __init__(self, step=8, motion_threshold=3.0, edge_threshold=40,
+                 candidate_density=0.25, block=6, roi_margin=0.25, max_skip=30, full_every=10):
+        """
+        :param step: Pixel stride used to downsample frames for the gate
+        :param motion_threshold: Mean absolute grey-level change that counts as motion
+        :param edge_threshold: Grey-level jump between neighbouring samples that counts as an edge
+        :param candidate_density: Edge density a block needs to look like a finder pattern
+        :param block: Size (in downsampled pixels) of the blocks scanned for candidates
+        :param roi_margin: Fraction of the code size added around a tracked ROI
+        :param max_skip: Force a full decode after this many gated frames (0 disables)
+        :param full_every: Decode the full frame every this many decodes while an ROI is tracked
+        """
+        self.step = step
+        self.motion_threshold = motion_threshold
+        self.edge_threshold = edge_threshold
+        self.candidate_density = candidate_density
+        self.block = block
+        self.roi_margin = roi_margin
+        self.max_skip = max_skip
+        self.full_every = full_every
+
+        self.previous = None
+        self.had_candidate = False
+        self.roi = None
+        self.skipped = 0
+        self.roi_streak = 0
+
+        # Counters so the kiosk can report how much work the gate saved
+        self.frames = 0
+        self.gated = 0
+        self.full_decodes = 0
+        self.roi_decodes = 0
+
+    def reset(self):
+        """Forget the previous frame and any tracked ROI."""
+        self.previous = None
+        self.had_candidate = False
+        self.roi = None
+        self.skipped = 0
+        self.roi_streak = 0
+
+    def downsample(self, frame):
+        """Strided grayscale thumbnail of a BGR or grayscale frame."""
+        small = frame[::self.step, ::self.step]
+        if small.ndim == 3:
+            small = small.mean(axis=2)
+        return small.astype(np.float32)
+
+    def has_candidate(self, small):
+        """True if some block is dense in strong edges, as a QR finder pattern is."""
+        edges = np.zeros(small.shape, dtype=bool)
+        edges[:, 1:] |= np.abs(np.diff(small, axis=1)) > self.edge_threshold
+        edges[1:, :] |= np.abs(np.diff(small, axis=0)) > self.edge_threshold
+
+        b = self.block
+        h, w = (edges.shape[0] // b) * b, (edges.shape[1] // b) * b
+        if h == 0 or w == 0:
+            return False
+        density = edges[:h, :w].reshape(h // b, b, w // b, b).mean(axis=(1, 3))
+        return bool((density >= self.candidate_density).any())
+
+    def should_decode(self, frame):
+        """Decide whether the frame is worth a full decode."""
+        small = self.downsample(frame)
+        previous, self.previous = self.previous, small
+
+        candidate = self.has_candidate(small)
+        appeared = candidate and not self.had_candidate
+        self.had_candidate = candidate
+
+        if previous is None or previous.shape != small.shape or appeared:
+            return True
+        if float(np.abs(small - previous).mean()) >= self.motion_threshold:
+            return True
+        if self.max_skip and candidate and self.skipped >= self.max_skip:
+            # A code held very still never triggers the motion check
+            return True
+        return False
+
+    def decode_roi(self, frame):
+        """Decode only the tracked ROI and map the results back to frame coordinates."""
+        x, y, w, h = self.roi
+        mx, my = int(w * self.roi_margin), int(h * self.roi_margin)
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        x1, y1 = min(frame.shape[1], x + w + mx), min(frame.shape[0], y + h + my)
+
+        results = []
+        for qr_code in pyzbar.decode(frame[y0:y1, x0:x1]):
+            rx, ry, rw, rh = qr_code.rect
+            results.append(qr_code._replace(
+                rect=Rect(rx + x0, ry + y0, rw, rh),
+                polygon=[Point(px + x0, py + y0) for px, py in qr_code.polygon],
+            ))
+        return results
+
+    def decode(self, frame):
+        """
+        Drop-in replacement for `pyzbar.decode(frame)`.
+
+        Returns an empty list for frames the gate skipped.
+        """
+        self.frames += 1
+        if not self.should_decode(frame):
+            self.skipped += 1
+            self.gated += 1
+            return []
+        self.skipped = 0
+
+        if self.roi is not None and self.roi_streak < self.full_every - 1:
+            self.roi_streak += 1
+            self.roi_decodes += 1
+            results = self.decode_roi(frame)
+            if results:
+                self.roi = tuple(results[0].rect)
+                return results
+            # Code left the ROI; look at the whole frame again
+            self.roi = None
+
+        # Also reached every full_every decodes while tracking, to find codes outside the ROI
+        self.roi_streak = 0
+        self.full_decodes += 1
+        results = pyzbar.decode(frame)
+        self.roi = tuple(results[0].rect) if results else None
+        return results
+
+    def stats(self):
+        """Frames seen and how many of them reached each decode path."""
+        return {
+            'frames': self.frames,
+            'full_decodes': self.full_decodes,
+            'roi_decodes': self.roi_decodes,
+            'skipped': self.gated,
+        }
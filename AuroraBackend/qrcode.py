@@ -1,23 +1,30 @@
 import cv2
-from pyzbar import pyzbar
+from qr_gate import QRScanGate
 from pymongo import MongoClient
 
-# MongoDB setup
-try:
-    client = MongoClient('mongodb://localhost:27017/')  # replace with your MongoDB connection string if different
-    db = client['AttendanceDB']
-    collection = db['Nephele']
-    print("Connected to MongoDB successfully.")
-except Exception as e:
-    print(f"Error connecting to MongoDB: {e}")
-    exit()
+# MongoDB collection; connected by main() so the check-in mode (and its worker processes) never opens it
+collection = None
+
+def connect_mongo():
+    global collection
+    try:
+        client = MongoClient('mongodb://localhost:27017/')  # replace with your MongoDB connection string if different
+        db = client['AttendanceDB']
+        collection = db['Nephele']
+        print("Connected to MongoDB successfully.")
+    except Exception as e:
+        print(f"Error connecting to MongoDB: {e}")
+        exit()
 
 # Dictionary to store QR code data and their "present" status
 qr_code_status = {}
 
+# Skips pyzbar on frames where nothing changed in front of the camera
+qr_gate = QRScanGate()
+
 def decode_qr(frame):
     # Find QR codes in the frame
-    qr_codes = pyzbar.decode(frame)
+    qr_codes = qr_gate.decode(frame)
     
     # List to store decoded QR code data
     qr_data_list = []
@@ -51,6 +58,8 @@ def decode_qr(frame):
     return frame, qr_data_list
 
 def main():
+    connect_mongo()
+
     # Initialize the video stream
     cap = cv2.VideoCapture(0)
 
@@ -85,5 +94,10 @@ def main():
     cv2.destroyAllWindows()
 
 if __name__ == '__main__':
-    main()
-    
\ No newline at end of file
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == 'checkin':
+        # Multi-camera check-in mode, e.g. `python qrcode.py checkin 0 1 entrance.mp4`
+        from checkin_station import run_station
+        run_station(sys.argv[2:] or ['0'])
+    else:
+        main()
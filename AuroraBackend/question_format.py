@@ -0,0 +1,129 @@
+"""
+Structured interview-question generation for thinking_app.
+
+Bedrock used to be asked for a free-form numbered list. The reply was split
+into lines and matched with a regex, and any shortfall was padded with generic
+questions without a word. Now the model is asked for a JSON object with
+exactly the keys q1..q5:
+
+    {
+      "q1": "How would you ...?",
+      ...
+      "q5": "..."
+    }
+
+The assistant turn is prefilled with the opening `{` and `"q1": "`, so the
+reply starts straight away with the first question, with no preamble. Two stop
+sequences end generation right after question 5:
+
+- "\\n}" is the object's closing line. It cannot occur inside a JSON string,
+  where newlines must be escaped.
+- "\\"q6\\"" catches a model about to write a sixth question.
+
+`QuestionStream` picks each question out of the streamed text the moment its
+closing quote arrives, so questions still reach the page one at a time. Every
+question is checked against a precompiled JSON schema. Output cut short by the
+stop sequence or the token limit is repaired from whatever complete pairs it
+contains, instead of calling the model again.
+"""
+
+import json
+import re
+
+from jsonschema import Draft202012Validator
+
+QUESTION_COUNT = 5
+
+# Start of the assistant's reply, sent as a prefill so the model continues inside question 1
+PREFILL = '{\n  "q1": "'
+
+STOP_SEQUENCES = ['\n}', f'"q{QUESTION_COUNT + 1}"']
+
+QUESTION_SCHEMA = {"type": "string", "minLength": 15, "maxLength": 600}
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {f"q{n}": QUESTION_SCHEMA for n in range(1, QUESTION_COUNT + 1)},
+    "required": [f"q{n}" for n in range(1, QUESTION_COUNT + 1)],
+    "additionalProperties": False,
+}
+
+# Compiled once; validating a question is then a plain function call
+QUESTION_VALIDATOR = Draft202012Validator(QUESTION_SCHEMA)
+QUESTIONS_VALIDATOR = Draft202012Validator(QUESTIONS_SCHEMA)
+
+# One complete "qN": "..." pair; only matches once the value's closing quote has arrived
+PAIR = re.compile(r'"q([1-9])"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def format_instructions():
+    """The output-format part of the generation prompt"""
+    keys = ", ".join(f'"q{n}"' for n in range(1, QUESTION_COUNT + 1))
+    return (f"Respond with only a JSON object with exactly the keys {keys}, in that order, each mapped to "
+            "one question as a single-line string. Do not number the questions and add no other text.")
+
+
+class QuestionStream:
+    """Incrementally extracts validated questions from a streamed reply."""
+
+    def __init__(self, prefill=PREFILL):
+        self.text = prefill
+        self.position = 0
+        self.questions = {}
+        self.rejected = 0
+
+    def feed(self, delta):
+        """Add streamed text; returns the (number, question) pairs completed by it."""
+        self.text += delta
+        if '"' not in delta:
+            return []
+        completed = []
+        while True:
+            match = PAIR.search(self.text, self.position)
+            if match is None:
+                return completed
+            self.position = match.end()
+            number = int(match.group(1))
+            question = self.accept(number, match.group(2))
+            if question is not None:
+                completed.append((number, question))
+
+    def accept(self, number, raw):
+        if number > QUESTION_COUNT or number in self.questions:
+            return None
+        try:
+            question = " ".join(json.loads(f'"{raw}"').split())
+        except ValueError:
+            question = None
+        if question is None or not QUESTION_VALIDATOR.is_valid(question):
+            self.rejected += 1
+            return None
+        self.questions[number] = question
+        return question
+
+    @property
+    def complete(self):
+        return len(self.questions) >= QUESTION_COUNT
+
+    def result(self):
+        """
+        The questions parsed so far, in order, as a repaired JSON object.
+
+        Used after the stream ends, whether it stopped normally, at a stop
+        sequence or at the token limit.
+        """
+        repaired = {f"q{n}": self.questions[n] for n in sorted(self.questions)}
+        errors = [error.message for error in QUESTIONS_VALIDATOR.iter_errors(repaired)]
+        return repaired, errors
+
+
+def parse_reply(text, prefill=PREFILL):
+    """Parse a complete (or truncated) reply in one go; returns (questions by key, schema errors)."""
+    stream = QuestionStream(prefill)
+    stream.feed(text)
+    return stream.result()
+
+
+def numbered(number, question):
+    """Display form used throughout the app, e.g. '1. How would you ...?'"""
+    return f"{number}. {question}"
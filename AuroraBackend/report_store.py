@@ -0,0 +1,192 @@
+"""
+SQLite-backed store for interview analysis reports.
+
+`InterviewAnalyzer.save_detailed_report` used to write every report as a
+pretty-printed `interview_analysis_<session>_<timestamp>.json` file in the
+current directory. Nothing indexed those files, so finding one report, or
+counting hiring decisions, meant opening and parsing all of them.
+
+Reports are now appended to one SQLite database. Each report body is compact
+JSON compressed with zlib (the codec behind gzip) and kept in its own row. The
+fields worth querying (session, dates, hiring decision, question counts) are
+columns next to it. Listing and aggregates such as the hiring-decision
+distribution are indexed queries that never decompress a body, and fetching
+one report decompresses only that row. Existing JSON reports are imported by
+`migrate`.
+
+Run this file to import old reports and print the decision distribution:
+    python report_store.py migrate [folder ...]
+    python report_store.py stats
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+from session_store import _Transaction
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.path.join(os.environ.get("AURORA_DATA_DIR", BASE_DIR), "reports.db")
+
+# zlib level for report bodies; 6 is gzip's default
+COMPRESSION_LEVEL = 6
+
+# Page size for list_reports when none is given
+DEFAULT_PAGE_SIZE = 50
+
+# Filenames save_detailed_report used for JSON reports
+LEGACY_PATTERN = "interview_analysis_*.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    session_id TEXT NOT NULL,
+    session_timestamp TEXT,
+    analysis_date TEXT NOT NULL,
+    hiring_decision TEXT NOT NULL,
+    total_questions INTEGER NOT NULL,
+    questions_answered INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_analysis_date ON reports (analysis_date);
+CREATE INDEX IF NOT EXISTS idx_reports_session ON reports (session_id, analysis_date);
+CREATE INDEX IF NOT EXISTS idx_reports_decision ON reports (hiring_decision, analysis_date);
+"""
+
+# Columns returned by list_reports; everything except the body
+SUMMARY_COLUMNS = ('id', 'name', 'session_id', 'session_timestamp', 'analysis_date', 'hiring_decision',
+                   'total_questions', 'questions_answered')
+
+
+class ReportStore:
+    def __init__(self, path=STORE_PATH):
+        """
+        :param path: SQLite database file
+        """
+        self.path = path
+        self.local = threading.local()
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def connection(self):
+        """One connection per thread; WAL lets them read while another writes."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def add(self, report, name):
+        """
+        Append a report in the save_detailed_report layout and return its id.
+
+        A report with the same name is left as it is, so importing twice is harmless.
+        """
+        return self.insert(self.connection(), report, name)
+
+    def insert(self, conn, report, name):
+        raw = json.dumps(report, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        session_info = report.get('session_info', {})
+        summary = report.get('summary', {})
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO reports (name, session_id, session_timestamp, analysis_date, hiring_decision, "
+            "total_questions, questions_answered, raw_size, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, session_info.get('session_id', 'N/A'), session_info.get('timestamp'),
+             session_info.get('analysis_date', ''), report.get('hiring_decision', 'UNKNOWN'),
+             summary.get('total_questions', len(report.get('individual_question_analyses', []))),
+             summary.get('questions_answered', 0), len(raw), zlib.compress(raw, COMPRESSION_LEVEL)))
+        if cursor.rowcount:
+            return cursor.lastrowid
+        return conn.execute("SELECT id FROM reports WHERE name = ?", (name,)).fetchone()[0]
+
+    def get(self, report_id):
+        """Return one report, or None; only its own row is read and decompressed."""
+        row = self.connection().execute("SELECT body FROM reports WHERE id = ?", (report_id,)).fetchone()
+        return None if row is None else json.loads(zlib.decompress(row[0]))
+
+    def get_by_name(self, name):
+        row = self.connection().execute("SELECT body FROM reports WHERE name = ?", (name,)).fetchone()
+        return None if row is None else json.loads(zlib.decompress(row[0]))
+
+    def list_reports(self, limit=None, offset=0, session_id=None, decision=None, since=None, until=None):
+        """
+        Report summaries, newest first, without reading any report body.
+
+        :param decision: Only reports with this hiring decision
+        :param since: Only reports analysed at or after this 'YYYY-MM-DD HH:MM:SS' date
+        :param until: Only reports analysed before this date
+        """
+        where, params = self.filters(session_id, decision, since, until)
+        params += [DEFAULT_PAGE_SIZE if limit is None else limit, offset]
+        rows = self.connection().execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM reports{where} "
+            "ORDER BY analysis_date DESC, id DESC LIMIT ? OFFSET ?", params).fetchall()
+        return [dict(zip(SUMMARY_COLUMNS, row)) for row in rows]
+
+    def decision_counts(self, session_id=None, since=None, until=None):
+        """Number of reports per hiring decision, e.g. {'HIRE': 3, 'DO NOT HIRE': 5}"""
+        where, params = self.filters(session_id, None, since, until)
+        rows = self.connection().execute(
+            f"SELECT hiring_decision, COUNT(*) FROM reports{where} GROUP BY hiring_decision "
+            "ORDER BY COUNT(*) DESC", params).fetchall()
+        return dict(rows)
+
+    def filters(self, session_id, decision, since, until):
+        clauses, params = [], []
+        for clause, value in (("session_id = ?", session_id), ("hiring_decision = ?", decision),
+                              ("analysis_date >= ?", since), ("analysis_date < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def stats(self):
+        count, raw, stored = self.connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM reports").fetchone()
+        return {'reports': count, 'raw_bytes': raw, 'stored_bytes': stored}
+
+    def migrate(self, folders, remove=False):
+        """
+        Import interview_analysis_*.json reports from `folders`.
+
+        :param remove: Delete each file once its report is stored
+        :return: Number of files newly imported
+        """
+        paths = sorted({os.path.abspath(path) for folder in folders
+                        for path in glob.glob(os.path.join(folder, LEGACY_PATTERN))})
+        stored = {row[0] for row in self.connection().execute("SELECT name FROM reports")} if paths else set()
+        imported = 0
+        for path in paths:
+            # Already imported on an earlier start; the file was kept because remove was off
+            if os.path.basename(path) in stored:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable report {path}: {e}")
+                continue
+            with _Transaction(self.connection()) as conn:
+                self.insert(conn, report, os.path.basename(path))
+            imported += 1
+            if remove:
+                os.remove(path)
+        if imported:
+            print(f"Imported {imported} JSON report(s) into {self.path}")
+        return imported
+
+
+if __name__ == '__main__':
+    import sys
+
+    store = ReportStore()
+    if len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        store.migrate(sys.argv[2:] or [os.getcwd(), BASE_DIR])
+    print(json.dumps({'stats': store.stats(), 'decisions': store.decision_counts()}, indent=2))
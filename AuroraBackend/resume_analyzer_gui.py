@@ -1,42 +1,22 @@
-import re
 import tkinter as tk
 from tkinter import filedialog, messagebox
+from keyword_engine import KeywordMatcher
+from resume_keywords import DOMAIN_KEYWORDS
 
-def analyze_resume(text):
-    # Define the keywords for scoring across various domains
-    keywords = {
-        'fullstack': ['JavaScript', 'Node.js', 'React', 'HTML', 'CSS', 'API', 'MongoDB', 'SQL', 'Angular', 'Vue.js'],
-        'cloud': ['AWS', 'Azure', 'GCP', 'DevOps', 'CI/CD', 'Kubernetes', 'Docker', 'Terraform', 'CloudFormation', 'EC2'],
-        'machine learning': ['Python', 'TensorFlow', 'PyTorch', 'Data Science', 'AI', 'Machine Learning', 'NLP', 'Keras', 'Scikit-learn'],
-        'data science': ['Pandas', 'NumPy', 'R', 'Statistics', 'SQL', 'Tableau', 'Power BI', 'Data Analysis', 'Big Data'],
-        'cybersecurity': ['Firewall', 'IDS', 'IPS', 'SIEM', 'Penetration Testing', 'Malware', 'Encryption', 'Network Security', 'Cyber Threats'],
-        'networking': ['Cisco', 'Routing', 'Switching', 'TCP/IP', 'DNS', 'DHCP', 'VPN', 'LAN', 'WAN', 'Network Protocols'],
-        'software development': ['Java', 'C++', 'Python', 'Agile', 'Scrum', 'SDLC', 'Version Control', 'Git', 'CI/CD'],
-        'database management': ['SQL', 'NoSQL', 'MongoDB', 'MySQL', 'Oracle', 'Database Design', 'Normalization', 'PostgreSQL', 'DBA'],
-        'project management': ['Project Planning', 'Agile', 'Scrum', 'Risk Management', 'MS Project', 'JIRA', 'Stakeholder Management'],
-        'UI/UX design': ['Figma', 'Sketch', 'Adobe XD', 'Wireframing', 'Prototyping', 'User Research', 'Design Thinking', 'UI Design', 'UX Design'],
-        'business analysis': ['Business Requirements', 'Process Mapping', 'UML', 'Stakeholder Engagement', 'Data Modeling', 'SWOT Analysis'],
-        'finance': ['Financial Analysis', 'Excel', 'Budgeting', 'Forecasting', 'Financial Modeling', 'Investment', 'Risk Management', 'Accounting'],
-        'marketing': ['SEO', 'Content Marketing', 'Google Analytics', 'Social Media', 'Email Marketing', 'PPC', 'Branding', 'Market Research'],
-        'human resources': ['Recruitment', 'Employee Relations', 'Onboarding', 'HRIS', 'Performance Management', 'Talent Management'],
-        'sales': ['Lead Generation', 'Salesforce', 'CRM', 'Negotiation', 'Customer Relations', 'Sales Strategy', 'B2B Sales'],
-        'operations management': ['Supply Chain', 'Logistics', 'Inventory Management', 'Process Improvement', 'Lean Manufacturing', 'Six Sigma'],
-        'legal': ['Contract Law', 'Litigation', 'Legal Research', 'Compliance', 'Intellectual Property', 'Corporate Law', 'Legal Writing'],
-        'healthcare': ['Patient Care', 'EMR', 'HIPAA', 'Clinical Research', 'Medical Coding', 'Healthcare Management', 'Pharmaceuticals'],
-        'education': ['Curriculum Design', 'Instructional Design', 'E-learning', 'Classroom Management', 'Educational Technology', 'Assessment'],
-        'architecture': ['AutoCAD', 'Blueprints', 'Construction Management', '3D Modeling', 'Sustainable Design', 'Building Codes', 'LEED'],
-        'engineering': ['Mechanical Engineering', 'Electrical Engineering', 'CAD', 'FEA', 'Manufacturing Processes', 'Product Design', 'Prototyping'],
-    }
+# One precompiled matcher for all domain keywords, built once at startup
+keyword_matcher = KeywordMatcher(DOMAIN_KEYWORDS)
 
+def analyze_resume(text):
     # Initialize the score
     score = 0
     max_score = 100
 
     # Keyword Matching Score
     matched_keywords = []
-    for domain, words in keywords.items():
+    found = {word.lower() for word in keyword_matcher.find(text)}
+    for domain, words in DOMAIN_KEYWORDS.items():
         for word in words:
-            if re.search(r'\b' + word + r'\b', text, re.IGNORECASE):
+            if word.lower() in found:
                 score += 2  # Add 2 points for each relevant keyword found
                 matched_keywords.append(word)
 
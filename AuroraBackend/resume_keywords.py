@@ -0,0 +1,39 @@
+"""
+Keyword lists used to analyze resumes.
+"""
+
+# Predefined technical keywords used by thinking_app
+TECHNICAL_KEYWORDS = {
+    'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'kotlin', 'swift', 'typescript'],
+    'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 'oracle', 'sqlite', 'nosql'],
+    'cloud_platforms': ['aws', 'azure', 'gcp', 'google cloud', 'cloud computing', 'docker', 'kubernetes', 'terraform'],
+    'frameworks': ['django', 'flask', 'react', 'angular', 'vue', 'spring', 'express', 'laravel', 'rails'],
+    'data_science': ['machine learning', 'deep learning', 'data science', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'ai', 'artificial intelligence'],
+    'tools': ['git', 'jenkins', 'jira', 'confluence', 'slack', 'docker', 'linux', 'bash', 'powershell'],
+    'web_technologies': ['html', 'css', 'rest api', 'graphql', 'json', 'xml', 'microservices', 'api']
+}
+
+# Keywords for scoring across various domains, used by resume_analyzer_gui
+DOMAIN_KEYWORDS = {
+    'fullstack': ['JavaScript', 'Node.js', 'React', 'HTML', 'CSS', 'API', 'MongoDB', 'SQL', 'Angular', 'Vue.js'],
+    'cloud': ['AWS', 'Azure', 'GCP', 'DevOps', 'CI/CD', 'Kubernetes', 'Docker', 'Terraform', 'CloudFormation', 'EC2'],
+    'machine learning': ['Python', 'TensorFlow', 'PyTorch', 'Data Science', 'AI', 'Machine Learning', 'NLP', 'Keras', 'Scikit-learn'],
+    'data science': ['Pandas', 'NumPy', 'R', 'Statistics', 'SQL', 'Tableau', 'Power BI', 'Data Analysis', 'Big Data'],
+    'cybersecurity': ['Firewall', 'IDS', 'IPS', 'SIEM', 'Penetration Testing', 'Malware', 'Encryption', 'Network Security', 'Cyber Threats'],
+    'networking': ['Cisco', 'Routing', 'Switching', 'TCP/IP', 'DNS', 'DHCP', 'VPN', 'LAN', 'WAN', 'Network Protocols'],
+    'software development': ['Java', 'C++', 'Python', 'Agile', 'Scrum', 'SDLC', 'Version Control', 'Git', 'CI/CD'],
+    'database management': ['SQL', 'NoSQL', 'MongoDB', 'MySQL', 'Oracle', 'Database Design', 'Normalization', 'PostgreSQL', 'DBA'],
+    'project management': ['Project Planning', 'Agile', 'Scrum', 'Risk Management', 'MS Project', 'JIRA', 'Stakeholder Management'],
+    'UI/UX design': ['Figma', 'Sketch', 'Adobe XD', 'Wireframing', 'Prototyping', 'User Research', 'Design Thinking', 'UI Design', 'UX Design'],
+    'business analysis': ['Business Requirements', 'Process Mapping', 'UML', 'Stakeholder Engagement', 'Data Modeling', 'SWOT Analysis'],
+    'finance': ['Financial Analysis', 'Excel', 'Budgeting', 'Forecasting', 'Financial Modeling', 'Investment', 'Risk Management', 'Accounting'],
+    'marketing': ['SEO', 'Content Marketing', 'Google Analytics', 'Social Media', 'Email Marketing', 'PPC', 'Branding', 'Market Research'],
+    'human resources': ['Recruitment', 'Employee Relations', 'Onboarding', 'HRIS', 'Performance Management', 'Talent Management'],
+    'sales': ['Lead Generation', 'Salesforce', 'CRM', 'Negotiation', 'Customer Relations', 'Sales Strategy', 'B2B Sales'],
+    'operations management': ['Supply Chain', 'Logistics', 'Inventory Management', 'Process Improvement', 'Lean Manufacturing', 'Six Sigma'],
+    'legal': ['Contract Law', 'Litigation', 'Legal Research', 'Compliance', 'Intellectual Property', 'Corporate Law', 'Legal Writing'],
+    'healthcare': ['Patient Care', 'EMR', 'HIPAA', 'Clinical Research', 'Medical Coding', 'Healthcare Management', 'Pharmaceuticals'],
+    'education': ['Curriculum Design', 'Instructional Design', 'E-learning', 'Classroom Management', 'Educational Technology', 'Assessment'],
+    'architecture': ['AutoCAD', 'Blueprints', 'Construction Management', '3D Modeling', 'Sustainable Design', 'Building Codes', 'LEED'],
+    'engineering': ['Mechanical Engineering', 'Electrical Engineering', 'CAD', 'FEA', 'Manufacturing Processes', 'Product Design', 'Prototyping'],
+}
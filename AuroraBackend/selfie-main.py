@@ -1,8 +1,10 @@
-from captureImage import captureImage
-from sendEmail import sendEmail
-from uploadImage import uploadImage
+from captureImage import captureImageBytes, ImageSpool
+from selfie_pipeline import SelfiePipeline
+from sendEmail import selfie_dispatcher
 import cv2
-from pyzbar import pyzbar
+import time
+from qr_gate import QRScanGate
+from ses_identity_cache import IdentityStatusCache
 from pymongo import MongoClient
 import boto3
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
@@ -15,6 +17,10 @@ bucket_name = "selfiebucket11"
 name = ""
 email = ""
 url = ""
+# JPEG quality of the captured selfies
+JPEG_QUALITY = 90
+# Seconds before the same visitor can trigger another selfie
+VISITOR_COOLDOWN = 30
 cameo_path = r"C:\Users\gabri\OneDrive\Desktop\Selfie-Mode\images\Aurora_cartoon.jpg"
 
 # MongoDB setup
@@ -27,6 +33,9 @@ except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
     exit()
 
+# Verification status per email, so scans never wait on an SES round trip
+identity_cache = IdentityStatusCache(ses_client)
+
 def verify_email_identity(recipient_email):
     """Verifies the email address using AWS SES if not verified already."""
     try:
@@ -38,25 +47,36 @@ def verify_email_identity(recipient_email):
         print(f"Error sending email verification: {e}")
 
 def check_email_verification(recipient_email):
-    """Checks if the email is verified and triggers verification if not."""
+    """Checks if the email is verified and triggers verification if not, without waiting on SES."""
+    # An address missing from the roster prefetch is looked up before deciding
+    identity_cache.lookup(recipient_email, lambda status: report_verification(recipient_email, status))
+
+def report_verification(recipient_email, status):
+    if status is None:
+        print(f"Could not get the verification status of {recipient_email}.")
+    elif status == 'Success':
+        print(f"Email {recipient_email} is already verified.")
+    elif status == 'Pending':
+        print(f"Email {recipient_email} is awaiting verification.")
+    else:
+        print(f"Email {recipient_email} is not verified. Sending verification request.")
+        identity_cache.request_verification(recipient_email, verify_email_identity)
+
+def load_roster():
+    """Warms the SES identity cache with every email on the attendee roster."""
     try:
-        # Check if email is verified before proceeding
-        response = ses_client.list_verified_email_addresses()
-        verified_emails = response['VerifiedEmailAddresses']
-        
-        if recipient_email not in verified_emails:
-            print(f"Email {recipient_email} is not verified. Sending verification request.")
-            verify_email_identity(recipient_email)
-        else:
-            print(f"Email {recipient_email} is already verified.")
-    except (NoCredentialsError, PartialCredentialsError) as e:
-        print(f"Credentials error: {e}")
+        emails = collection.distinct('email')
     except Exception as e:
-        print(f"Error checking email verification: {e}")
+        print(f"Error loading roster from MongoDB: {e}")
+        return
+    identity_cache.prefetch(emails)
+
+# Skips pyzbar on frames where nothing changed in front of the camera
+qr_gate = QRScanGate()
 
 def decode_qr(frame):
     """Scans the QR code and returns name and email if valid QR is found."""
-    qr_codes = pyzbar.decode(frame)
+    qr_codes = qr_gate.decode(frame)
 
     for qr_code in qr_codes:
         # Decode the QR code data
@@ -79,14 +99,15 @@ def decode_qr(frame):
     # Return False if no valid QR code is found
     return False, "", "", frame
 
-def main():
-    """Main function to handle the QR scanning, image capture, and email logic."""
+def scan_visitor(recent):
+    """Scans until a valid QR code is found. Returns (name, email), or None if 'q' was pressed."""
     cap = cv2.VideoCapture(0)
 
     if not cap.isOpened():
         print("Error: Could not open video capture.")
-        return
+        return None
 
+    visitor = None
     while True:
         # Capture frame-by-frame
         ret, frame = cap.read()
@@ -97,9 +118,10 @@ def main():
         # Decode QR codes in the frame
         found, name, email, frame = decode_qr(frame)
 
-        # Break the loop if a valid QR code is found
-        if found:
+        # Break the loop if a valid QR code is found, ignoring visitors who were just served
+        if found and time.time() - recent.get(email, 0) > VISITOR_COOLDOWN:
             print("QR code successfully scanned. Stopping the camera.")
+            visitor = (name, email)
             break
 
         # Display the frame
@@ -112,17 +134,41 @@ def main():
     # Release the video capture object and close all OpenCV windows
     cap.release()
     cv2.destroyAllWindows()
+    return visitor
+
+def main():
+    """Main function to handle the QR scanning and image capture; uploads and emails run in the background."""
+    load_roster()
 
-    # Capture the image using the name retrieved from QR
-    path = captureImage(name,cameo_path)
-    
-    # Upload the image and get the URL
-    url = uploadImage(path,bucket_name)
-    
-    # Send email with the captured image and URL
-    sendEmail(name, path, email, url)
+    spool = ImageSpool()
+    # Selfie emails go out in bulk through the SES template
+    dispatcher = selfie_dispatcher()
+    pipeline = SelfiePipeline(bucket_name, spool=spool, dispatcher=dispatcher)
+    recent = {}
+
+    try:
+        while True:
+            visitor = scan_visitor(recent)
+            if visitor is None:
+                break
+            name, email = visitor
+            recent[email] = time.time()
+
+            # Capture the image in memory; the spool keeps a bounded on-disk copy for crash recovery
+            image = captureImageBytes(cameo_path, quality=JPEG_QUALITY)
+            if image is None:
+                continue
+            path = spool.write(f"{name}_{int(recent[email])}.jpg", image)
+
+            # Upload and email happen on the pipeline's worker threads
+            pipeline.enqueue(name, email, path, image=image)
+            print(f"Selfie for {name} queued (queue depth: {pipeline.jobs.qsize()}).")
+    finally:
+        print("Waiting for pending selfie uploads and emails...")
+        pipeline.shutdown()
+        dispatcher.close()
+        pipeline.report()
+        dispatcher.report()
 
 if __name__ == '__main__':
     main()
-
-Aurora
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""
+Background pipeline for the post-scan selfie work.
+
+After a visitor's QR code is scanned, the kiosk only captures the selfie and
+enqueues a job. Worker threads upload the image to S3 and email the visitor
+the link, so the next visitor does not wait on S3 and SES round trips. Every
+job is written to a local SQLite journal before it is queued and after each
+stage, so pending uploads are picked up again after a crash or restart.
+
+The upload and email functions are injectable, which lets the pipeline run
+against moto or any local S3/SES stand-in. Given a NotificationDispatcher
+(`sendEmail.selfie_dispatcher()`), emails are queued for bulk templated sends
+instead, and a job is marked emailed once SES has accepted its message.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from sendEmail import sendEmail
+from uploadImage import uploadImage, uploadImageBytes
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selfie_jobs.db")
+
+# Job stages, in order. A job is finished once it reaches 'emailed'.
+CAPTURED = 'captured'
+UPLOADED = 'uploaded'
+EMAILED = 'emailed'
+FAILED = 'failed'
+
+
+class SelfieJournal:
+    """SQLite journal of selfie jobs and the last stage each one completed."""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                image_path TEXT NOT NULL,
+                url TEXT,
+                stage TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_stage ON jobs (stage)")
+        self.conn.commit()
+
+    def add(self, name, email, image_path):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (name, email, image_path, stage, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, email, image_path, CAPTURED, now, now))
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f"{column} = ?" for column in fields)
+        with self.lock:
+            self.conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+            self.conn.commit()
+
+    def unfinished(self):
+        """Jobs that were captured but not yet emailed, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, name, email, image_path, url, stage, attempts, created_at FROM jobs "
+                "WHERE stage IN (?, ?) ORDER BY id", (CAPTURED, UPLOADED)).fetchall()
+        columns = ('id', 'name', 'email', 'image_path', 'url', 'stage', 'attempts', 'created_at')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def pending_paths(self):
+        """Image paths of jobs that are not finished yet; the spool must keep these files."""
+        with self.lock:
+            rows = self.conn.execute("SELECT image_path FROM jobs WHERE stage IN (?, ?)",
+                                     (CAPTURED, UPLOADED)).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SelfiePipeline:
+    def __init__(self, bucket_name, journal_path=JOURNAL_PATH, workers=2, max_queue=32,
+                 max_attempts=3, upload=uploadImage, upload_bytes=uploadImageBytes, send=sendEmail,
+                 spool=None, dispatcher=None):
+        """
+        :param bucket_name: S3 bucket the selfies are uploaded to
+        :param journal_path: SQLite file used to persist pending jobs
+        :param workers: Number of worker threads
+        :param max_queue: Queue size; `enqueue` blocks when this many jobs are waiting
+        :param max_attempts: Attempts per stage before a job is marked failed
+        :param upload: Function `(image_path, bucket_name) -> url or False`
+        :param upload_bytes: Function `(image_bytes, key, bucket_name) -> url or False`
+        :param send: Function `(name, image_path, email, url) -> bool`
+        :param spool: ImageSpool holding the on-disk copies; finished images are removed from it,
+                      and images of unfinished jobs are pinned so it never evicts them
+        :param dispatcher: NotificationDispatcher for the selfie template; replaces `send` when given
+        """
+        self.bucket_name = bucket_name
+        self.max_attempts = max_attempts
+        self.upload = upload
+        self.upload_bytes = upload_bytes
+        self.send = send
+        self.spool = spool
+        self.dispatcher = dispatcher
+
+        self.journal = SelfieJournal(journal_path)
+        if spool is not None:
+            spool.pinned = self.journal.pending_paths
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.stats_lock = threading.Lock()
+        self.latencies = {'queue': [], 'upload': [], 'email': [], 'total': []}
+        self.completed = 0
+        self.failed = 0
+        # Jobs whose email is waiting in the dispatcher
+        self.emailing = 0
+        self.emailing_done = threading.Condition(self.stats_lock)
+
+        self.threads = [threading.Thread(target=self.worker, name=f"selfie-worker-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+        self.resume()
+
+    def resume(self):
+        """Re-queue jobs left unfinished by a previous run."""
+        pending = self.journal.unfinished()
+        if pending:
+            print(f"Resuming {len(pending)} unfinished selfie job(s) from the journal.")
+        for job in pending:
+            job['enqueued_at'] = time.time()
+            self.jobs.put(job)
+
+    def enqueue(self, name, email, image_path, image=None):
+        """
+        Journal a captured selfie and hand it to the workers.
+
+        If the encoded image is passed in as well, it is uploaded straight from
+        memory; `image_path` is then only the durable copy used after a restart.
+        """
+        now = time.time()
+        job_id = self.journal.add(name, email, image_path)
+        self.jobs.put({'id': job_id, 'name': name, 'email': email, 'image_path': image_path,
+                       'image': image, 'url': None, 'stage': CAPTURED, 'attempts': 0,
+                       'created_at': now, 'enqueued_at': now})
+        return job_id
+
+    def record(self, stage, seconds):
+        with self.stats_lock:
+            self.latencies[stage].append(seconds)
+
+    def worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                break
+            try:
+                self.process(job)
+            except Exception as e:
+                print(f"Error processing selfie job {job['id']}: {e}")
+                self.journal.update(job['id'], stage=FAILED, error=str(e))
+            finally:
+                self.jobs.task_done()
+
+    def process(self, job):
+        self.record('queue', time.time() - job['enqueued_at'])
+
+        if job['stage'] == CAPTURED:
+            start = time.perf_counter()
+            if job.get('image') is not None:
+                url = self.upload_bytes(job['image'], os.path.basename(job['image_path']), self.bucket_name)
+            else:
+                url = self.upload(job['image_path'], self.bucket_name)
+            self.record('upload', time.perf_counter() - start)
+            if not url:
+                self.retry(job, "upload failed")
+                return
+            job['url'], job['stage'] = url, UPLOADED
+            self.journal.update(job['id'], url=url, stage=UPLOADED)
+
+        if job['stage'] == UPLOADED:
+            start = time.perf_counter()
+            if self.dispatcher is not None:
+                with self.stats_lock:
+                    self.emailing += 1
+                try:
+                    self.dispatcher.submit(job['email'], {'name': job['name'], 'url': job['url']},
+                                           on_done=lambda sent: self.dispatched(job, sent, start))
+                except Exception:
+                    with self.emailing_done:
+                        self.emailing -= 1
+                        self.emailing_done.notify_all()
+                    raise
+                return
+            sent = self.send(job['name'], job['image_path'], job['email'], job['url'])
+            self.record('email', time.perf_counter() - start)
+            if not sent:
+                self.retry(job, "email failed")
+                return
+            self.emailed(job)
+
+    def dispatched(self, job, sent, start):
+        """Dispatcher callback for a job's email; runs on the dispatcher thread."""
+        try:
+            self.record('email', time.perf_counter() - start)
+            if sent:
+                self.emailed(job)
+            else:
+                # The dispatcher already retried transient failures and dead-lettered the message
+                self.fail(job, "email failed")
+        finally:
+            with self.emailing_done:
+                self.emailing -= 1
+                self.emailing_done.notify_all()
+
+    def emailed(self, job):
+        job['stage'] = EMAILED
+        self.journal.update(job['id'], stage=EMAILED)
+        if self.spool is not None:
+            self.spool.remove(job['image_path'])
+
+        self.record('total', time.time() - job['created_at'])
+        with self.stats_lock:
+            self.completed += 1
+        print(f"Selfie job {job['id']} for {job['email']} done "
+              f"(queue depth: {self.jobs.qsize()}).")
+
+    def retry(self, job, reason):
+        job['attempts'] += 1
+        if job['attempts'] >= self.max_attempts:
+            self.fail(job, reason)
+            return
+        self.journal.update(job['id'], attempts=job['attempts'], error=reason)
+        job['enqueued_at'] = time.time()
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            # Never block a worker on its own queue; the journal still has the job for the next start
+            print(f"Selfie queue full, job {job['id']} will be retried on restart.")
+
+    def fail(self, job, reason):
+        print(f"Selfie job {job['id']} failed (attempts: {job['attempts']}): {reason}")
+        self.journal.update(job['id'], stage=FAILED, attempts=job['attempts'], error=reason)
+        with self.stats_lock:
+            self.failed += 1
+
+    def stats(self):
+        """Queue depth, job counts and p50/p95 latency (seconds) for each stage."""
+        with self.stats_lock:
+            latencies = {stage: sorted(values) for stage, values in self.latencies.items()}
+            completed, failed = self.completed, self.failed
+
+        summary = {'queue_depth': self.jobs.qsize(), 'completed': completed, 'failed': failed}
+        for stage, values in latencies.items():
+            if values:
+                summary[stage] = {
+                    'p50': values[len(values) // 2],
+                    'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+                    'count': len(values),
+                }
+        return summary
+
+    def report(self):
+        stats = self.stats()
+        print(f"Selfie pipeline - queue depth: {stats['queue_depth']}, "
+              f"completed: {stats['completed']}, failed: {stats['failed']}")
+        for stage in ('queue', 'upload', 'email', 'total'):
+            if stage in stats:
+                print(f"  {stage:<6} p50: {stats[stage]['p50'] * 1000:.0f} ms, "
+                      f"p95: {stats[stage]['p95'] * 1000:.0f} ms ({stats[stage]['count']} samples)")
+
+    def shutdown(self, wait=True):
+        """Stop the workers, by default after the queue and any queued emails have drained."""
+        while wait:
+            self.jobs.join()
+            with self.emailing_done:
+                while self.emailing:
+                    self.emailing_done.wait()
+            # A failed upload retried meanwhile is back in the queue
+            if not self.jobs.unfinished_tasks:
+                break
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.journal.close()
+
+
+if __name__ == '__main__':
+    # Smoke test against moto's in-process S3 and SES stand-ins
+    import sys
+    import tempfile
+
+    import boto3
+    from moto import mock_aws
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with mock_aws(), tempfile.TemporaryDirectory() as workdir:
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket='selfiebucket-test')
+        boto3.client('ses', region_name='ap-south-1').verify_email_identity(EmailAddress='meganth.mail@gmail.com')
+
+        pipeline = SelfiePipeline('selfiebucket-test', journal_path=os.path.join(workdir, 'jobs.db'))
+        start = time.perf_counter()
+        for i in range(count):
+            image_path = os.path.join(workdir, f"visitor{i}.jpg")
+            with open(image_path, 'wb') as f:
+                f.write(os.urandom(64 * 1024))
+            pipeline.enqueue(f"Visitor {i}", f"visitor{i}@example.com", image_path)
+        enqueue_time = time.perf_counter() - start
+        pipeline.shutdown()
+        elapsed = time.perf_counter() - start
+
+        print(f"Enqueued {count} jobs in {enqueue_time * 1000:.1f} ms, drained in {elapsed:.2f} s")
+        pipeline.report()
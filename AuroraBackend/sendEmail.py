@@ -8,6 +8,56 @@ import os
 import base64
 from botocore.exceptions import ClientError
 
+AWS_REGION = "ap-south-1"
+SENDER = "Aurora <meganth.mail@gmail.com>"
+
+# SES template for bulk sends through NotificationDispatcher; {{name}} and
+# {{url}} are filled per recipient
+SELFIE_TEMPLATE = {
+    "TemplateName": "AuroraSelfieCaptured",
+    "SubjectPart": "Selfie Captured",
+    "TextPart": """
+    Hi {{name}},
+    \tHope you are doing good! Here is the selfie you captured.
+
+    Regards,
+    Aurora
+                """,
+    "HtmlPart": """
+    <html>
+        <body>
+          <h1>Thanks for participating in our event!!</h1>
+          <p>PFA the link to download your selfie captured by Aurora.
+            <a href="{{url}}"> Download Selfie </a>
+          </p>
+          <br>
+          <br>
+          <h3>Regards,</h3>
+          <h3>Team Aurora</h3>
+        </body>
+    </html>
+    """,
+}
+
+# One SES client per process instead of one per email
+_ses_client = None
+
+
+def get_ses_client():
+    global _ses_client
+    if _ses_client is None:
+        _ses_client = boto3.client("ses", region_name=AWS_REGION)
+    return _ses_client
+
+
+def selfie_dispatcher(**kwargs):
+    """
+    Create a NotificationDispatcher that sends the selfie email in bulk.
+    Submit recipients with `dispatcher.submit(email, {"name": name, "url": url})`.
+    """
+    from notification_dispatcher import NotificationDispatcher
+    return NotificationDispatcher(SELFIE_TEMPLATE, SENDER, ses_client=get_ses_client(), **kwargs)
+
 
 def sendEmail(name: str, path: str, recipientemail: str, url: str) -> bool:
     """
@@ -23,8 +73,6 @@ def sendEmail(name: str, path: str, recipientemail: str, url: str) -> bool:
     """
 
     # SETUP
-    AWS_REGION = "ap-south-1"
-    SENDER = "Aurora <meganth.mail@gmail.com>"
     RECIPIENT = recipientemail
     SUBJECT = "Selfie Captured"
     CHARSET = "UTF-8"
@@ -58,8 +106,8 @@ def sendEmail(name: str, path: str, recipientemail: str, url: str) -> bool:
     
     """
 
-    # Create a client for the AWS SES
-    client = boto3.client("ses", region_name=AWS_REGION)
+    # Reuse the shared client for the AWS SES
+    client = get_ses_client()
 
     try:
         # Provide the contents of the email.
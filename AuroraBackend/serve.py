@@ -0,0 +1,111 @@
+"""
+Production serving mode for thinking_app, talking_app and interview_analyzer.
+
+`python thinking_app.py` and friends run Flask's debug server: one process
+with the reloader, never meant to take concurrent candidates. This launcher
+serves the same Flask apps under uvicorn. Each app is wrapped as ASGI by
+a2wsgi, so request handlers run on a pool of `--threads` threads per worker
+while uvicorn handles connections. Streamed responses (NDJSON question
+generation, Server-Sent Events) are passed through as they are produced.
+
+Outbound I/O already goes through clients shared per process: one pooled
+boto3 Bedrock client in thinking_app, one OpenAI client pool in
+interview_analyzer and the gTTS clip cache in talking_app. So more threads
+and workers translate directly into more calls in flight.
+
+thinking_app keeps its state in SQLite, so it can run any number of worker
+processes. talking_app owns the microphone and speakers, and
+interview_analyzer keeps its job queue and SSE subscribers in memory. Those two
+always run as a single worker process.
+
+    python serve.py thinking --workers 4
+    python serve.py all          # three processes on ports 5000-5002
+    python serve.py interview    # the combined app on port 5000
+"""
+
+import argparse
+import importlib
+import os
+import secrets
+import subprocess
+import sys
+
+# name: (module, default port, most worker processes it can run as, or None for no limit)
+APPS = {
+    'thinking': ('thinking_app', 5000, None),
+    'talking': ('talking_app', 5001, 1),
+    'analyzer': ('interview_analyzer', 5002, 1),
+    # All three stages in one process (interview_app.py); single worker like talking_app
+    'interview': ('interview_app', 5000, 1),
+}
+
+# Request threads per worker process; read from the environment because uvicorn re-imports this module per worker
+THREADS = int(os.environ.get('AURORA_THREADS', 32))
+
+
+def asgi_app(name):
+    """The Flask app `name` wrapped as an ASGI application"""
+    from a2wsgi import WSGIMiddleware
+
+    module = importlib.import_module(APPS[name][0])
+    # One-off work the app's own __main__ would do before serving, e.g. importing legacy reports
+    startup = getattr(module, 'startup', None)
+    if startup is not None:
+        startup()
+    return WSGIMiddleware(module.app, workers=THREADS)
+
+
+def __getattr__(name):
+    """Make `serve:thinking` etc. valid uvicorn import strings; each worker only imports the app it serves."""
+    if name in APPS:
+        return asgi_app(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def worker_count(name, requested):
+    limit = APPS[name][2]
+    if limit is not None and requested > limit:
+        print(f"{name} keeps process-local state and runs as {limit} worker; ignoring --workers {requested}")
+        return limit
+    return requested
+
+
+def serve(name, host, port, workers, threads):
+    import uvicorn
+
+    os.environ['AURORA_THREADS'] = str(threads)
+    # Session cookies signed by one worker must be accepted by the others
+    os.environ.setdefault('FLASK_SECRET_KEY', secrets.token_hex(32))
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    workers = worker_count(name, workers)
+    print(f"Serving {APPS[name][0]} on http://{host}:{port} with {workers} worker(s) x {threads} threads")
+    uvicorn.run(f"serve:{name}", host=host, port=port, workers=workers, log_level="warning",
+                timeout_keep_alive=30)
+
+
+def serve_all(host, workers, threads):
+    """Start the three apps, each in its own launcher process, and wait for them."""
+    processes = [subprocess.Popen([sys.executable, os.path.abspath(__file__), name, '--host', host,
+                                   '--workers', str(worker_count(name, workers)), '--threads', str(threads)])
+                 for name in ('thinking', 'talking', 'analyzer')]
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the interview apps under uvicorn")
+    parser.add_argument('app', choices=list(APPS) + ['all'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="Defaults to the app's usual port")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Worker processes")
+    parser.add_argument('--threads', type=int, default=THREADS, help="Request threads per worker")
+    args = parser.parse_args()
+
+    if args.app == 'all':
+        serve_all(args.host, args.workers, args.threads)
+    else:
+        serve(args.app, args.host, args.port or APPS[args.app][1], args.workers, args.threads)
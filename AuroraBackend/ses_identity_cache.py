@@ -0,0 +1,134 @@
+"""
+Cache of AWS SES identity verification status.
+
+The kiosk scripts used to call `list_verified_email_addresses` for every
+scanned QR code, a synchronous SES round trip inside the camera loop. This
+cache is filled in bulk from the attendee roster at startup with
+`get_identity_verification_attributes` (up to 100 identities per call) and
+afterwards only refreshes entries in the background, so lookups never wait on
+SES.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+
+# get_identity_verification_attributes accepts at most 100 identities per call
+MAX_IDENTITIES_PER_CALL = 100
+
+# SES reports identities it has never seen as missing from the response
+NOT_STARTED = 'NotStarted'
+
+
+class IdentityStatusCache:
+    def __init__(self, ses_client, ttl=300, max_workers=2):
+        """
+        :param ses_client: boto3 SES client
+        :param ttl: Seconds before a cached status is refreshed
+        :param max_workers: Background threads used for refreshes and verification requests
+        """
+        self.ses_client = ses_client
+        self.ttl = ttl
+        self.entries = {}  # address -> (status, fetched_at)
+        self.pending_refresh = set()
+        self.verification_requested = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ses-identity')
+
+    def prefetch(self, addresses):
+        """Fetch the status of all addresses in batches of 100 and cache it."""
+        addresses = [a for a in dict.fromkeys(addresses) if a]
+        for i in range(0, len(addresses), MAX_IDENTITIES_PER_CALL):
+            batch = addresses[i:i + MAX_IDENTITIES_PER_CALL]
+            try:
+                response = self.ses_client.get_identity_verification_attributes(Identities=batch)
+            except (NoCredentialsError, PartialCredentialsError) as e:
+                print(f"Credentials error: {e}")
+                # No later batch can succeed either; let get() resubmit all of them
+                self.release(addresses[i:])
+                return
+            except Exception as e:
+                print(f"Error fetching email verification status: {e}")
+                self.release(batch)
+                continue
+
+            attributes = response.get('VerificationAttributes', {})
+            now = time.monotonic()
+            with self.lock:
+                for address in batch:
+                    status = attributes.get(address, {}).get('VerificationStatus', NOT_STARTED)
+                    self.entries[address] = (status, now)
+                    self.pending_refresh.discard(address)
+        print(f"Cached SES verification status for {len(addresses)} email(s).")
+
+    def release(self, addresses):
+        """Allow addresses whose refresh failed to be refreshed again by a later get()."""
+        with self.lock:
+            self.pending_refresh.difference_update(addresses)
+
+    def prefetch_async(self, addresses):
+        """Run `prefetch` on a background thread."""
+        return self.executor.submit(self.prefetch, list(addresses))
+
+    def get(self, address):
+        """
+        Return the cached status of an address without blocking.
+
+        Unknown or expired entries are refreshed in the background; an expired
+        entry keeps returning its last known status until the refresh lands.
+        Returns None if the address has never been fetched.
+        """
+        with self.lock:
+            entry = self.entries.get(address)
+            stale = entry is None or time.monotonic() - entry[1] > self.ttl
+            if stale and address not in self.pending_refresh:
+                self.pending_refresh.add(address)
+                self.executor.submit(self.prefetch, [address])
+        return entry[0] if entry else None
+
+    def is_verified(self, address):
+        return self.get(address) == 'Success'
+
+    def lookup(self, address, callback):
+        """
+        Call `callback(status)` with the status of an address.
+
+        A cached status is passed on straight away. An address that was never
+        fetched (not on the roster, say) is fetched first on a background
+        thread; callback then gets the fresh status, or None if SES could not
+        be reached.
+        """
+        with self.lock:
+            known = address in self.entries
+        if known:
+            callback(self.get(address))
+            return
+
+        def fetch():
+            self.prefetch([address])
+            with self.lock:
+                entry = self.entries.get(address)
+            callback(entry[0] if entry else None)
+
+        self.executor.submit(fetch)
+
+    def request_verification(self, address, verify):
+        """
+        Call `verify(address)` in the background once per address.
+
+        The address is marked Pending in the cache straight away so that later
+        scans do not send a second verification email.
+        """
+        with self.lock:
+            if address in self.verification_requested:
+                return
+            self.verification_requested.add(address)
+            self.entries[address] = ('Pending', time.monotonic())
+        self.executor.submit(verify, address)
+
+    def invalidate(self, address):
+        with self.lock:
+            self.entries.pop(address, None)
+            self.verification_requested.discard(address)
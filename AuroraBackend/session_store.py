@@ -0,0 +1,491 @@
+"""
+SQLite-backed store for interview question sessions.
+
+`thinking_app` and `talking_app` used to keep each session in a
+`shared_questions/questions_*.json` file and update answers by reading the
+whole file, changing one entry and rewriting it. Two requests for the same
+session could interleave and lose an answer, and listing sessions parsed every
+file. Sessions now live in one SQLite database in WAL mode: each answer is a
+row updated in its own transaction, and readers never block the writer.
+
+The JSON files are still written after every change, from the committed
+database state, so `interview_analyzer` and anything else reading
+`shared_questions` keep working. Files written before the store existed are
+imported on first use.
+
+The sessions table doubles as the listing index: session id, timestamp,
+question count and progress are updated with every answer, so listing is an
+indexed query and never parses JSON. The folder is only rescanned when its
+mtime changes, to pick up files copied in and drop files deleted by
+`interview_analyzer`'s cleanup.
+
+Sessions read with `get_session` are also kept in a small in-memory cache.
+A cached copy is only used while the session's `updated_at` in the database
+is unchanged, so one indexed lookup replaces reading and decoding every answer.
+This stays correct when several processes write to the same database. Apps
+served in one process share a single store through `get_store()`.
+
+Run this file to benchmark concurrent answer submissions against the old
+read-modify-write JSON approach:
+    python session_store.py --threads 8 --questions 400
+"""
+
+import datetime
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where the interview apps keep their data; AURORA_DATA_DIR moves it, e.g. for load tests
+DATA_DIR = os.environ.get("AURORA_DATA_DIR", BASE_DIR)
+QUESTIONS_FOLDER = os.path.join(DATA_DIR, "shared_questions")
+
+# Kept outside shared_questions, which interview_analyzer scans and clears
+STORE_PATH = os.path.join(DATA_DIR, "sessions.db")
+
+# Page size for list_sessions when none is given
+DEFAULT_PAGE_SIZE = 50
+
+# Sessions kept decoded in memory by get_session
+SESSION_CACHE_SIZE = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    filename TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    total_questions INTEGER NOT NULL,
+    current_question INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    exported_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_session_timestamp ON sessions (session_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp);
+CREATE TABLE IF NOT EXISTS answers (
+    filename TEXT NOT NULL REFERENCES sessions (filename) ON DELETE CASCADE,
+    question_index INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT,
+    PRIMARY KEY (filename, question_index)
+);
+"""
+
+
+class SessionStore:
+    def __init__(self, path=STORE_PATH, export_folder=QUESTIONS_FOLDER, export_json=True):
+        """
+        :param path: SQLite database file
+        :param export_folder: Folder the compatibility JSON files are written to
+        :param export_json: Write the JSON file after every change
+        """
+        self.path = path
+        self.export_folder = export_folder
+        self.export_json = export_json
+        self.local = threading.local()
+        self.export_locks = {}
+        self.export_locks_lock = threading.Lock()
+        self.folder_mtime = None
+        self.folder_lock = threading.Lock()
+        # filename -> (updated_at, session) for recently read sessions
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        if export_folder:
+            os.makedirs(export_folder, exist_ok=True)
+
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Databases created before exported_mtime existed get the column first
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sessions'").fetchone():
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if 'exported_mtime' not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN exported_mtime REAL")
+        conn.executescript(SCHEMA)
+
+    def connection(self):
+        """One connection per thread; WAL lets them read while another writes."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self.local.conn = conn
+        return conn
+
+    def transaction(self):
+        """Context manager for a write transaction that takes the write lock up front."""
+        return _Transaction(self.connection())
+
+    def create_session(self, questions, session_id, timestamp=None):
+        """Store a new session and return its filename, e.g. questions_<id>_<timestamp>.json"""
+        timestamp = timestamp or datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"questions_{session_id}_{timestamp}.json"
+        with self.transaction() as conn:
+            self.insert(conn, filename, session_id, timestamp, questions, [None] * len(questions), 0)
+        self.export(filename)
+        return filename
+
+    def insert(self, conn, filename, session_id, timestamp, questions, answers, current_question):
+        with self.cache_lock:
+            self.cache.pop(filename, None)
+        conn.execute("DELETE FROM answers WHERE filename = ?", (filename,))
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (filename, session_id, timestamp, total_questions, "
+            "current_question, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (filename, session_id, timestamp, len(questions), current_question, time.time()))
+        conn.executemany(
+            "INSERT INTO answers (filename, question_index, question, answer) VALUES (?, ?, ?, ?)",
+            [(filename, i, question, None if answer is None else json.dumps(answer, ensure_ascii=False))
+             for i, (question, answer) in enumerate(zip(questions, answers))])
+
+    def get_session(self, filename):
+        """
+        Return a session in the JSON file layout, or None if it does not exist.
+
+        Sessions only present as JSON files are imported first.
+        """
+        conn = self.connection()
+        row = conn.execute(
+            "SELECT session_id, timestamp, current_question, updated_at FROM sessions WHERE filename = ?",
+            (filename,)).fetchone()
+        if row is None:
+            return self.import_file(filename)
+
+        session_id, timestamp, current_question, updated_at = row
+        with self.cache_lock:
+            cached = self.cache.get(filename)
+            if cached is not None and cached[0] == updated_at:
+                self.cache.move_to_end(filename)
+                return self.copy(cached[1])
+
+        questions, answers = [], []
+        for question, answer in conn.execute(
+                "SELECT question, answer FROM answers WHERE filename = ? ORDER BY question_index",
+                (filename,)):
+            questions.append(question)
+            answers.append(None if answer is None else json.loads(answer))
+        session = {
+            'session_id': session_id,
+            'timestamp': timestamp,
+            'questions': questions,
+            'answers': answers,
+            'current_question': current_question
+        }
+        with self.cache_lock:
+            self.cache[filename] = (updated_at, session)
+            self.cache.move_to_end(filename)
+            while len(self.cache) > SESSION_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return self.copy(session)
+
+    @staticmethod
+    def copy(session):
+        """A copy of a cached session that callers may modify"""
+        return dict(session, questions=list(session['questions']), answers=list(session['answers']))
+
+    def version(self, filename):
+        """The session's last-change time, or None if it does not exist; changes with every answer"""
+        row = self.connection().execute("SELECT updated_at FROM sessions WHERE filename = ?",
+                                        (filename,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_answer(self, filename, question_index, answer, current_question=None):
+        """
+        Store one answer, and optionally move the session to `current_question`,
+        in a single transaction.
+
+        :return: The updated session, or None if the session or question does not exist
+        """
+        updated = self.update_answer(filename, question_index, answer, current_question)
+        if not updated and self.import_file(filename) is not None:
+            updated = self.update_answer(filename, question_index, answer, current_question)
+        if not updated:
+            return None
+
+        self.export(filename)
+        return self.get_session(filename)
+
+    def update_answer(self, filename, question_index, answer, current_question):
+        with self.transaction() as conn:
+            updated = conn.execute(
+                "UPDATE answers SET answer = ? WHERE filename = ? AND question_index = ?",
+                (json.dumps(answer, ensure_ascii=False), filename, question_index)).rowcount
+            if not updated:
+                return False
+            # updated_at must change with every answer, even within one tick of a coarse clock,
+            # because get_session's cache trusts it
+            if current_question is None:
+                conn.execute("UPDATE sessions SET updated_at = MAX(?, updated_at + 0.000001) WHERE filename = ?",
+                             (time.time(), filename))
+            else:
+                conn.execute("UPDATE sessions SET current_question = ?, updated_at = MAX(?, updated_at + 0.000001) "
+                             "WHERE filename = ?", (current_question, time.time(), filename))
+        return True
+
+    def list_sessions(self, limit=None, offset=0, session_id=None, status=None, since=None, until=None):
+        """
+        Metadata for sessions, newest first.
+
+        :param limit: Maximum sessions to return; None returns all of them
+        :param offset: Sessions to skip, for pagination
+        :param session_id: Only sessions with this id
+        :param status: 'not_started', 'in_progress' or 'completed'
+        :param since: Only sessions with timestamp >= since (YYYYMMDD or YYYYMMDD_HHMMSS)
+        :param until: Only sessions with timestamp < until
+        """
+        self.sync_folder()
+
+        where, params = [], []
+        if session_id:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if status == 'not_started':
+            where.append("current_question = 0")
+        elif status == 'in_progress':
+            where.append("current_question > 0 AND current_question < total_questions")
+        elif status == 'completed':
+            where.append("current_question >= total_questions")
+        elif status:
+            raise ValueError(f"Unknown status: {status}")
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+
+        query = ("SELECT filename, session_id, timestamp, total_questions, current_question FROM sessions" +
+                 (" WHERE " + " AND ".join(where) if where else "") +
+                 " ORDER BY timestamp DESC, filename LIMIT ? OFFSET ?")
+        params += [-1 if limit is None else limit, offset]
+        return [{
+            'filename': filename,
+            'session_id': session_id,
+            'timestamp': timestamp,
+            'total_questions': total_questions,
+            'current_question': current_question
+        } for filename, session_id, timestamp, total_questions, current_question
+            in self.connection().execute(query, params)]
+
+    def delete_all(self):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM answers")
+            conn.execute("DELETE FROM sessions")
+        with self.cache_lock:
+            self.cache.clear()
+
+    def export(self, filename):
+        """
+        Write the session's JSON file from the committed database state.
+
+        The file is replaced atomically, and exports of the same session are
+        serialised so the last one to finish always holds the latest answers.
+        """
+        if not (self.export_json and self.export_folder):
+            return
+        with self.export_locks_lock:
+            lock = self.export_locks.setdefault(filename, threading.Lock())
+        with lock:
+            data = self.get_session(filename)
+            path = os.path.join(self.export_folder, filename)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self.folder_lock:
+                before = self.folder_stat()
+                os.replace(temp_path, path)
+                # Our own write need not trigger a rescan, unless something else changed the folder too
+                if before == self.folder_mtime:
+                    self.folder_mtime = self.folder_stat()
+            with self.transaction() as conn:
+                conn.execute("UPDATE sessions SET exported_mtime = ? WHERE filename = ?",
+                             (os.path.getmtime(path), filename))
+
+    def import_file(self, filename):
+        """Import a session that so far only exists as a JSON file; return it, or None."""
+        if not self.export_folder:
+            return None
+        path = os.path.join(self.export_folder, os.path.basename(filename))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        questions = data.get('questions', [])
+        answers = (data.get('answers') or []) + [None] * len(questions)
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM sessions WHERE filename = ?", (filename,)).fetchone() is None:
+                self.insert(conn, filename, data.get('session_id', 'Unknown'), data.get('timestamp', 'Unknown'),
+                            questions, answers[:len(questions)], data.get('current_question', 0))
+                conn.execute("UPDATE sessions SET exported_mtime = ? WHERE filename = ?",
+                             (os.path.getmtime(path), filename))
+        return self.get_session(filename)
+
+    def folder_stat(self):
+        try:
+            return os.stat(self.export_folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def sync_folder(self):
+        """
+        Reconcile the index with the export folder if the folder changed since the last check.
+
+        New JSON files are imported. Sessions whose exported file was deleted are
+        dropped; sessions that have not been exported yet are left alone.
+        """
+        if not self.export_folder:
+            return
+        with self.folder_lock:
+            mtime = self.folder_stat()
+            if mtime == self.folder_mtime:
+                return
+            self.folder_mtime = mtime
+
+        on_disk = {os.path.basename(path) for path in glob.glob(os.path.join(self.export_folder, '*.json'))}
+        exported = {}
+        for filename, exported_mtime in self.connection().execute("SELECT filename, exported_mtime FROM sessions"):
+            exported[filename] = exported_mtime
+        for filename in on_disk - exported.keys():
+            self.import_file(filename)
+        if self.export_json:
+            removed = [(filename,) for filename, exported_mtime in exported.items()
+                       if exported_mtime is not None and filename not in on_disk]
+            if removed:
+                with self.transaction() as conn:
+                    conn.executemany("DELETE FROM answers WHERE filename = ?", removed)
+                    conn.executemany("DELETE FROM sessions WHERE filename = ?", removed)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store for the default database and questions folder"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def legacy_save_answer(folder, filename, question_index, answer):
+    """The previous approach: read the whole file, change one answer, rewrite it. Kept for benchmarking."""
+    file_path = os.path.join(folder, filename)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        session_data = json.load(f)
+    session_data['answers'][question_index] = answer
+    session_data['current_question'] = question_index + 1
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(session_data, f, indent=2, ensure_ascii=False)
+
+
+def legacy_list_sessions(folder):
+    """The previous listing: parse every JSON file in the folder. Kept for benchmarking."""
+    files_info = []
+    for file_path in glob.glob(os.path.join(folder, '*.json')):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            files_info.append({
+                'filename': os.path.basename(file_path),
+                'session_id': data.get('session_id', 'Unknown'),
+                'timestamp': data.get('timestamp', 'Unknown'),
+                'total_questions': len(data.get('questions', [])),
+                'current_question': data.get('current_question', 0)
+            })
+    return files_info
+
+
+if __name__ == '__main__':
+    import argparse
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Benchmark concurrent answer submissions")
+    parser.add_argument('--threads', type=int, default=8, help="Concurrent submitters")
+    parser.add_argument('--questions', type=int, default=400, help="Questions in the session, each answered once")
+    parser.add_argument('--sessions', type=int, default=2000, help="Past sessions for the listing benchmark")
+    args = parser.parse_args()
+
+    questions = [f"{i + 1}. Question number {i + 1}?" for i in range(args.questions)]
+    jobs = [(i, {'text': f"answer {i}", 'status': 'success'}) for i in range(args.questions)]
+
+    def run(name, submit, check):
+        start = time.perf_counter()
+        errors = 0
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            for future in [executor.submit(submit, index, answer) for index, answer in jobs]:
+                try:
+                    future.result()
+                except Exception:
+                    errors += 1
+        elapsed = time.perf_counter() - start
+        answered = sum(answer is not None for answer in check())
+        print(f"  {name:<28} {len(jobs) / elapsed:8.0f} answers/s, "
+              f"{answered}/{len(jobs)} answers kept, {errors} errors")
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{args.questions} answers submitted from {args.threads} threads")
+
+        filename = "questions_legacy_bench.json"
+        with open(os.path.join(folder, filename), 'w', encoding='utf-8') as f:
+            json.dump({'session_id': 'legacy', 'timestamp': 'bench', 'questions': questions,
+                       'answers': [None] * len(questions), 'current_question': 0}, f)
+
+        def read_legacy():
+            try:
+                with open(os.path.join(folder, filename), encoding='utf-8') as f:
+                    return json.load(f)['answers']
+            except ValueError:
+                return []
+
+        run("JSON read-modify-write", lambda i, a: legacy_save_answer(folder, filename, i, a), read_legacy)
+
+        for export_json in (False, True):
+            store = SessionStore(os.path.join(folder, f"bench_{export_json}.db"),
+                                 os.path.join(folder, f"export_{export_json}"), export_json=export_json)
+            name = store.create_session(questions, f"bench{export_json}")
+            run("SQLite store" + (" + JSON export" if export_json else ""),
+                lambda i, a: store.set_answer(name, i, a, current_question=i + 1),
+                lambda: store.get_session(name)['answers'])
+
+        print(f"Listing with up to {args.sessions} past sessions")
+        store = SessionStore(os.path.join(folder, "list.db"), os.path.join(folder, "list"))
+        answer = {'text': "x" * 500, 'status': 'success'}
+        created = 0
+        for target in sorted({args.sessions // 100, args.sessions // 10, args.sessions}):
+            while created < target:
+                name = store.create_session(questions[:10], f"s{created}", timestamp=f"20240101_{created:06d}")
+                for i in range(10):
+                    store.set_answer(name, i, answer)
+                created += 1
+            store.list_sessions(limit=DEFAULT_PAGE_SIZE)
+
+            start = time.perf_counter()
+            legacy_list_sessions(store.export_folder)
+            legacy = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(10):
+                store.list_sessions(limit=DEFAULT_PAGE_SIZE)
+            indexed = (time.perf_counter() - start) / 10
+            print(f"  {target:6d} sessions: parse every file {legacy * 1000:8.1f} ms, "
+                  f"indexed page of {DEFAULT_PAGE_SIZE} {indexed * 1000:6.2f} ms")
@@ -0,0 +1,148 @@
+"""
+Non-blocking speech capture for talking_app.
+
+`/api/listen_response` used to hold a Flask worker for the whole recording
+(up to 30 s) and the Google recognition call after it. `ListenService` starts
+a capture and returns a token at once. Recording runs on a capture executor
+sized to the number of microphones, and recognition runs on a separate bounded
+executor, so neither grows a thread per waiting client. Clients poll for the
+result with the token; `get` never blocks, so a poll holds no request thread
+while the microphone is open.
+
+With a `stream` callable the capture is recognised while it is recorded
+(see streaming_recognition.py). Partial transcripts are published on the
+request as they arrive and are returned by the same polls, so following a
+capture never holds a request thread open the way a Server-Sent Events
+stream would.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Results that failed to produce a transcript
+FAILED_RESPONSES = ('TIMEOUT', 'UNKNOWN', 'ERROR', 'MICROPHONE_NOT_AVAILABLE')
+
+# Seconds a finished capture is kept for polling
+RESULT_TTL = 300
+
+
+class ListenRequest:
+    def __init__(self, params):
+        self.token = uuid.uuid4().hex
+        self.params = params
+        self.state = 'queued'
+        self.response = None
+        self.created = time.time()
+        self.finished = None
+        self.done = threading.Event()
+        # Latest partial transcript, returned by polls while the candidate speaks
+        self.partial = None
+
+    def update(self, partial):
+        """Publish a partial transcript for the next poll."""
+        self.partial = partial
+
+    def to_dict(self):
+        data = dict(self.params, token=self.token, state=self.state)
+        if self.partial is not None:
+            data['partial'] = self.partial
+        if self.done.is_set():
+            data['response'] = self.response
+            data['status'] = 'failed' if self.response in FAILED_RESPONSES else 'success'
+        return data
+
+
+class ListenService:
+    def __init__(self, capture, recognize, on_result=None, capture_workers=1, recognize_workers=4, stream=None):
+        """
+        :param capture: Callable(timeout) returning recorded audio, or a failure string such as 'TIMEOUT'
+        :param recognize: Callable(audio) returning the transcript or a failure string
+        :param stream: Optional Callable(timeout, on_partial) that records and recognises at once,
+                       returning the transcript or a failure string; replaces capture and recognize
+        :param on_result: Callable(request) run after recognition, e.g. to save the answer
+        :param capture_workers: Recordings at once; one per microphone
+        :param recognize_workers: Recognition calls at once
+        """
+        self.capture = capture
+        self.recognize = recognize
+        self.on_result = on_result
+        self.stream = stream
+        self.capture_executor = ThreadPoolExecutor(max_workers=capture_workers, thread_name_prefix="capture")
+        self.recognize_executor = ThreadPoolExecutor(max_workers=recognize_workers, thread_name_prefix="recognize")
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    def start(self, timeout=30, **params):
+        """Queue a capture and return its request; the token identifies it for `get`."""
+        request = ListenRequest(params)
+        with self.lock:
+            self.expire()
+            self.requests[request.token] = request
+        if self.stream is not None:
+            self.capture_executor.submit(self.record_streaming, request, timeout)
+        else:
+            self.capture_executor.submit(self.record, request, timeout)
+        return request
+
+    @property
+    def streaming(self):
+        return self.stream is not None
+
+    def get(self, token):
+        with self.lock:
+            return self.requests.get(token)
+
+    def record(self, request, timeout):
+        request.state = 'listening'
+        try:
+            audio = self.capture(timeout)
+        except Exception as e:
+            print(f"Error capturing speech: {e}")
+            audio = 'ERROR'
+        if isinstance(audio, str):
+            self.finish(request, audio)
+            return
+        request.state = 'recognizing'
+        self.recognize_executor.submit(self.transcribe, request, audio)
+
+    def record_streaming(self, request, timeout):
+        request.state = 'listening'
+        try:
+            response = self.stream(timeout, request.update)
+        except Exception as e:
+            print(f"Error with streaming speech recognition: {e}")
+            response = 'ERROR'
+        self.finish(request, response)
+
+    def transcribe(self, request, audio):
+        try:
+            response = self.recognize(audio)
+        except Exception as e:
+            print(f"Error with speech recognition: {e}")
+            response = 'ERROR'
+        self.finish(request, response)
+
+    def finish(self, request, response):
+        request.response = response
+        if self.on_result is not None:
+            try:
+                self.on_result(request)
+            except Exception as e:
+                print(f"Error handling speech result: {e}")
+        request.finished = time.time()
+        request.state = 'done'
+        request.done.set()
+
+    def expire(self):
+        """Forget finished requests older than RESULT_TTL; called with the lock held."""
+        cutoff = time.time() - RESULT_TTL
+        for token in [token for token, request in self.requests.items()
+                      if request.finished is not None and request.finished < cutoff]:
+            del self.requests[token]
+
+    def stats(self):
+        with self.lock:
+            states = [request.state for request in self.requests.values()]
+        return {state: states.count(state) for state in ('queued', 'listening', 'recognizing', 'done')}
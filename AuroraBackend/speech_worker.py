@@ -0,0 +1,100 @@
+"""
+Text-to-speech on a dedicated thread.
+
+pyttsx3 engines are not safe to drive from several threads, and `pyttsx3.init()`
+with voice enumeration takes a noticeable time. Instead of every request building
+its own engine, `SpeechWorker` owns a single engine, created on first use by its
+own thread, and speaks queued texts one after another. `say` returns a Future
+that completes once the text has been spoken.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+import pyttsx3
+
+
+class SpeechWorker:
+    def __init__(self, rate=180, volume=0.9, max_queue=16):
+        """
+        :param rate: Speech rate in words per minute
+        :param volume: Volume from 0.0 to 1.0
+        :param max_queue: Texts waiting to be spoken before `say` rejects new ones
+        """
+        self.rate = rate
+        self.volume = volume
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.engine = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def say(self, text):
+        """Queue `text` to be spoken; the returned Future resolves when it has been."""
+        self.start()
+        future = Future()
+        try:
+            self.jobs.put_nowait((text, future))
+        except queue.Full:
+            future.set_exception(RuntimeError("Speech queue is full"))
+        return future
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="speech", daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            text, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if self.engine is None:
+                    self.engine = self.init_engine()
+                self.engine.say(text)
+                self.engine.runAndWait()
+                future.set_result(True)
+            except Exception as e:
+                future.set_exception(e)
+
+    def init_engine(self):
+        """Create and configure the engine; runs on the speech thread."""
+        engine = pyttsx3.init()
+        try:
+            # Set speech rate (words per minute)
+            engine.setProperty('rate', self.rate)
+
+            # Set volume (0.0 to 1.0)
+            engine.setProperty('volume', self.volume)
+
+            # Try to set a clearer voice if available
+            voices = engine.getProperty('voices')
+            if voices:
+                # Prefer female voice if available, otherwise use first voice
+                for voice in voices:
+                    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                        engine.setProperty('voice', voice.id)
+                        break
+                else:
+                    engine.setProperty('voice', voices[0].id)
+        except Exception as e:
+            print(f"Warning: TTS setup encountered an issue: {e}")
+        return engine
+
+    def stop(self):
+        """Finish the queued texts and stop the speech thread."""
+        with self.lock:
+            thread = self.thread
+        if thread is not None:
+            self.jobs.put(None)
+            thread.join()
+            with self.lock:
+                if self.thread is thread:
+                    # The next say() starts a fresh thread, which builds its own engine
+                    self.thread = None
+                    self.engine = None
@@ -0,0 +1,271 @@
+"""
+Streaming speech recognition for talking_app.
+
+`TalkingChatbot.listen_for_response` records until the candidate stops talking
+and only then uploads the whole clip, so recognition time is added on top of
+the answer. `StreamingListener` uses the same pipeline as the kiosk scripts
+(`vadlist.py`): 30 ms PCM frames from the microphone gated by webrtcvad. Speech
+frames go to the recogniser as they arrive, partial transcripts are reported
+while the candidate talks, and the final text is ready a few hundred
+milliseconds after the end of speech.
+
+Recognisers share one small interface: `accept(frame)` returns the latest
+partial transcript (or None), and `finish()` returns the final text. Both
+raise `RecognizerError` once the recogniser has failed.
+`TranscribeRecognizer` streams to Amazon Transcribe. `OfflineRecognizer` is a
+local stand-in for tests and demos that needs no network.
+
+Run this file to stream a WAV file (16 kHz, 16-bit mono) through the offline
+recogniser:
+    python streaming_recognition.py answer.wav --transcript "my answer text"
+"""
+
+import asyncio
+import queue
+import threading
+import time
+import wave
+
+import webrtcvad
+
+SAMPLE_RATE = 16000
+FRAME_DURATION = 30  # milliseconds
+VAD_MODE = 1
+
+# Silence after speech that ends the answer
+END_SILENCE = 0.6  # seconds
+
+# Speech needed before the listener treats the input as an answer rather than noise
+MIN_SPEECH = 0.15  # seconds
+
+
+class RecognizerError(RuntimeError):
+    """A streaming recogniser failed (missing package, credentials, network)."""
+
+
+def microphone_frames(sample_rate=SAMPLE_RATE, frame_duration=FRAME_DURATION, stop_event=None):
+    """Yield raw 16-bit mono PCM frames from the default microphone."""
+    import pyaudio
+
+    frame_size = int(sample_rate * frame_duration / 1000)
+    pyaudio_instance = pyaudio.PyAudio()
+    stream_in = pyaudio_instance.open(format=pyaudio.paInt16,
+                                      channels=1,
+                                      rate=sample_rate,
+                                      input=True,
+                                      frames_per_buffer=frame_size)
+    try:
+        while stop_event is None or not stop_event.is_set():
+            yield stream_in.read(frame_size, exception_on_overflow=False)
+    finally:
+        stream_in.stop_stream()
+        stream_in.close()
+        pyaudio_instance.terminate()
+
+
+def wav_frames(path, frame_duration=FRAME_DURATION, realtime=False):
+    """Yield frames from a 16-bit mono WAV file, optionally paced like a live microphone."""
+    with wave.open(path, 'rb') as wav:
+        frame_size = int(wav.getframerate() * frame_duration / 1000)
+        while True:
+            data = wav.readframes(frame_size)
+            if len(data) < frame_size * 2:
+                return
+            if realtime:
+                time.sleep(frame_duration / 1000)
+            yield data
+
+
+class OfflineRecognizer:
+    """
+    Local stand-in for a streaming recogniser.
+
+    Reveals the words of a known `transcript` in proportion to the speech
+    frames received, so partials and end-of-speech timing can be exercised
+    without a network service.
+    """
+
+    def __init__(self, transcript="this is a test answer", words_per_second=2.5, frame_duration=FRAME_DURATION):
+        self.words = transcript.split()
+        self.frames_per_word = max(1, int(1000 / frame_duration / words_per_second))
+        self.frames = 0
+
+    def accept(self, frame):
+        self.frames += 1
+        if self.frames % self.frames_per_word:
+            return None
+        return " ".join(self.words[:self.frames // self.frames_per_word])
+
+    def finish(self):
+        return " ".join(self.words) if self.frames else ""
+
+
+class TranscribeRecognizer:
+    """Amazon Transcribe streaming, driven from the listener's thread."""
+
+    def __init__(self, region="ap-south-1", language_code="en-US", sample_rate=SAMPLE_RATE):
+        self.region = region
+        self.language_code = language_code
+        self.sample_rate = sample_rate
+        self.frames = queue.Queue()
+        self.final_segments = []
+        self.partial = None
+        self.changed = False
+        self.lock = threading.Lock()
+        self.error = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.main, name="transcribe", daemon=True)
+        self.thread.start()
+
+    def main(self):
+        try:
+            self.loop.run_until_complete(self.run())
+        except Exception as e:
+            # Reported by the next accept() or finish() on the listener's thread
+            self.error = e
+            # Release the executor thread that may still be waiting for a frame
+            self.frames.put(None)
+
+    def check(self):
+        if self.error is not None:
+            raise RecognizerError(f"Amazon Transcribe failed: {self.error}") from self.error
+
+    async def run(self):
+        from amazon_transcribe.client import TranscribeStreamingClient
+        from amazon_transcribe.handlers import TranscriptResultStreamHandler
+
+        recognizer = self
+
+        class Handler(TranscriptResultStreamHandler):
+            async def handle_transcript_event(self, transcript_event):
+                for result in transcript_event.transcript.results:
+                    if not result.alternatives:
+                        continue
+                    text = result.alternatives[0].transcript
+                    with recognizer.lock:
+                        if result.is_partial:
+                            recognizer.partial = text
+                        else:
+                            recognizer.final_segments.append(text)
+                            recognizer.partial = None
+                        recognizer.changed = True
+
+        client = TranscribeStreamingClient(region=self.region)
+        stream = await client.start_stream_transcription(
+            language_code=self.language_code,
+            media_sample_rate_hz=self.sample_rate,
+            media_encoding="pcm",
+        )
+
+        async def send():
+            while True:
+                frame = await self.loop.run_in_executor(None, self.frames.get)
+                if frame is None:
+                    break
+                await stream.input_stream.send_audio_event(audio_chunk=frame)
+            await stream.input_stream.end_stream()
+
+        await asyncio.gather(send(), Handler(stream.output_stream).handle_events())
+
+    def text(self):
+        with self.lock:
+            return " ".join(self.final_segments + ([self.partial] if self.partial else []))
+
+    def accept(self, frame):
+        self.check()
+        self.frames.put(frame)
+        with self.lock:
+            changed, self.changed = self.changed, False
+        return self.text() if changed else None
+
+    def finish(self):
+        self.frames.put(None)
+        self.thread.join(timeout=10)
+        self.check()
+        if self.thread.is_alive():
+            raise RecognizerError("Amazon Transcribe did not return a final transcript in time")
+        return self.text()
+
+
+class StreamingListener:
+    def __init__(self, recognizer_factory, vad_mode=VAD_MODE, sample_rate=SAMPLE_RATE,
+                 frame_duration=FRAME_DURATION, end_silence=END_SILENCE, max_duration=60):
+        """
+        :param recognizer_factory: Callable returning a new recogniser for each answer
+        :param end_silence: Seconds of silence after speech that end the answer
+        :param max_duration: Longest answer in seconds
+        """
+        self.recognizer_factory = recognizer_factory
+        self.vad = webrtcvad.Vad(vad_mode)
+        self.sample_rate = sample_rate
+        self.frame_duration = frame_duration
+        self.end_silence = end_silence
+        self.max_duration = max_duration
+
+    def listen(self, frames, timeout=30, on_partial=None):
+        """
+        Stream one answer from `frames` through VAD and the recogniser.
+
+        :param timeout: Seconds to wait for speech to start
+        :param on_partial: Called with each new partial transcript
+        :return: The final transcript, 'TIMEOUT' if nobody spoke or 'UNKNOWN' if nothing was recognised
+        :raises RecognizerError: If the recogniser failed
+        """
+        frame_seconds = self.frame_duration / 1000
+        start_frames = int(timeout / frame_seconds)
+        end_frames = int(self.end_silence / frame_seconds)
+        min_speech_frames = max(1, int(MIN_SPEECH / frame_seconds))
+        max_frames = int(self.max_duration / frame_seconds)
+
+        recognizer = None
+        last_partial = None
+        waited = speech = silence = total = 0
+        # Frames from just before speech was detected, so the first syllable is not clipped
+        lead_in = []
+        for frame in frames:
+            is_speech = self.vad.is_speech(frame, self.sample_rate)
+
+            if recognizer is None:
+                lead_in = (lead_in + [frame])[-min_speech_frames:]
+                speech = speech + 1 if is_speech else 0
+                if speech < min_speech_frames:
+                    waited += 1
+                    if waited >= start_frames:
+                        return "TIMEOUT"
+                    continue
+                recognizer = self.recognizer_factory()
+                pending = lead_in
+            else:
+                pending = [frame]
+
+            for chunk in pending:
+                partial = recognizer.accept(chunk)
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    if on_partial is not None:
+                        on_partial(partial)
+            total += len(pending)
+            silence = 0 if is_speech else silence + 1
+            if silence >= end_frames or total >= max_frames:
+                break
+
+        if recognizer is None:
+            return "TIMEOUT"
+        text = recognizer.finish()
+        return text if text else "UNKNOWN"
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a WAV file through the VAD-gated offline recogniser")
+    parser.add_argument('wav', help="16 kHz, 16-bit mono WAV file")
+    parser.add_argument('--transcript', default="this is a test answer", help="Text the stand-in recogniser returns")
+    parser.add_argument('--realtime', action='store_true', help="Pace frames like a live microphone")
+    args = parser.parse_args()
+
+    listener = StreamingListener(lambda: OfflineRecognizer(args.transcript))
+    start = time.perf_counter()
+    final = listener.listen(wav_frames(args.wav, realtime=args.realtime),
+                            on_partial=lambda text: print(f"  partial @ {time.perf_counter() - start:5.2f} s: {text}"))
+    print(f"final @ {time.perf_counter() - start:5.2f} s: {final}")
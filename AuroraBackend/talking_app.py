@@ -1,33 +1,57 @@
-from flask import Flask, render_template, request, jsonify, send_file
-import json
+from flask import Flask, Blueprint, render_template, url_for, request, jsonify, send_file
 import os
-import glob
-from gtts import gTTS
-import pygame
 import speech_recognition as sr
 import tempfile
 import threading
 import time
+from contextlib import nullcontext
 from datetime import datetime
+from session_store import get_store, DEFAULT_PAGE_SIZE, QUESTIONS_FOLDER
+from interview_events import events, analysis_url
+from tts_cache import SpeechAudioCache
+from audio_player import AudioPlayer
+from speech_capture import ListenService, FAILED_RESPONSES
+from noise_calibration import AmbientCalibrator
 
-app = Flask(__name__)
+# Routes, registered on the standalone app below or on interview_app's combined app
+blueprint = Blueprint('talking', __name__)
 
-# Configure shared questions folder - use absolute path based on current file location
-QUESTIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
+# Configure shared questions folder - shared with thinking_app through session_store
 os.makedirs(QUESTIONS_FOLDER, exist_ok=True)
 
+# Sessions shared with thinking_app; answers are updated row by row instead of rewriting the file
+session_store = get_store()
+
+# 'google' records the whole answer and then recognises it; 'transcribe' or 'offline'
+# recognise while the candidate speaks and return partial transcripts to the page's polls
+SPEECH_RECOGNIZER = os.environ.get('SPEECH_RECOGNIZER', 'google')
+
+# Seconds between the page's polls of /api/listen_result while a capture runs
+LISTEN_POLL_INTERVAL = 0.5
+
 class TalkingChatbot:
     def __init__(self):
         self.recognizer = sr.Recognizer()
         self.microphone = None
-        pygame.mixer.init()
+        self.audio_cache = SpeechAudioCache(lang='en', slow=False)
+        self.player = AudioPlayer()
+        self.streaming_listener = None
+        
+        if SPEECH_RECOGNIZER in ('transcribe', 'offline'):
+            from streaming_recognition import StreamingListener, TranscribeRecognizer, OfflineRecognizer
+            if SPEECH_RECOGNIZER == 'transcribe':
+                self.streaming_listener = StreamingListener(TranscribeRecognizer)
+            else:
+                self.streaming_listener = StreamingListener(OfflineRecognizer)
+        
+        self.calibrator = None
         
         # Try to initialize microphone, but don't fail if it's not available
         try:
             self.microphone = sr.Microphone()
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source)
+            # Track the room's noise floor in the background instead of blocking startup
+            self.calibrator = AmbientCalibrator(self.recognizer, self.microphone,
+                                                is_idle=lambda: not self.player.playing).start()
             print("Microphone initialized successfully")
         except Exception as e:
             print(f"Warning: Could not initialize microphone: {e}")
@@ -39,54 +63,23 @@ class TalkingChatbot:
             # Clean the text for TTS (remove markdown formatting)
             clean_text = self.clean_text_for_speech(text)
             
-            tts = gTTS(text=clean_text, lang='en', slow=False)
-            
-            # Create temp directory if it doesn't exist
-            temp_dir = os.path.join(os.getcwd(), 'temp')
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            # Create a unique filename
-            temp_filename = f"tts_{int(time.time() * 1000)}.mp3"
-            temp_path = os.path.join(temp_dir, temp_filename)
-            
-            # Save TTS audio to file
-            tts.save(temp_path)
-            
-            # Verify file exists before playing
-            if not os.path.exists(temp_path):
-                raise Exception(f"TTS file was not created: {temp_path}")
-            
-            # Play the audio
-            pygame.mixer.music.load(temp_path)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+            # Usually already synthesised in the background when the session started
+            start = time.perf_counter()
+            audio = self.audio_cache.get(clean_text)
+            print(f"Question audio ready in {(time.perf_counter() - start) * 1000:.0f} ms")
             
-            # Clean up - ensure pygame is completely done
-            pygame.mixer.music.unload()  # Explicitly unload the music
-            time.sleep(1.0)  # Give more time for pygame to release the file
-            
-            # Try to delete the file with retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                        break
-                except Exception as cleanup_error:
-                    if attempt == max_retries - 1:  # Last attempt
-                        print(f"Warning: Could not delete temp file {temp_path} after {max_retries} attempts: {cleanup_error}")
-                    else:
-                        time.sleep(0.5)  # Wait before retrying
-                
+            # Play from memory and wait for the end-of-playback event
+            self.player.play_and_wait(audio)
             return True
             
         except Exception as e:
             print(f"Error in text-to-speech: {e}")
             return False
     
+    def prefetch_questions(self, questions):
+        """Synthesise the audio for a session's questions in the background"""
+        self.audio_cache.prefetch([self.clean_text_for_speech(question) for question in questions])
+    
     def clean_text_for_speech(self, text):
         """Clean text for better speech synthesis"""
         # Remove markdown formatting
@@ -109,23 +102,54 @@ class TalkingChatbot:
     
     def listen_for_response(self, timeout=30):
         """Listen for user's spoken response"""
+        audio = self.capture_audio(timeout)
+        if isinstance(audio, str):
+            return audio
+        return self.recognize_audio(audio)
+    
+    def capture_audio(self, timeout=30):
+        """Record the user's answer; returns AudioData, or a failure string"""
         if self.microphone is None:
             print("Microphone not available - cannot listen for response")
             return "MICROPHONE_NOT_AVAILABLE"
             
         try:
-            with self.microphone as source:
+            with self.calibrator.exclusive() if self.calibrator else nullcontext(), self.microphone as source:
                 print("Listening for response...")
                 # Listen for audio with timeout
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=60)
-                
+                return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=60)
+        except sr.WaitTimeoutError:
+            return "TIMEOUT"
+    
+    def stream_response(self, timeout=30, on_partial=None):
+        """Record and recognise at once, reporting partial transcripts; returns the text, or a failure string"""
+        from streaming_recognition import microphone_frames, RecognizerError
+        try:
+            with self.calibrator.exclusive() if self.calibrator else nullcontext():
+                frames = microphone_frames()
+                try:
+                    print("Listening for response (streaming)...")
+                    response = self.streaming_listener.listen(frames, timeout=timeout, on_partial=on_partial)
+                finally:
+                    frames.close()
+        except RecognizerError as e:
+            # Checked before OSError: a network failure inside the recogniser is not a microphone problem
+            print(f"Error with streaming speech recognition: {e}")
+            return "ERROR"
+        except OSError as e:
+            print(f"Warning: Could not open microphone: {e}")
+            return "MICROPHONE_NOT_AVAILABLE"
+        print(f"User said: {response}")
+        return response
+    
+    def recognize_audio(self, audio):
+        """Transcribe recorded audio; returns the text, or a failure string"""
+        try:
             # Recognize speech
             response = self.recognizer.recognize_google(audio)
             print(f"User said: {response}")
             return response
             
-        except sr.WaitTimeoutError:
-            return "TIMEOUT"
         except sr.UnknownValueError:
             return "UNKNOWN"
         except sr.RequestError as e:
@@ -135,51 +159,98 @@ class TalkingChatbot:
 # Global chatbot instance
 chatbot = TalkingChatbot()
 
-@app.route('/')
+def save_listen_result(listen):
+    """Immediately save a recognised response to avoid losing it"""
+    if listen.response in FAILED_RESPONSES:
+        return
+    # Create answer data
+    answer_data = {
+        'text': listen.response,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'type': 'voice_response',
+        'status': 'success'
+    }
+    
+    # Update answer and move to next
+    filename = listen.params['filename']
+    question_index = listen.params['question_index']
+    if record_answer(filename, question_index, answer_data) is None:
+        print(f"Error saving response: session {filename} has no question {question_index}")
+
+def record_answer(filename, question_index, answer_data):
+    """Store an answer and move to the next question; announces the session once its last question is answered"""
+    session_data = session_store.set_answer(filename, question_index, answer_data,
+                                            current_question=question_index + 1)
+    if session_data is not None and question_index + 1 == len(session_data['questions']):
+        events.publish('session_completed', filename=filename)
+    return session_data
+
+def prefetch_new_session(filename, session_id, questions):
+    """session_created handler: synthesise the questions before the candidate opens the session"""
+    chatbot.prefetch_questions(questions)
+
+events.subscribe('session_created', prefetch_new_session)
+
+# Recording and recognition run here, not on the request thread
+listen_service = ListenService(chatbot.capture_audio, chatbot.recognize_audio, on_result=save_listen_result,
+                               stream=chatbot.stream_response if chatbot.streaming_listener else None)
+
+@blueprint.route('/')
 def index():
-    return render_template('talking_index.html')
+    # Empty when served standalone, /talking inside interview_app
+    return render_template('talking_index.html', base_url=url_for('.index').rstrip('/'),
+                           listen_poll_ms=int(LISTEN_POLL_INTERVAL * 1000))
 
-@app.route('/health')
+@blueprint.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'talking_app'})
+    return jsonify({'status': 'healthy', 'service': 'talking_app', 'audio_cache': chatbot.audio_cache.stats(),
+                    'listen': listen_service.stats(),
+                    'noise_calibration': chatbot.calibrator.stats() if chatbot.calibrator else None})
 
-@app.route('/api/load_questions')
+@blueprint.route('/api/load_questions')
 def load_questions():
-    """Load available question files"""
+    """List question sessions, newest first, one page at a time"""
     try:
-        question_files = glob.glob(os.path.join(QUESTIONS_FOLDER, '*.json'))
-        files_info = []
-        
-        for file_path in question_files:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                files_info.append({
-                    'filename': os.path.basename(file_path),
-                    'session_id': data.get('session_id', 'Unknown'),
-                    'timestamp': data.get('timestamp', 'Unknown'),
-                    'total_questions': len(data.get('questions', [])),
-                    'current_question': data.get('current_question', 0)
-                })
-        
-        return jsonify({'files': files_info})
+        limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 500)
+        offset = int(request.args.get('offset', 0))
+        # Fetch one extra row to know whether another page exists
+        files = session_store.list_sessions(
+            limit=limit + 1,
+            offset=offset,
+            session_id=request.args.get('session_id'),
+            status=request.args.get('status'),
+            since=request.args.get('since'),
+            until=request.args.get('until'))
+        return jsonify({
+            'files': files[:limit],
+            'offset': offset,
+            'limit': limit,
+            'has_more': len(files) > limit
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/start_session/<filename>')
+@blueprint.route('/api/start_session/<filename>')
 def start_session(filename):
     """Start a question session with a specific file"""
     try:
-        file_path = os.path.join(QUESTIONS_FOLDER, filename)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = session_store.get_session(filename)
+        if data is None:
+            return jsonify({'error': f'Session not found: {filename}'}), 404
         
         current_q = data.get('current_question', 0)
         
+        # Synthesise the remaining questions now so speaking them is instant
+        chatbot.prefetch_questions(data['questions'][current_q:])
+        
         if current_q >= len(data['questions']):
             return jsonify({
                 'status': 'completed',
-                'message': 'All questions have been answered!'
+                'message': 'All questions have been answered!',
+                'analysis_url': analysis_url(filename)
             })
         
         return jsonify({
@@ -193,7 +264,7 @@ def start_session(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/speak_question', methods=['POST'])
+@blueprint.route('/api/speak_question', methods=['POST'])
 def speak_question():
     """Speak the current question"""
     try:
@@ -214,9 +285,12 @@ def speak_question():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/listen_response', methods=['POST'])
+@blueprint.route('/api/listen_response', methods=['POST'])
 def listen_response():
-    """Listen for user's response"""
+    """
+    Start listening for user's response; returns a token to poll with /api/listen_result/<token>,
+    which in streaming mode also carries the partial transcript
+    """
     try:
         data = request.json
         if not data:
@@ -229,48 +303,25 @@ def listen_response():
         if not all([filename, question_index is not None]):
             return jsonify({'error': 'Missing filename or question_index'}), 400
         
-        # Listen for response
-        response = chatbot.listen_for_response(timeout=timeout)
-        
-        # Immediately save the response to avoid losing it
-        if response not in ['TIMEOUT', 'UNKNOWN', 'ERROR']:
-            try:
-                file_path = os.path.join(QUESTIONS_FOLDER, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    session_data = json.load(f)
-                
-                # Create answer data
-                answer_data = {
-                    'text': response,
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'type': 'voice_response',
-                    'status': 'success'
-                }
-                
-                # Update answer
-                session_data['answers'][question_index] = answer_data
-                session_data['current_question'] = question_index + 1
-                
-                # Save updated data
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(session_data, f, indent=2, ensure_ascii=False)
-                    
-            except Exception as save_error:
-                print(f"Error saving response: {save_error}")
-                # Continue even if save fails, we'll return the response anyway
-        
-        return jsonify({
-            'response': response,
-            'status': 'success' if response not in ['TIMEOUT', 'UNKNOWN', 'ERROR'] else 'failed',
-            'filename': filename,
-            'question_index': question_index
-        })
+        listen = listen_service.start(timeout=timeout, filename=filename, question_index=question_index)
+        return jsonify(listen.to_dict()), 202
         
     except Exception as e:
         print(f"Error in listen_response: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/save_answer', methods=['POST'])
+@blueprint.route('/api/listen_result/<token>')
+def listen_result(token):
+    """
+    State of a capture, with the response once recognised. Returns at once: the page
+    polls every LISTEN_POLL_INTERVAL seconds, so no request thread waits on a microphone.
+    """
+    listen = listen_service.get(token)
+    if listen is None:
+        return jsonify({'error': 'Unknown or expired listen token'}), 404
+    return jsonify(listen.to_dict())
+
+@blueprint.route('/api/save_answer', methods=['POST'])
 def save_answer():
     """Save user's answer to the questions file (fallback for when immediate save fails)"""
     try:
@@ -294,12 +345,6 @@ def save_answer():
                 'received_data': data
             }), 400
         
-        file_path = os.path.join(QUESTIONS_FOLDER, filename)
-        
-        # Load current data
-        with open(file_path, 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
-        
         # Create answer data
         answer_data = {
             'text': answer,
@@ -308,19 +353,17 @@ def save_answer():
             'status': 'success'
         }
         
-        # Update answer
-        session_data['answers'][question_index] = answer_data
-        session_data['current_question'] = question_index + 1
-        
-        # Save updated data
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        # Update answer and move to next in one transaction
+        session_data = record_answer(filename, question_index, answer_data)
+        if session_data is None:
+            return jsonify({'error': f'Session not found: {filename}'}), 404
         
         # Check if there are more questions
         if session_data['current_question'] >= len(session_data['questions']):
             return jsonify({
                 'status': 'completed',
-                'message': 'All questions completed! Great job!'
+                'message': 'All questions completed! Great job!',
+                'analysis_url': analysis_url(filename)
             })
         
         next_question = session_data['questions'][session_data['current_question']]
@@ -336,7 +379,7 @@ def save_answer():
         print(f"Error saving answer: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/skip_question', methods=['POST'])
+@blueprint.route('/api/skip_question', methods=['POST'])
 def skip_question():
     """Skip to the next question"""
     try:
@@ -347,12 +390,6 @@ def skip_question():
         if not all([filename, question_index is not None]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        file_path = os.path.join(QUESTIONS_FOLDER, filename)
-        
-        # Load current data
-        with open(file_path, 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
-        
         # Create a structured skip record
         skip_data = {
             'text': 'SKIPPED',
@@ -362,18 +399,16 @@ def skip_question():
         }
         
         # Update answer and move to next
-        session_data['answers'][question_index] = skip_data
-        session_data['current_question'] = question_index + 1
-        
-        # Save updated data
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        session_data = record_answer(filename, question_index, skip_data)
+        if session_data is None:
+            return jsonify({'error': f'Session not found: {filename}'}), 404
         
         # Check if there are more questions
         if session_data['current_question'] >= len(session_data['questions']):
             return jsonify({
                 'status': 'completed',
-                'message': 'All questions completed!'
+                'message': 'All questions completed!',
+                'analysis_url': analysis_url(filename)
             })
         
         next_question = session_data['questions'][session_data['current_question']]
@@ -388,6 +423,9 @@ def skip_question():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+app = Flask(__name__)
+app.register_blueprint(blueprint)
+
 if __name__ == '__main__':
     # Create questions directory if it doesn't exist
     os.makedirs(QUESTIONS_FOLDER, exist_ok=True)
@@ -1,7 +1,9 @@
+import os
+import tempfile
 import cv2
-from pyzbar import pyzbar
+from qr_gate import QRScanGate
 from pymongo import MongoClient
-import tempfile
+from captureImage import encode_jpeg, ImageSpool
 
 # Load the pre-trained Haar Cascade for face detection
 face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
@@ -16,9 +18,16 @@ except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
     exit()
 
+# Skips pyzbar on frames where nothing changed in front of the camera
+qr_gate = QRScanGate()
+
+# Bounded spool so captures do not pile up in the temp directory. It has its own folder:
+# evicting from the shared SPOOL_DIR could delete selfies the pipeline still has to upload.
+spool = ImageSpool(os.path.join(tempfile.gettempdir(), "aurora_qr_spool"), max_files=50)
+
 def decode_qr(frame):
     """Function to decode QR code and return the name if found in MongoDB."""
-    qr_codes = pyzbar.decode(frame)
+    qr_codes = qr_gate.decode(frame)
 
     for qr_code in qr_codes:
         qr_data = qr_code.data.decode('utf-8')
@@ -32,16 +41,21 @@ def decode_qr(frame):
 
     return False, None, frame
 
-def capture_image_temp(frame):
-    """Function to capture and return the image as a temporary file."""
-    temp_file = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-    cv2.imwrite(temp_file.name, frame)
-    print(f"Image captured and stored temporarily at {temp_file.name}")
-    return temp_file
+def capture_image_bytes(frame, quality=90, spool=None, name="capture"):
+    """Function to encode the image in memory, optionally keeping a copy in a bounded spool."""
+    image = encode_jpeg(frame, quality)
+    if image is None:
+        return None
+    print(f"Image captured in memory ({image.nbytes} bytes)")
+    if spool is not None:
+        path = spool.write(f"{name}.jpg", image)
+        print(f"Image spooled at {path}")
+    return image
 
 def detect_face(name):
-    """Function to detect a human face using Haar Cascade and return the temp file of the image."""
+    """Function to detect a human face using Haar Cascade and return the encoded image."""
     cap = cv2.VideoCapture(0)
+    image = None
 
     if not cap.isOpened():
         print("Error: Could not open video capture.")
@@ -56,10 +70,10 @@ def detect_face(name):
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
 
-        # If a face is detected, capture and return the image as a temporary file
+        # If a face is detected, capture and return the image as JPEG bytes
         if len(faces) > 0:
             print(f"Detected {len(faces)} face(s).")
-            temp_file = capture_image_temp(frame)
+            image = capture_image_bytes(frame, spool=spool, name=name)
             break
 
         # Show the live feed for face detection
@@ -71,7 +85,7 @@ def detect_face(name):
     cap.release()
     cv2.destroyAllWindows()
 
-    return temp_file
+    return image
 
 def main():
     """Main function to execute both QR code scanning and face detection."""
@@ -103,11 +117,11 @@ def main():
     cv2.destroyAllWindows()
 
     if found:
-        # Start face detection loop after QR code is scanned and return the temp image file
-        temp_file = detect_face(name)
-        return temp_file
+        # Start face detection loop after QR code is scanned and return the encoded image
+        return detect_face(name)
 
 if __name__ == '__main__':
-    temp_image_file = main()
-    print(f"Temporary image file stored at: {temp_image_file.name}")
+    image = main()
+    if image is not None:
+        print(f"Captured image: {image.nbytes} bytes")
 
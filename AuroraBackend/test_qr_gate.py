@@ -0,0 +1,136 @@
+"""
+Feeds synthetic frames through QRScanGate with pyzbar's decoder replaced by a
+stub, and checks which frames reach a full or ROI decode.
+
+    python -m pytest test_qr_gate.py
+"""
+
+from collections import namedtuple
+
+import pytest
+
+np = pytest.importorskip("numpy")
+# pyzbar raises ImportError, not ModuleNotFoundError, when the zbar library is missing
+pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)
+
+import qr_gate
+from pyzbar.locations import Point, Rect
+from qr_gate import QRScanGate
+
+HEIGHT, WIDTH = 240, 320
+CODE = Rect(64, 64, 64, 64)
+
+Decoded = namedtuple('Decoded', 'data type rect polygon')
+
+
+def blank_frame(level=128):
+    return np.full((HEIGHT, WIDTH), level, dtype=np.uint8)
+
+
+def code_frame(rect=CODE, cell=8):
+    """A flat frame with a checkerboard patch, dense in edges like a finder pattern"""
+    frame = blank_frame()
+    x, y, w, h = rect
+    rows, cols = np.indices((h, w))
+    frame[y:y + h, x:x + w] = np.where((rows // cell + cols // cell) % 2, 255, 0)
+    return frame
+
+
+class StubDecoder:
+    """Stands in for pyzbar.decode: finds the patch of code_frame() in whatever it is given"""
+
+    def __init__(self, rect=CODE):
+        self.rect = rect
+        self.calls = []
+
+    def __call__(self, image):
+        full = image.shape[:2] == (HEIGHT, WIDTH)
+        self.calls.append('full' if full else 'roi')
+        if not full:
+            # Crops are taken around the tracked ROI, so the code sits just inside the margin
+            x, y, w, h = self.rect
+            margin_x, margin_y = int(w * 0.25), int(h * 0.25)
+            return [self.code(Rect(margin_x, margin_y, w, h))]
+        if image[self.rect.top, self.rect.left] == 128:
+            return []
+        return [self.code(self.rect)]
+
+    @staticmethod
+    def code(rect):
+        x, y, w, h = rect
+        return Decoded(b'student-42', 'QRCODE', rect,
+                       [Point(x, y), Point(x, y + h), Point(x + w, y + h), Point(x + w, y)])
+
+
+@pytest.fixture
+def decoder(monkeypatch):
+    stub = StubDecoder()
+    monkeypatch.setattr(qr_gate.pyzbar, "decode", stub)
+    return stub
+
+
+def test_unchanged_frame_skips_decoding(decoder):
+    gate = QRScanGate()
+
+    gate.decode(blank_frame())
+    for _ in range(20):
+        assert gate.decode(blank_frame()) == []
+
+    # Only the first frame, with nothing to compare against, was decoded
+    assert decoder.calls == ['full']
+    assert gate.stats()['skipped'] == 20
+
+
+def test_small_noise_is_not_motion(decoder):
+    gate = QRScanGate()
+    gate.decode(blank_frame())
+
+    gate.decode(blank_frame(level=129))
+
+    assert decoder.calls == ['full']
+
+
+def test_changed_block_triggers_a_full_decode(decoder):
+    gate = QRScanGate()
+    gate.decode(blank_frame())
+    gate.decode(blank_frame())
+
+    results = gate.decode(code_frame())
+
+    assert decoder.calls == ['full', 'full']
+    assert [result.data for result in results] == [b'student-42']
+    assert gate.roi == tuple(CODE)
+
+
+def test_roi_results_are_in_frame_coordinates(decoder):
+    gate = QRScanGate(motion_threshold=0)
+    gate.decode(code_frame())
+
+    results = gate.decode(code_frame())
+
+    assert decoder.calls == ['full', 'roi']
+    assert tuple(results[0].rect) == tuple(CODE)
+    assert results[0].polygon[0] == Point(CODE.left, CODE.top)
+
+
+def test_full_decode_every_full_every_frames_while_tracking(decoder):
+    gate = QRScanGate(motion_threshold=0, full_every=5)
+
+    for _ in range(15):
+        gate.decode(code_frame())
+
+    assert decoder.calls == (['full'] + ['roi'] * 4) * 3
+    assert gate.stats()['full_decodes'] == 3
+    assert gate.stats()['roi_decodes'] == 12
+
+
+def test_still_code_is_decoded_after_max_skip(decoder):
+    gate = QRScanGate(max_skip=5)
+    gate.decode(code_frame())
+
+    for _ in range(5):
+        gate.decode(code_frame())
+    assert decoder.calls == ['full']
+
+    gate.decode(code_frame())
+    assert decoder.calls == ['full', 'roi']
@@ -0,0 +1,138 @@
+"""
+Streams canned Bedrock replies through thinking_app.generate_questions_stream,
+including truncated, garbage and failing ones, and checks which questions
+are reported as padded and what upload_events caches.
+
+    python -m pytest test_question_generation.py
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("boto3")
+pytest.importorskip("jsonschema")
+
+import thinking_app
+from question_format import PREFILL, QUESTION_COUNT
+
+KEYWORDS = ["python", "docker", "kubernetes"]
+QUESTIONS = [f"How would you use technology number {n} in a production system?"
+             for n in range(1, QUESTION_COUNT + 1)]
+
+
+def reply(questions):
+    """The model's text after the prefill for a JSON object holding `questions`"""
+    text = json.dumps({f"q{n}": q for n, q in enumerate(questions, 1)}, indent=2)
+    assert text.startswith(PREFILL)
+    return text[len(PREFILL):]
+
+
+class FakeBedrock:
+    """Replays `text` as converse_stream deltas, optionally failing after `fail_after` characters"""
+
+    def __init__(self, text="", fail_after=None, stop_reason="end_turn", error=None):
+        self.text = text
+        self.fail_after = fail_after
+        self.stop_reason = stop_reason
+        self.error = error
+
+    def converse_stream(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return {'stream': self.events()}
+
+    def events(self):
+        for start in range(0, len(self.text), 7):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise ConnectionError("stream reset")
+            yield {'contentBlockDelta': {'delta': {'text': self.text[start:start + 7]}}}
+        yield {'messageStop': {'stopReason': self.stop_reason}}
+        yield {'metadata': {'usage': {'outputTokens': len(self.text) // 4}}}
+
+
+def generate(monkeypatch, client):
+    monkeypatch.setattr(thinking_app, "bedrock_client", client)
+    status = {}
+    questions = list(thinking_app.generate_questions_stream(KEYWORDS, status))
+    return questions, status
+
+
+def test_complete_reply_is_not_padded(monkeypatch):
+    questions, status = generate(monkeypatch, FakeBedrock(reply(QUESTIONS)))
+
+    assert questions == [f"{n}. {q}" for n, q in enumerate(QUESTIONS, 1)]
+    assert status == {'complete': True, 'padded': []}
+
+
+def test_truncated_reply_pads_the_missing_questions(monkeypatch):
+    text = reply(QUESTIONS)
+    cut = text.index('"q3"') + len('"q3": "How would')
+    questions, status = generate(monkeypatch, FakeBedrock(text[:cut], stop_reason="max_tokens"))
+
+    assert questions[:2] == [f"1. {QUESTIONS[0]}", f"2. {QUESTIONS[1]}"]
+    assert len(questions) == QUESTION_COUNT
+    assert status['padded'] == [3, 4, 5]
+    assert status['complete'] is False
+
+
+def test_stream_failing_after_one_question_is_padded(monkeypatch):
+    text = reply(QUESTIONS)
+    questions, status = generate(monkeypatch, FakeBedrock(text, fail_after=text.index('"q2"')))
+
+    assert questions[0] == f"1. {QUESTIONS[0]}"
+    assert len(questions) == QUESTION_COUNT
+    assert status['padded'] == [2, 3, 4, 5]
+    assert status['complete'] is False
+
+
+@pytest.mark.parametrize("text", [
+    "I'm sorry, I can't help with that.",
+    'too short", "q2": "?"',
+    "",
+])
+def test_reply_without_valid_questions_uses_fallback(monkeypatch, text):
+    questions, status = generate(monkeypatch, FakeBedrock(text))
+
+    assert questions == thinking_app.FALLBACK_QUESTIONS
+    assert status['padded'] == list(range(1, QUESTION_COUNT + 1))
+    assert status['complete'] is False
+
+
+def test_bedrock_error_uses_fallback(monkeypatch):
+    questions, status = generate(monkeypatch, FakeBedrock(error=ConnectionError("no route to host")))
+
+    assert questions == thinking_app.FALLBACK_QUESTIONS
+    assert status['complete'] is False
+
+
+class RecordingCache:
+    def __init__(self):
+        self.entries = {}
+
+    def put(self, key, value):
+        self.entries[key] = value
+
+
+@pytest.mark.parametrize("text, cached", [
+    (reply(QUESTIONS), True),
+    (reply(QUESTIONS)[:80], False),
+    ("not json at all", False),
+])
+def test_upload_events_caches_only_complete_questions(monkeypatch, text, cached):
+    cache = RecordingCache()
+    monkeypatch.setattr(thinking_app, "analysis_cache", cache)
+    monkeypatch.setattr(thinking_app, "save_questions_to_file", lambda questions, session_id: "questions_test.json")
+    monkeypatch.setattr(thinking_app, "bedrock_client", FakeBedrock(text))
+
+    generation = {'complete': False, 'padded': []}
+    analysis = {'matched_keywords': KEYWORDS, 'categorized_keywords': {}, 'session_id': "test", 'cached': False}
+    events = list(thinking_app.upload_events(thinking_app.generate_questions_stream(KEYWORDS, generation),
+                                             analysis, 0.0, "key", {'text': "resume"}, generation))
+
+    done = events[-1]
+    assert done['type'] == 'done'
+    assert len(done['questions']) == QUESTION_COUNT
+    assert ("key" in cache.entries) == cached
+    assert bool(done['padded_questions']) != cached
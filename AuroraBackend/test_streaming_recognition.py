@@ -0,0 +1,151 @@
+"""
+Streams synthetic frames through StreamingListener with the OfflineRecognizer
+stand-in, and checks that recogniser failures reach the page as 'ERROR'.
+
+    python -m pytest test_streaming_recognition.py
+"""
+
+import importlib.util
+from array import array
+
+import pytest
+
+pytest.importorskip("webrtcvad")
+
+from speech_capture import ListenService
+from streaming_recognition import (FRAME_DURATION, SAMPLE_RATE, OfflineRecognizer, RecognizerError,
+                                   StreamingListener, TranscribeRecognizer)
+
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_DURATION // 1000
+TRANSCRIPT = "i would shard the table by customer id"
+
+
+def tone_frame(amplitude=8000, period=40):
+    """One frame of a square wave; loud enough for EnergyVad to call it speech"""
+    return array('h', (amplitude if i % period < period // 2 else -amplitude
+                       for i in range(FRAME_SAMPLES))).tobytes()
+
+
+def silent_frame():
+    return bytes(FRAME_SAMPLES * 2)
+
+
+def answer_frames(lead_silence=0.3, speech=2.0, trailing_silence=1.0):
+    """Silence, then `speech` seconds of tone, then silence, as 30 ms frames"""
+    frames_per_second = 1000 // FRAME_DURATION
+    return ([silent_frame()] * int(lead_silence * frames_per_second) +
+            [tone_frame()] * int(speech * frames_per_second) +
+            [silent_frame()] * int(trailing_silence * frames_per_second))
+
+
+class EnergyVad:
+    """Deterministic stand-in for webrtcvad: any frame with signal is speech"""
+
+    def is_speech(self, frame, sample_rate):
+        return max(array('h', frame)) > 1000
+
+
+class FailingRecognizer:
+    def accept(self, frame):
+        raise RecognizerError("network unreachable")
+
+    def finish(self):
+        raise RecognizerError("network unreachable")
+
+
+def make_listener(recognizer_factory):
+    listener = StreamingListener(recognizer_factory)
+    listener.vad = EnergyVad()
+    return listener
+
+
+def test_partials_grow_and_final_transcript_is_returned():
+    partials = []
+    listener = make_listener(lambda: OfflineRecognizer(TRANSCRIPT))
+
+    final = listener.listen(iter(answer_frames()), timeout=5, on_partial=partials.append)
+
+    assert final == TRANSCRIPT
+    assert partials, "no partial transcript was reported while speaking"
+    assert len(partials) == len(set(partials)), "a partial was reported twice"
+    for shorter, longer in zip(partials, partials[1:]):
+        assert longer.startswith(shorter)
+    assert TRANSCRIPT.startswith(partials[-1])
+
+
+def test_answer_ends_after_trailing_silence():
+    consumed = []
+
+    def frames():
+        for frame in answer_frames(trailing_silence=5.0):
+            consumed.append(frame)
+            yield frame
+
+    make_listener(lambda: OfflineRecognizer(TRANSCRIPT)).listen(frames(), timeout=5)
+
+    # 0.3 s lead-in + 2 s speech + END_SILENCE (0.6 s), not the whole 5 s of trailing silence
+    assert len(consumed) * FRAME_DURATION / 1000 < 3.5
+
+
+def test_silence_times_out_without_starting_a_recogniser():
+    created = []
+
+    def factory():
+        created.append(True)
+        return OfflineRecognizer(TRANSCRIPT)
+
+    final = make_listener(factory).listen(iter([silent_frame()] * 100), timeout=1)
+
+    assert final == "TIMEOUT"
+    assert not created
+
+
+def test_short_noise_burst_is_not_an_answer():
+    frames = [silent_frame()] * 5 + [tone_frame()] * 2 + [silent_frame()] * 60
+    assert make_listener(lambda: OfflineRecognizer(TRANSCRIPT)).listen(iter(frames), timeout=1) == "TIMEOUT"
+
+
+def test_listen_service_returns_partial_then_result():
+    listener = make_listener(lambda: OfflineRecognizer(TRANSCRIPT))
+
+    def stream(timeout, on_partial):
+        return listener.listen(iter(answer_frames()), timeout=timeout, on_partial=on_partial)
+
+    service = ListenService(capture=None, recognize=None, stream=stream)
+    request = service.start(timeout=5, filename="session.json", question_index=0)
+    assert request.done.wait(10)
+
+    # What the page's last poll sees: the latest partial, then the final response
+    result = request.to_dict()
+    assert result['state'] == 'done'
+    assert result['status'] == 'success'
+    assert result['response'] == TRANSCRIPT
+    assert TRANSCRIPT.startswith(result['partial'])
+
+
+def test_recognizer_failure_is_reported_as_error():
+    listener = make_listener(FailingRecognizer)
+
+    with pytest.raises(RecognizerError):
+        listener.listen(iter(answer_frames()), timeout=5)
+
+    def stream(timeout, on_partial):
+        return listener.listen(iter(answer_frames()), timeout=timeout, on_partial=on_partial)
+
+    service = ListenService(capture=None, recognize=None, stream=stream)
+    request = service.start(timeout=5, filename="session.json", question_index=0)
+    assert request.done.wait(10)
+    assert request.to_dict()['response'] == 'ERROR'
+    assert request.to_dict()['status'] == 'failed'
+
+
+@pytest.mark.skipif(importlib.util.find_spec("amazon_transcribe") is not None,
+                    reason="amazon_transcribe is installed; this checks the failure when it is missing")
+def test_transcribe_failure_reaches_finish():
+    recognizer = TranscribeRecognizer()
+    recognizer.thread.join(5)
+
+    with pytest.raises(RecognizerError):
+        recognizer.accept(silent_frame())
+    with pytest.raises(RecognizerError):
+        recognizer.finish()
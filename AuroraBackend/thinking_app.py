@@ -1,18 +1,29 @@
-from flask import Flask, request, render_template, jsonify, redirect, url_for, session
+from flask import Flask, Blueprint, request, render_template, jsonify, redirect, url_for, session, Response, stream_with_context
 import os
-import PyPDF2
-import re
 import json
-import datetime
 import uuid
-from io import BytesIO
+import hashlib
 import time
+import threading
 import boto3
+from botocore.config import Config
+from pdf_extract import extract_text, spool_upload
+from keyword_engine import KeywordMatcher
+from analysis_cache import AnalysisCache, cache_key
+from session_store import get_store, QUESTIONS_FOLDER
+from interview_events import events, analysis_url
+from resume_keywords import TECHNICAL_KEYWORDS
+from question_format import (QuestionStream, PREFILL, STOP_SEQUENCES, QUESTION_COUNT, format_instructions,
+                             numbered)
+
+# Routes, registered on the standalone app below or on interview_app's combined app
+blueprint = Blueprint('thinking', __name__)
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)  # Required for session
+# Required for session; serve.py shares one key between worker processes so their cookies agree
+app.secret_key = os.environ.get('FLASK_SECRET_KEY') or os.urandom(24)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['QUESTIONS_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_questions")
+app.config['QUESTIONS_FOLDER'] = QUESTIONS_FOLDER
 
 # Create required directories
 os.makedirs(app.config['QUESTIONS_FOLDER'], exist_ok=True)
@@ -21,104 +32,95 @@ os.makedirs(app.config['QUESTIONS_FOLDER'], exist_ok=True)
 AWS_REGION = "us-east-1"  # Change as needed
 BEDROCK_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"  # Example model, update as needed
 
-# Initialize Bedrock client
-bedrock_client = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+# Bedrock calls in flight at once; matches the request threads of one serve.py worker
+BEDROCK_POOL_CONNECTIONS = 32
+
+# Initialize Bedrock client, shared by all request threads for its connection pool.
+# BEDROCK_ENDPOINT_URL points it at a local stand-in such as mock_bedrock.py.
+bedrock_client = boto3.client("bedrock-runtime", region_name=AWS_REGION,
+                              endpoint_url=os.environ.get("BEDROCK_ENDPOINT_URL"),
+                              config=Config(max_pool_connections=BEDROCK_POOL_CONNECTIONS))
+
+# Seconds between background Bedrock health probes
+BEDROCK_HEALTH_INTERVAL = 60
 
-# Predefined technical keywords
-TECHNICAL_KEYWORDS = {
-    'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'kotlin', 'swift', 'typescript'],
-    'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 'oracle', 'sqlite', 'nosql'],
-    'cloud_platforms': ['aws', 'azure', 'gcp', 'google cloud', 'cloud computing', 'docker', 'kubernetes', 'terraform'],
-    'frameworks': ['django', 'flask', 'react', 'angular', 'vue', 'spring', 'express', 'laravel', 'rails'],
-    'data_science': ['machine learning', 'deep learning', 'data science', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'ai', 'artificial intelligence'],
-    'tools': ['git', 'jenkins', 'jira', 'confluence', 'slack', 'docker', 'linux', 'bash', 'powershell'],
-    'web_technologies': ['html', 'css', 'rest api', 'graphql', 'json', 'xml', 'microservices', 'api']
-}
+# Last known Bedrock health. Refreshed only by the background probe, so uploads no
+# longer pay for a probe invocation and one failed generation does not shut uploads out.
+bedrock_health = {'ok': None, 'checked_at': None, 'error': None}
+_health_lock = threading.Lock()
+_health_thread = None
+
+# Questions used when Bedrock returns nothing
+FALLBACK_QUESTIONS = [
+    "1. Can you explain your experience with the main technologies in your resume?",
+    "2. Describe a challenging project you worked on and how you solved technical problems.",
+    "3. How do you stay updated with the latest developments in your technical stack?",
+    "4. Walk me through your approach to debugging a complex issue.",
+    "5. What best practices do you follow when working with your primary technologies?"
+]
 
 # Flatten all keywords into a single list for matching
 ALL_KEYWORDS = []
 for category, keywords in TECHNICAL_KEYWORDS.items():
     ALL_KEYWORDS.extend(keywords)
 
+# One precompiled matcher for all keywords, built once at startup
+keyword_matcher = KeywordMatcher(TECHNICAL_KEYWORDS)
+
+# Results of previous uploads, keyed by PDF hash, keyword-set version and model id
+analysis_cache = AnalysisCache()
+
+# Questions and answers per session, shared with the other stages and exported to QUESTIONS_FOLDER as JSON
+session_store = get_store()
+
 def check_bedrock_connection():
     """Check if AWS Bedrock is accessible"""
     try:
-        prompt = "Hello"
-        body = {
-            "prompt": prompt,
-            "max_tokens": 10
-        }
-        response = bedrock_client.invoke_model(
+        bedrock_client.converse(
             modelId=BEDROCK_MODEL_ID,
-            body=json.dumps(body),
-            contentType="application/json",
-            accept="application/json"
+            messages=[{"role": "user", "content": [{"text": "Hello"}]}],
+            inferenceConfig={"maxTokens": 1}
         )
-        # The structure of the result depends on the model; adjust as needed
+        set_bedrock_health(True)
         return True
     except Exception as e:
         print(f"Bedrock connection error: {e}")
+        set_bedrock_health(False, str(e))
         return False
 
-def generate_with_bedrock(prompt):
-    """Generate text using AWS Bedrock"""
-    try:
-        body = {
-            "prompt": prompt,
-            "max_tokens": 500,
-            "temperature": 0.7
-        }
-        response = bedrock_client.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps(body),
-            contentType="application/json",
-            accept="application/json"
-        )
-        result = json.loads(response['body'].read())
-        # The structure of the result depends on the model; adjust as needed
-        return result.get("completion", "").strip()
-    except Exception as e:
-        print(f"Error generating with Bedrock: {e}")
-        return None
+def set_bedrock_health(ok, error=None):
+    """Record the latest Bedrock health result"""
+    bedrock_health.update(ok=ok, checked_at=time.time(), error=error)
+
+def monitor_bedrock_health():
+    """Probe Bedrock periodically so requests can read the cached state"""
+    while True:
+        check_bedrock_connection()
+        time.sleep(BEDROCK_HEALTH_INTERVAL)
+
+def start_health_monitor():
+    """Start the background health probe once per process"""
+    global _health_thread
+    with _health_lock:
+        if _health_thread is None:
+            _health_thread = threading.Thread(target=monitor_bedrock_health, name='bedrock-health', daemon=True)
+            _health_thread.start()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() == 'pdf'
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from uploaded PDF file"""
-    try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        return f"Error reading PDF: {str(e)}"
-
 def find_matching_keywords(text):
-    """Find matching keywords in the extracted text"""
-    text_lower = text.lower()
-    matched_keywords = []
-    
-    for keyword in ALL_KEYWORDS:
-        # Use word boundaries to match whole words
-        pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            matched_keywords.append(keyword)
+    """Find matching keywords in the extracted text in a single pass"""
+    matched_keywords = keyword_matcher.find(text)
     
     # Categorize matched keywords
-    categorized_matches = {}
-    for category, keywords in TECHNICAL_KEYWORDS.items():
-        category_matches = [kw for kw in matched_keywords if kw in keywords]
-        if category_matches:
-            categorized_matches[category] = category_matches
+    categorized_matches = dict(keyword_matcher.categorize(matched_keywords))
     
     return matched_keywords, categorized_matches
 
-def generate_questions(keywords):
-    """Generate technical questions using AWS Bedrock based on matched keywords"""
-    # Create a more structured prompt for better question generation
-    prompt = f"""You are an experienced technical interviewer. Based on the following technical skills found in a candidate's resume: {', '.join(keywords[:10])}
+def build_question_prompt(keywords):
+    """Prompt asking Bedrock for 5 interview questions about the matched keywords, as JSON"""
+    return f"""You are an experienced technical interviewer. Based on the following technical skills found in a candidate's resume: {', '.join(keywords[:10])}
 
 Generate exactly 5 technical interview questions. Each question should:
 - Test practical knowledge and experience
@@ -126,114 +128,116 @@ Generate exactly 5 technical interview questions. Each question should:
 - Be challenging but fair for someone with these skills
 - Focus on real-world scenarios
 
-Format your response as a numbered list (1., 2., 3., 4., 5.) with each question on a new line.
+{format_instructions()}"""
+
+def padding_question(number, keywords):
+    """Generic question used when the model's reply is missing question `number`"""
+    topic = keywords[(number - 1) % len(keywords)] if keywords else 'software development'
+    return f"Tell me about your experience with {topic}."
 
-Questions:
-1."""
+def generate_questions_stream(keywords, status=None):
+    """
+    Yield technical questions one at a time as AWS Bedrock streams them.
 
+    :param status: Optional dict, filled in as the questions are yielded:
+                   status['padded'] lists the numbers of questions the model did not
+                   write (padded, or all of them for the fallback questions), and
+                   status['complete'] is True only if that list ended up empty
+    """
     print(f"Generating questions for keywords: {keywords[:10]}")  # Debug print
-    
-    response = generate_with_bedrock(prompt)
-    
-    if not response:
-        # Fallback questions if Bedrock fails
-        return [
-            "1. Can you explain your experience with the main technologies in your resume?",
-            "2. Describe a challenging project you worked on and how you solved technical problems.",
-            "3. How do you stay updated with the latest developments in your technical stack?",
-            "4. Walk me through your approach to debugging a complex issue.",
-            "5. What best practices do you follow when working with your primary technologies?"
-        ]
-    
-    # Parse the response to extract questions
-    lines = response.split('\n')
-    questions = []
-    
-    for line in lines:
-        line = line.strip()
-        # Look for numbered questions
-        if re.match(r'^\d+\.', line) and len(line) > 5:
-            questions.append(line)
-    
-    # If we don't have enough questions, try to extract any question-like sentences
-    if len(questions) < 5:
-        for line in lines:
-            line = line.strip()
-            if line.endswith('?') and len(line) > 20:
-                if not any(q.endswith(line) for q in questions):
-                    questions.append(line)
-    
-    # Ensure we have exactly 5 questions
-    questions = questions[:5]
-    
-    # If still not enough, pad with generic questions
-    while len(questions) < 5:
-        questions.append(f"{len(questions) + 1}. Tell me about your experience with {keywords[len(questions) % len(keywords)] if keywords else 'software development'}.")
-    
-    print(f"Generated {len(questions)} questions")  # Debug print
-    return questions
+    if status is None:
+        status = {}
+    status['complete'] = False
+    status['padded'] = []
+
+    start = time.perf_counter()
+    parser = QuestionStream()
+    yielded = 0
+    output_tokens = None
+    stop_reason = None
+    failed = False
+    try:
+        response = bedrock_client.converse_stream(
+            modelId=BEDROCK_MODEL_ID,
+            messages=[
+                {"role": "user", "content": [{"text": build_question_prompt(keywords)}]},
+                {"role": "assistant", "content": [{"text": PREFILL}]}
+            ],
+            inferenceConfig={"maxTokens": 500, "temperature": 0.7, "stopSequences": STOP_SEQUENCES}
+        )
+        for event in response['stream']:
+            if 'messageStop' in event:
+                stop_reason = event['messageStop'].get('stopReason')
+            elif 'metadata' in event:
+                output_tokens = event['metadata'].get('usage', {}).get('outputTokens')
+            delta = event.get('contentBlockDelta', {}).get('delta', {}).get('text')
+            if not delta:
+                continue
+            # Questions must reach the page in order, so a later one waits for any gap before it
+            parser.feed(delta)
+            while yielded + 1 in parser.questions:
+                yielded += 1
+                yield numbered(yielded, parser.questions[yielded])
+    except Exception as e:
+        print(f"Error generating with Bedrock: {e}")
+        failed = True
+
+    if not parser.questions:
+        # Fallback questions if Bedrock fails or its reply holds no valid question
+        if not failed:
+            print(f"No valid question in Bedrock reply ({stop_reason}, {parser.rejected} rejected)")
+        status['padded'] = list(range(1, QUESTION_COUNT + 1))
+        yield from FALLBACK_QUESTIONS
+        return
+
+    # Repair whatever arrived rather than asking the model again: keep every valid
+    # question and fill the gaps
+    questions, errors = parser.result()
+    status['complete'] = parser.complete
+    if errors:
+        print(f"Repaired question output ({stop_reason}, {parser.rejected} rejected): {'; '.join(errors)}")
+    for number in range(yielded + 1, QUESTION_COUNT + 1):
+        question = questions.get(f"q{number}")
+        if question is None:
+            status['padded'].append(number)
+            question = padding_question(number, keywords)
+        yield numbered(number, question)
+
+    print(f"Generated {QUESTION_COUNT} questions in {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"{output_tokens if output_tokens is not None else '?'} output tokens, stop reason {stop_reason}")
+
+def generate_questions(keywords):
+    """Generate technical questions using AWS Bedrock based on matched keywords"""
+    return list(generate_questions_stream(keywords))
 
 def save_questions_to_file(questions, session_id):
-    """Save generated questions to a file"""
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"questions_{session_id}_{timestamp}.json"
-    filepath = os.path.join(app.config['QUESTIONS_FOLDER'], filename)
-    
-    data = {
-        'session_id': session_id,
-        'timestamp': timestamp,
-        'questions': questions,
-        'answers': [None] * len(questions),  # Initialize empty answers
-        'current_question': 0
-    }
-    
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    return filename
+    """Save generated questions to the session store (and its JSON export)"""
+    return session_store.create_session(questions, session_id)
 
 def load_questions_file(filename):
-    """Load questions and answers from file"""
-    filepath = os.path.join(app.config['QUESTIONS_FOLDER'], filename)
+    """Load questions and answers for a session"""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except:
+        return session_store.get_session(filename)
+    except Exception:
         return None
 
 def save_answer_to_file(filename, question_index, answer):
-    """Save user's answer to the questions file"""
-    filepath = os.path.join(app.config['QUESTIONS_FOLDER'], filename)
+    """Save user's answer to the session in one transaction"""
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        data['answers'][question_index] = answer
-        
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        return True
-    except:
+        return session_store.set_answer(filename, question_index, answer) is not None
+    except Exception as e:
+        print(f"Error saving answer: {str(e)}")
         return False
 
-@app.route('/')
+@blueprint.route('/')
 def index():
     return render_template('thinking_index.html')
 
-@app.route('/upload', methods=['POST'])
+@blueprint.route('/upload', methods=['POST'])
 def upload_resume():
-    # Check Bedrock connection first
-    if not check_bedrock_connection():
-        return jsonify({
-            'error': f'Cannot connect to AWS Bedrock. Please make sure your AWS credentials and Bedrock access are set correctly.',
-            'troubleshooting': [
-                'Set your AWS credentials using aws configure',
-                f'Check if you have access to model: {BEDROCK_MODEL_ID}',
-                'Verify your AWS account has sufficient permissions and quota'
-            ]
-        }), 500
-    
+    upload_start = time.perf_counter()
+    start_health_monitor()
+
     if 'resume' not in request.files:
         return jsonify({'error': 'No file selected'}), 400
     
@@ -246,37 +250,80 @@ def upload_resume():
             # Generate session ID if not exists
             if 'session_id' not in session:
                 session['session_id'] = str(uuid.uuid4())
+            session_id = session['session_id']
             
-            # Extract text from PDF
-            pdf_file = BytesIO(file.read())
-            extracted_text = extract_text_from_pdf(pdf_file)
-            
-            if extracted_text.startswith("Error"):
-                return jsonify({'error': extracted_text}), 400
-            
-            # Find matching keywords
-            matched_keywords, categorized_matches = find_matching_keywords(extracted_text)
+            # Stream the upload (large files go to a temp file) while hashing it for the cache
+            hasher = hashlib.sha256()
+            pdf_bytes, pdf_path = spool_upload(file.stream, hasher=hasher)
+            key = cache_key(hasher.hexdigest(), keyword_matcher.version, BEDROCK_MODEL_ID)
+            cached = analysis_cache.get(key)
+            # Filled in by generate_questions_stream; says whether the questions may be cached
+            generation = {'complete': False, 'padded': []}
             
-            if not matched_keywords:
+            if cached is not None:
+                if pdf_path is not None:
+                    os.remove(pdf_path)
+                print(f"Resume analysis served from cache in {(time.perf_counter() - upload_start) * 1000:.0f} ms")
+                matched_keywords = cached['matched_keywords']
+                categorized_matches = cached['categorized_keywords']
+                questions = cached['questions']
+            elif bedrock_health['ok'] is False:
+                # Use the last probe result instead of probing on every upload; cache hits need no Bedrock
+                if pdf_path is not None:
+                    os.remove(pdf_path)
                 return jsonify({
-                    'error': 'No technical keywords found in the resume. Please ensure your resume contains technical skills.'
-                }), 400
-            
-            # Generate questions using AWS Bedrock
-            questions = generate_questions(matched_keywords)
-            
-            # Save questions to file
-            questions_file = save_questions_to_file(questions, session['session_id'])
+                    'error': f'Cannot connect to AWS Bedrock. Please make sure your AWS credentials and Bedrock access are set correctly.',
+                    'troubleshooting': [
+                        'Set your AWS credentials using aws configure',
+                        f'Check if you have access to model: {BEDROCK_MODEL_ID}',
+                        'Verify your AWS account has sufficient permissions and quota'
+                    ]
+                }), 500
+            else:
+                # Extract text in the process pool so parsing does not hold the Flask worker's CPU
+                try:
+                    extracted_text = extract_text(pdf_bytes if pdf_path is None else pdf_path)
+                finally:
+                    if pdf_path is not None:
+                        os.remove(pdf_path)
+                
+                if extracted_text.startswith("Error"):
+                    return jsonify({'error': extracted_text}), 400
+                
+                # Find matching keywords
+                matched_keywords, categorized_matches = find_matching_keywords(extracted_text)
+                
+                if not matched_keywords:
+                    return jsonify({
+                        'error': 'No technical keywords found in the resume. Please ensure your resume contains technical skills.'
+                    }), 400
+                
+                # Generate questions using AWS Bedrock
+                questions = generate_questions_stream(matched_keywords, generation)
+                cached = {
+                    'text': extracted_text,
+                    'matched_keywords': matched_keywords,
+                    'categorized_keywords': categorized_matches
+                }
             
-            return jsonify({
-                'success': True,
-                'questions': questions,
+            analysis = {
                 'matched_keywords': matched_keywords,
                 'categorized_keywords': categorized_matches,
-                'session_id': session['session_id'],
-                'questions_file': questions_file,
-                'message': f'Resume analyzed successfully! Found {len(matched_keywords)} technical skills. Questions have been generated and saved.'
-            })
+                'session_id': session_id,
+                'cached': 'questions' in cached
+            }
+            events = upload_events(questions, analysis, upload_start, key, cached, generation)
+            
+            # Stream questions as newline-delimited JSON when the client asks for it
+            if request.args.get('stream') == '1' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+                return Response(stream_with_context(json.dumps(event) + '\n' for event in events),
+                                mimetype='application/x-ndjson')
+            
+            result = list(events)[-1]
+            if result['type'] == 'error':
+                return jsonify({'error': result['error']}), 500
+            result.pop('type')
+            return jsonify(result)
             
         except Exception as e:
             print(f"Error processing file: {str(e)}")
@@ -284,7 +331,47 @@ def upload_resume():
     
     return jsonify({'error': 'Invalid file type. Please upload a PDF file.'}), 400
 
-@app.route('/submit_answer', methods=['POST'])
+def upload_events(questions_source, analysis, upload_start, key, cached, generation):
+    """Yield the upload result as events, one per question as soon as it is generated"""
+    yield dict(analysis, type='keywords')
+    
+    try:
+        questions = []
+        first_question_ms = None
+        for question in questions_source:
+            if first_question_ms is None:
+                first_question_ms = (time.perf_counter() - upload_start) * 1000
+                print(f"Upload-to-first-question latency: {first_question_ms:.0f} ms")
+            questions.append(question)
+            yield {'type': 'question', 'index': len(questions) - 1, 'question': question}
+        
+        # Cache the analysis only if the model wrote every question; padded or fallback
+        # questions would otherwise be served for this resume from now on
+        if 'questions' not in cached and generation['complete']:
+            analysis_cache.put(key, dict(cached, questions=questions))
+        
+        # Save questions to file
+        questions_file = save_questions_to_file(questions, analysis['session_id'])
+        events.publish('session_created', filename=questions_file, session_id=analysis['session_id'],
+                       questions=questions)
+        matched_keywords = analysis['matched_keywords']
+        message = f'Resume analyzed successfully! Found {len(matched_keywords)} technical skills. Questions have been generated and saved.'
+        if generation['padded']:
+            message += f' {len(generation["padded"])} of them are general questions because the model did not provide them.'
+        yield dict(analysis, **{
+            'type': 'done',
+            'success': True,
+            'questions': questions,
+            'questions_file': questions_file,
+            'padded_questions': generation['padded'],
+            'first_question_ms': first_question_ms,
+            'message': message
+        })
+    except Exception as e:
+        print(f"Error generating questions: {str(e)}")
+        yield {'type': 'error', 'error': f'Error generating questions: {str(e)}'}
+
+@blueprint.route('/submit_answer', methods=['POST'])
 def submit_answer():
     """Submit user's answer to a question"""
     data = request.get_json()
@@ -310,15 +397,18 @@ def submit_answer():
                 'is_last_question': False
             })
         else:
+            # Typed answers finish a session too; start its analysis now
+            events.publish('session_completed', filename=questions_file)
             return jsonify({
                 'success': True,
                 'message': 'Answer saved successfully',
-                'is_last_question': True
+                'is_last_question': True,
+                'analysis_url': analysis_url(questions_file)
             })
     else:
         return jsonify({'error': 'Failed to save answer'}), 500
 
-@app.route('/get_answers', methods=['GET'])
+@blueprint.route('/get_answers', methods=['GET'])
 def get_answers():
     """Get all questions and answers for a session"""
     questions_file = request.args.get('questions_file')
@@ -336,15 +426,18 @@ def get_answers():
         'timestamp': questions_data['timestamp']
     })
 
-@app.route('/keywords')
+@blueprint.route('/keywords')
 def show_keywords():
     """Show all available keywords for reference"""
     return jsonify({'technical_keywords': TECHNICAL_KEYWORDS})
 
-@app.route('/health')
+@blueprint.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'thinking_app'})
+    return jsonify({'status': 'healthy', 'service': 'thinking_app', 'bedrock': bedrock_health,
+                    'analysis_cache': analysis_cache.stats()})
+
+app.register_blueprint(blueprint)
 
 if __name__ == '__main__':
     print("Starting AuroraVoice Resume Analyzer...")
@@ -358,4 +451,6 @@ if __name__ == '__main__':
         print(f"  2. You have access to the model: {BEDROCK_MODEL_ID}")
         print("  3. Your AWS account has sufficient permissions and quota")
     
+    # Keep the cached Bedrock health fresh for uploads
+    start_health_monitor()
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+In-memory cache of synthesised question audio for talking_app.
+
+Every spoken question used to be a gTTS network round trip followed by an MP3
+written to ./temp. Questions are known when a session starts, so `prefetch`
+synthesises all of them in parallel in the background, and `get` usually
+returns the clip straight from memory. Clips are keyed by a hash of the text
+and the voice settings, so the same question is synthesised once however many
+sessions ask it. Total size is bounded and the least recently used clips are
+evicted.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from gtts import gTTS
+
+# Total size of cached MP3 clips before least recently used ones are evicted
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+# gTTS requests in flight at once while prefetching
+SYNTHESIS_WORKERS = 4
+
+
+class SpeechAudioCache:
+    def __init__(self, lang='en', slow=False, max_bytes=MAX_CACHE_BYTES, workers=SYNTHESIS_WORKERS):
+        """
+        :param lang: gTTS language
+        :param slow: gTTS slow mode
+        :param max_bytes: Byte budget for cached clips
+        :param workers: Parallel synthesis requests
+        """
+        self.lang = lang
+        self.slow = slow
+        self.voice = f"gtts:{lang}:{'slow' if slow else 'normal'}"
+        self.max_bytes = max_bytes
+        self.clips = OrderedDict()
+        self.size = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text):
+        """Content address of a clip: the text together with the voice that speaks it"""
+        return hashlib.sha256(f"{self.voice}\0{text}".encode('utf-8')).hexdigest()
+
+    def synthesize(self, text):
+        """MP3 bytes for `text`, synthesised without touching the filesystem"""
+        buffer = BytesIO()
+        gTTS(text=text, lang=self.lang, slow=self.slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def prefetch(self, texts):
+        """Start synthesising every clip not cached or already in progress; returns immediately."""
+        for text in texts:
+            if text:
+                self.request(text)
+
+    def request(self, text):
+        """Cached clip bytes, or a Future for a synthesis that is (now) in progress."""
+        key = self.key(text)
+        with self.lock:
+            if key in self.clips:
+                self.clips.move_to_end(key)
+                return self.clips[key]
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(self.load, key, text)
+                self.pending[key] = future
+            return future
+
+    def load(self, key, text):
+        try:
+            audio = self.synthesize(text)
+        except Exception:
+            with self.lock:
+                self.pending.pop(key, None)
+            raise
+        with self.lock:
+            self.pending.pop(key, None)
+            self.store(key, audio)
+        return audio
+
+    def store(self, key, audio):
+        """Add a clip and evict the least recently used ones beyond the budget; called with the lock held."""
+        if key in self.clips:
+            return
+        self.clips[key] = audio
+        self.size += len(audio)
+        while self.size > self.max_bytes and len(self.clips) > 1:
+            _, evicted = self.clips.popitem(last=False)
+            self.size -= len(evicted)
+
+    def get(self, text):
+        """MP3 bytes for `text`: from memory if cached, else waiting for (or starting) synthesis."""
+        result = self.request(text)
+        if isinstance(result, bytes):
+            self.hits += 1
+            return result
+        self.misses += 1
+        return result.result()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'clips': len(self.clips),
+                'bytes': self.size,
+                'pending': len(self.pending),
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -4,16 +4,155 @@ A python script to upload an image to a AWS S3 bucket.
 
 import boto3
 import argparse
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import io
 import os
-import sys
-import typing
+import threading
+import time
 
 
 # Setup region
 REGION = "ap-south-1"
 
+# Size of the shared HTTP connection pool, also the default batch concurrency
+MAX_POOL_CONNECTIONS = 16
+
+# Selfies are a few hundred KB, so most uploads fit in a single PUT; larger
+# files switch to multipart with parts uploaded in parallel
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+VALID_EXTENSIONS = (".jpg", ".jpeg")
+
+# One client (and connection pool) per process, shared by all uploads
+_s3_client = None
+_client_lock = threading.Lock()
+
+# Buckets already confirmed to exist in this process
+_known_buckets = set()
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over an in-memory buffer.
+
+    Lets `upload_fileobj` read a memoryview from `cv2.imencode` without first
+    copying the whole image into a BytesIO.
+    """
+
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), len(self.view) - self.position)
+        b[:n] = self.view[self.position:self.position + n]
+        self.position += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, min(offset, len(self.view)))
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+def get_s3_client():
+    """
+    Return the process-wide S3 client, creating it on first use.
+    :return: boto3 S3 client with a connection pool sized for batch uploads.
+    """
+    global _s3_client
+    with _client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client(
+                "s3",
+                endpoint_url=os.environ.get("S3_ENDPOINT_URL"),
+                config=Config(max_pool_connections=MAX_POOL_CONNECTIONS,
+                              retries={"max_attempts": 3, "mode": "standard"}),
+            )
+        return _s3_client
+
+
+def bucket_exists(bucket_name) -> bool:
+    """
+    Check that a bucket exists, calling S3 only the first time per bucket.
+    :param bucket_name: Name of the bucket.
+    :type bucket_name: str
+    :return: True if the bucket exists.
+    :rtype: bool
+    """
+    if bucket_name in _known_buckets:
+        return True
+
+    try:
+        get_s3_client().head_bucket(Bucket=bucket_name)
+    except ClientError as e:
+        print(f"Bucket {bucket_name} does not exist or is not accessible: {e}")
+        return False
+
+    _known_buckets.add(bucket_name)
+    return True
+
+
+def image_url(bucket_name, key) -> str:
+    return f"https://{bucket_name}.s3.{REGION}.amazonaws.com/{key}"
+
+
+def uploadImageBytes(image_bytes, key, bucket_name) -> str:
+    """
+    Upload an encoded image held in memory to an AWS S3 bucket.
+    :param image_bytes: Encoded JPEG data (bytes, bytearray, memoryview or numpy buffer).
+    :param key: Object key to store the image under, e.g. "name.jpg".
+    :type key: str
+    :param bucket_name: Name of the bucket to upload the image to.
+    :type bucket_name: str
+    :return: Return the URL of the uploaded image, or False on failure.
+    :rtype: str
+    """
+
+    # Check if image has a valid extension
+    if os.path.splitext(key)[1].lower() not in VALID_EXTENSIONS:
+        print(f"Image {key} is not a valid image file.")
+        return False
+
+    # Check if bucket exists
+    if not bucket_exists(bucket_name):
+        return False
+
+    # Use exception handling to upload image
+    try:
+        get_s3_client().upload_fileobj(
+            BufferReader(image_bytes), bucket_name, key,
+            ExtraArgs={"ContentType": "image/jpeg"},
+            Config=TRANSFER_CONFIG,
+        )
+
+    except Exception as e:
+        print(f"Error uploading image: {e}")
+        return False
+
+    else:
+        return image_url(bucket_name, key)
+
 
 def uploadImage(image_path, bucket_name) -> str:
     """
@@ -32,21 +171,20 @@ def uploadImage(image_path, bucket_name) -> str:
         return False
 
     # Check if image is a file
-    if not os.path.split(".")[-1] != "jpg":
+    if os.path.splitext(image_path)[1].lower() not in VALID_EXTENSIONS:
         print(f"Image {image_path} is not a valid image file.")
         return False
 
     # Check if bucket exists
-    s3 = boto3.resource("s3")
-    bucket = s3.Bucket(bucket_name)
-    if not bucket.creation_date:
-        print(f"Bucket {bucket_name} does not exist.")
+    if not bucket_exists(bucket_name):
         return False
 
     # Use exception handling to upload image
     try:
-        s3.meta.client.upload_file(
-            image_path, bucket_name, os.path.basename(image_path)
+        get_s3_client().upload_file(
+            image_path, bucket_name, os.path.basename(image_path),
+            ExtraArgs={"ContentType": "image/jpeg"},
+            Config=TRANSFER_CONFIG,
         )
 
     except Exception as e:
@@ -54,4 +192,74 @@ def uploadImage(image_path, bucket_name) -> str:
         return False
 
     else:
-        return f"https://{bucket_name}.s3.{REGION}.amazonaws.com/{os.path.basename(image_path)}"
+        return image_url(bucket_name, os.path.basename(image_path))
+
+
+def uploadImages(images, bucket_name, max_workers=MAX_POOL_CONNECTIONS) -> list:
+    """
+    Upload a batch of in-memory images over the shared connection pool.
+    :param images: Iterable of (key, image_bytes) pairs.
+    :param bucket_name: Name of the bucket to upload the images to.
+    :type bucket_name: str
+    :param max_workers: Number of uploads in flight at once.
+    :type max_workers: int
+    :return: URL (or False) for each image, in input order.
+    :rtype: list
+    """
+    images = list(images)
+    if not bucket_exists(bucket_name):
+        return [False] * len(images)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda item: uploadImageBytes(item[1], item[0], bucket_name), images))
+
+
+def benchmark(count, size, workers):
+    """
+    Measure upload throughput against a local moto S3 server.
+    :return: Images per second for serial and batch uploads.
+    """
+    from moto.server import ThreadedMotoServer
+
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    os.environ["S3_ENDPOINT_URL"] = f"http://{host}:{port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    global _s3_client
+    _s3_client = None
+    _known_buckets.clear()
+
+    try:
+        bucket_name = "selfiebucket-bench"
+        get_s3_client().create_bucket(Bucket=bucket_name)
+        images = [(f"bench_{i}.jpg", os.urandom(size)) for i in range(count)]
+
+        start = time.perf_counter()
+        for key, data in images:
+            uploadImageBytes(data, key, bucket_name)
+        serial = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        uploadImages(images, bucket_name, max_workers=workers)
+        batch = count / (time.perf_counter() - start)
+    finally:
+        server.stop()
+
+    print(f"{count} images of {size // 1024} KB")
+    print(f"  serial uploadImageBytes: {serial:.1f} images/s")
+    print(f"  uploadImages ({workers} workers): {batch:.1f} images/s")
+    return serial, batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark S3 image uploads against a local moto server")
+    parser.add_argument("--count", type=int, default=200, help="Number of images to upload")
+    parser.add_argument("--size", type=int, default=200 * 1024, help="Image size in bytes")
+    parser.add_argument("--workers", type=int, default=MAX_POOL_CONNECTIONS, help="Concurrent uploads")
+    args = parser.parse_args()
+
+    benchmark(args.count, args.size, args.workers)